@@ -0,0 +1,72 @@
+"""
+Headless astro compute core for the Indian market dashboard.
+
+Pure Python: no Streamlit import, the ephemeris loads lazily on first use,
+and every result type is an immutable dataclass, so the core can be used
+from workers, tests, batch jobs and process pools. Public names are
+re-exported lazily so `import astrocore` stays cheap.
+"""
+import importlib
+
+_EXPORTS = {
+    # config
+    "TZ_IST": "config", "ASSAM_PLACES": "config", "NSE_LAT": "config", "NSE_LON": "config",
+    "SESSIONS": "config", "ENGINE": "config",
+    # ephemeris
+    "Ephemeris": "ephemeris", "get_ephemeris": "ephemeris", "warm_up": "ephemeris",
+    "ephemeris_file_present": "ephemeris", "ephemeris_path": "ephemeris", "location": "ephemeris",
+    "nse_location": "ephemeris", "get_timescale": "ephemeris",
+    # cache
+    "ScheduleCache": "cache", "SCHEDULE_CACHE": "cache",
+    # models
+    "HoraSlot": "models", "DaySchedule": "models", "ScheduleBatch": "models",
+    "TithiSegment": "models", "NakshatraSegment": "models", "NatalProfile": "models",
+    "Site": "models", "SiteBatch": "models", "CalendarEvent": "models",
+    # schedule
+    "WEEKDAY_LORDS": "schedule", "HORA_FIXED_ORDER": "schedule", "RAHU_KAAL_PART": "schedule",
+    "calculate_rahu_kaal": "schedule", "calculate_schedule_batch": "schedule",
+    "schedule_from_batch": "schedule", "calculate_market_schedule": "schedule",
+    "get_market_schedule": "schedule", "next_change": "schedule", "find_sun_events": "schedule",
+    # sites
+    "DEFAULT_SITES": "sites", "calculate_site_batch": "sites", "site_schedule": "sites",
+    "get_site_schedules": "sites",
+    # alerts
+    "AlertScheduler": "alerts", "WebhookSink": "alerts", "SocketSink": "alerts", "day_events": "alerts",
+    # panchang
+    "TITHI_NAMES": "panchang", "NAKSHATRAS": "panchang", "NAKSHATRA_LORDS": "panchang",
+    "get_lahiri_ayanamsa": "panchang", "get_sidereal_pos": "panchang", "tithi_label": "panchang",
+    "get_tithi": "panchang", "get_nakshatra_info_sidereal": "panchang",
+    "find_tithi_transitions": "panchang", "find_nakshatra_transitions": "panchang",
+    "get_day_tithis": "panchang", "get_day_nakshatras": "panchang", "lahiri_ayanamsa": "panchang",
+    "true_lahiri_ayanamsa": "panchang",
+    # fastastro
+    "moon_longitude": "fastastro", "sun_longitude": "fastastro", "moon_sidereal": "fastastro",
+    "sun_sidereal": "fastastro", "tithi_index": "fastastro", "padam_index": "fastastro",
+    # predict
+    "PLANET_STRATEGIES": "predict", "INDEX_PREFS": "predict", "INDICES": "predict",
+    "FRIENDSHIP_TABLE": "predict", "check_compatibility": "predict", "LUCK_TABLE": "predict",
+    "get_astro_prediction": "predict", "SlotIndex": "predict", "get_slot_index": "predict",
+    "index_masks": "predict",
+    # natal
+    "NatalStore": "natal", "compute_profiles": "natal", "desk_luck": "natal",
+    "get_natal_store": "natal",
+    # export
+    "export_events": "export", "export_text": "export", "chunk_events": "export",
+    # store
+    "AlmanacStore": "store", "build_store": "store", "get_store": "store",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'astrocore' has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return __all__
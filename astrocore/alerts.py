@@ -0,0 +1,232 @@
+"""
+Hora and Rahu Kaal alerts without a browser.
+
+    python -m astrocore.alerts --webhook http://127.0.0.1:9000/hora --socket /run/astro/alerts.sock
+    python -m astrocore.alerts --dry-run          # print today's events and exit
+
+The scheduler builds the trading day's events from the market schedule and
+INDEX_PREFS, then sleeps until the next boundary instead of polling. At each
+boundary it pushes one JSON object per event to every sink:
+
+    {"event": "hora", "time": "...T10:52:12+05:30", "planet": "Moon",
+     "is_rahu": false, "strategy": "WAIT", "signals": {"NIFTY 50": null, ...}}
+
+Events are "hora" (a market-hours slot begins), "rahu_start" / "rahu_end" and
+"session_end" (the last slot is over). Weekends have no events. Sinks are
+HTTP webhooks (POST, application/json) and Unix datagram sockets. A webhook
+that cannot be reached or answers 5xx is retried a couple of times with
+backoff; a sink that still fails is logged and skipped, it never stops the
+scheduler. Each event is pushed at most once, even if the clock steps back.
+The clock and the wait are injectable, so a test can drive a whole day in
+milliseconds.
+"""
+import json
+import time
+import socket
+import logging
+import argparse
+import datetime
+import threading
+import urllib.error
+import urllib.request
+
+from .config import TZ_IST
+from .perf import span
+from .predict import INDICES, PLANET_STRATEGIES, get_slot_index
+from .schedule import get_market_schedule
+
+logger = logging.getLogger("astrocore.alerts")
+
+
+def day_events(day_schedule, indices=INDICES):
+    """Time-ordered (time, event dict) pairs for one trading day."""
+    if day_schedule.date.weekday() > 4 or not day_schedule.slots:
+        return []
+    slots = day_schedule.slots
+    signals = {name: get_slot_index(slots).signals(name) for name in indices}
+    events = []
+    for i, slot in enumerate(slots):
+        strategy = PLANET_STRATEGIES.get(slot.planet)
+        events.append((slot.start, {
+            "event": "hora", "planet": slot.planet, "is_rahu": slot.is_rahu,
+            "start": slot.start.isoformat(), "end": slot.end.isoformat(),
+            "strategy": strategy["strat"] if strategy else "WAIT",
+            "signals": {name: signals[name][i] for name in indices},
+        }))
+    events.append((day_schedule.rahu_start, {"event": "rahu_start", "end": day_schedule.rahu_end.isoformat()}))
+    events.append((day_schedule.rahu_end, {"event": "rahu_end"}))
+    events.append((slots[-1].end, {"event": "session_end"}))
+    events.sort(key=lambda item: item[0])
+    for when, event in events:
+        event["time"] = when.isoformat()
+        event["date"] = day_schedule.date.isoformat()
+    return events
+
+
+class WebhookSink:
+    """
+    POSTs each event as JSON. Connection errors and 5xx answers are retried
+    up to `retries` times, waiting `backoff` seconds and doubling; a 4xx means
+    the receiver rejected the event and is raised at once.
+    """
+
+    def __init__(self, url, timeout=5.0, retries=2, backoff=0.5, sleep=time.sleep):
+        self.url = url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._sleep = sleep
+
+    def send(self, event):
+        body = json.dumps(event).encode()
+        for attempt in range(self.retries + 1):
+            request = urllib.request.Request(self.url, data=body, method="POST",
+                                             headers={"Content-Type": "application/json"})
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    response.read()
+                return
+            except urllib.error.HTTPError as exc:
+                if exc.code < 500 or attempt == self.retries:
+                    raise
+            except OSError:  # URLError, refused, timed out
+                if attempt == self.retries:
+                    raise
+            self._sleep(self.backoff * 2 ** attempt)
+
+    def __repr__(self):
+        return f"WebhookSink({self.url!r})"
+
+
+class SocketSink:
+    """
+    One datagram per event to a Unix socket path. Non-blocking: if no one is
+    bound there or the reader has fallen behind, the event fails fast.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+
+    def send(self, event):
+        self._sock.sendto(json.dumps(event).encode(), self.path)
+
+    def __repr__(self):
+        return f"SocketSink({self.path!r})"
+
+
+class AlertScheduler:
+    """
+    Daemon thread that sleeps until the next event of the current trading
+    day and pushes it to every sink. Only events after start() are sent;
+    after the day's last event it sleeps to IST midnight and loads the next
+    day. `clock()` returns an aware datetime and `wait(seconds)` returns True
+    to stop, so both can be replaced in tests.
+    """
+
+    def __init__(self, sinks, indices=INDICES, clock=None, wait=None, schedule_fn=get_market_schedule):
+        self.sinks = list(sinks)
+        self.indices = list(indices)
+        self._clock = clock or (lambda: datetime.datetime.now(TZ_IST))
+        self._stop = threading.Event()
+        self._wait = wait or self._stop.wait
+        self._schedule_fn = schedule_fn
+        self._thread = None
+        self._events = {}  # date -> day_events()
+        self.sent = 0
+        self.failures = 0
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name="hora-alerts", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def events_for(self, date):
+        events = self._events.get(date)
+        if events is None:
+            events = []
+            if date.weekday() <= 4:
+                noon = TZ_IST.localize(datetime.datetime.combine(date, datetime.time(12)))
+                events = day_events(self._schedule_fn(noon), self.indices)
+            # Only yesterday and today are ever needed again
+            self._events = {d: e for d, e in self._events.items() if d >= date - datetime.timedelta(days=1)}
+            self._events[date] = events
+        return events
+
+    def next_wakeup(self, after):
+        """The first event strictly after `after`, else the next IST midnight."""
+        for when, _ in self.events_for(after.date()):
+            if when > after:
+                return when
+        return TZ_IST.localize(datetime.datetime.combine(after.date() + datetime.timedelta(days=1),
+                                                         datetime.time()))
+
+    def run(self):
+        cursor = self._clock()
+        while not self._stop.is_set():
+            wakeup = self.next_wakeup(cursor)
+            delay = (wakeup - self._clock()).total_seconds()
+            if delay > 0 and self._wait(delay):
+                return
+            now = self._clock()
+            if now < wakeup:
+                continue  # Woken early (e.g. clock adjusted); wait again
+            # Everything in (cursor, now]: usually one boundary, more if we overslept
+            day = cursor.date()
+            while day <= now.date():
+                for when, event in self.events_for(day):
+                    if cursor < when <= now:
+                        self.push(event)
+                day += datetime.timedelta(days=1)
+            cursor = now
+
+    def push(self, event):
+        for sink in self.sinks:
+            with span("alerts.push", event=event["event"]) as timing:
+                try:
+                    sink.send(event)
+                    self.sent += 1
+                except Exception as exc:
+                    self.failures += 1
+                    timing.tag(error=type(exc).__name__)
+                    logger.warning("alert %s to %r failed: %s", event["event"], sink, exc)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m astrocore.alerts",
+                                     description="Push hora / Rahu Kaal boundary events to webhooks or a socket.")
+    parser.add_argument("--webhook", action="append", default=[], help="URL to POST events to (repeatable)")
+    parser.add_argument("--socket", action="append", default=[], help="Unix datagram socket path (repeatable)")
+    parser.add_argument("--index", action="append", choices=INDICES, help="Indices in 'signals' (default all)")
+    parser.add_argument("--dry-run", action="store_true", help="Print today's events and exit")
+    args = parser.parse_args(argv)
+    indices = args.index or INDICES
+
+    if args.dry_run:
+        today = datetime.datetime.now(TZ_IST)
+        for _, event in day_events(get_market_schedule(today), indices):
+            print(json.dumps(event))
+        return
+
+    sinks = [WebhookSink(url) for url in args.webhook] + [SocketSink(path) for path in args.socket]
+    if not sinks:
+        parser.error("give at least one --webhook or --socket (or --dry-run)")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    logger.info("sending alerts to %s", ", ".join(map(repr, sinks)))
+    scheduler = AlertScheduler(sinks, indices)
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
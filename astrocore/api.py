@@ -0,0 +1,255 @@
+"""
+Read-only JSON API over the astro core, for bots and other dashboards.
+
+    python -m astrocore.api --host 0.0.0.0 --port 8502
+
+    GET /v1/schedule?date=2025-03-04
+    GET /v1/tithi?date=2025-03-04
+    GET /v1/nakshatra?date=2025-03-04[&lat=27.236&lon=94.1028]
+    GET /v1/prediction?date=2025-03-04[&index=NIFTY 50][&time=10:30]
+    GET /v1/sites?date=2025-03-04
+
+date defaults to today (IST). Each body is built once per (endpoint, date,
+parameters), kept encoded in API_CACHE and served with a strong ETag; a
+matching If-None-Match gets an empty 304. A day's schedule, tithis and
+nakshatras never change, so they are cacheable for a day. Today's live
+prediction is only valid until the next slot boundary: it is cached per slot
+position and its max-age runs to that boundary. Served by a stdlib
+ThreadingHTTPServer with HTTP/1.1 keep-alive; Streamlit is not involved.
+"""
+import json
+import hashlib
+import logging
+import argparse
+import datetime
+import urllib.parse
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .cache import ScheduleCache
+from .config import TZ_IST, NSE_LAT, NSE_LON, ENGINE
+from .panchang import get_day_tithis, get_day_nakshatras
+from .predict import INDICES, get_astro_prediction, get_slot_index
+from .schedule import get_market_schedule, next_change
+from .sites import get_site_schedules
+
+logger = logging.getLogger("astrocore.api")
+
+# Encoded responses, shared by every request thread (single-flight on a miss)
+API_CACHE = ScheduleCache(maxsize=4096)
+DAY_MAX_AGE = 24 * 3600
+
+
+class ApiError(ValueError):
+    """Bad request parameters; answered with 400."""
+
+
+@dataclass(frozen=True)
+class ApiResponse:
+    body: bytes
+    etag: str
+
+
+def _encode(payload):
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    return ApiResponse(body=body, etag='"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest())
+
+
+def _cached(key, build):
+    return API_CACHE.get_or_compute(key, lambda: _encode(build()))
+
+
+def _date(params):
+    value = params.get("date")
+    if value is None:
+        return datetime.datetime.now(TZ_IST).date()
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(f"date must be YYYY-MM-DD, got {value!r}") from None
+
+
+def _float(params, name, default):
+    try:
+        return float(params.get(name, default))
+    except ValueError:
+        raise ApiError(f"{name} must be a number") from None
+
+
+def _noon(day):
+    return TZ_IST.localize(datetime.datetime.combine(day, datetime.time(12)))
+
+
+def _iso(dt):
+    return dt.isoformat() if dt is not None else None
+
+
+def _schedule_payload(day_schedule):
+    return {
+        "date": day_schedule.date.isoformat(), "trading_day": day_schedule.date.weekday() <= 4,
+        "day_lord": day_schedule.day_lord,
+        "rahu_start": _iso(day_schedule.rahu_start), "rahu_end": _iso(day_schedule.rahu_end),
+        "slots": [{"start": slot.start.isoformat(), "end": slot.end.isoformat(),
+                   "planet": slot.planet, "is_rahu": slot.is_rahu} for slot in day_schedule.slots],
+    }
+
+
+# --- ENDPOINTS: params -> (ApiResponse, max-age seconds) ---
+
+def schedule_endpoint(params):
+    day = _date(params)
+    return _cached(("api.schedule", day), lambda: _schedule_payload(get_market_schedule(_noon(day)))), DAY_MAX_AGE
+
+
+def tithi_endpoint(params):
+    day = _date(params)
+    return _cached(("api.tithi", day), lambda: {
+        "date": day.isoformat(),
+        "tithis": [{"tithi": seg.tithi, "name": seg.name, "start": seg.start.isoformat(),
+                    "end": seg.end.isoformat()} for seg in get_day_tithis(_noon(day))],
+    }), DAY_MAX_AGE
+
+
+def nakshatra_endpoint(params):
+    day = _date(params)
+    lat, lon = round(_float(params, "lat", NSE_LAT), 4), round(_float(params, "lon", NSE_LON), 4)
+    return _cached(("api.nakshatra", day, lat, lon), lambda: {
+        "date": day.isoformat(), "lat": lat, "lon": lon,
+        "nakshatras": [{"nakshatra": seg.nakshatra, "lord": seg.lord, "start": seg.start.isoformat(),
+                        "end": seg.end.isoformat()} for seg in get_day_nakshatras(_noon(day), lat, lon)],
+    }), DAY_MAX_AGE
+
+
+def prediction_endpoint(params):
+    day = _date(params)
+    index = params.get("index")
+    if index is not None and index not in INDICES:
+        raise ApiError(f"index must be one of {INDICES}")
+    indices = [index] if index else INDICES
+    day_schedule = get_market_schedule(_noon(day))
+    now = datetime.datetime.now(TZ_IST)
+
+    if "time" in params:
+        try:
+            at = TZ_IST.localize(datetime.datetime.combine(day, datetime.time.fromisoformat(params["time"])))
+        except ValueError:
+            raise ApiError(f"time must be HH:MM, got {params['time']!r}") from None
+        max_age = DAY_MAX_AGE
+    elif day == now.date():
+        at = now
+        max_age = max(1, int((next_change(day_schedule, now) - now).total_seconds()))
+    else:
+        at = None  # Another day: the page's whole-day view
+        max_age = DAY_MAX_AGE
+
+    # The answer only changes when `at` crosses a slot end, so cache it per slot position
+    position = get_slot_index(day_schedule.slots).position(at)
+
+    def build():
+        predictions = {}
+        for name in indices:
+            best, worst, strategy, reason = get_astro_prediction(day_schedule.slots, name, at is not None, at)
+            predictions[name] = {"best": best, "avoid": worst, "strategy": strategy, "reason": reason}
+        return {"date": day.isoformat(), "live": at is not None, "predictions": predictions}
+    return _cached(("api.prediction", day, tuple(indices), at is not None, position), build), max_age
+
+
+def sites_endpoint(params):
+    day = _date(params)
+    return _cached(("api.sites", day), lambda: {
+        name: _schedule_payload(day_schedule) for name, day_schedule in get_site_schedules(day).items()
+    }), DAY_MAX_AGE
+
+
+ENDPOINTS = {
+    "/v1/schedule": schedule_endpoint,
+    "/v1/tithi": tithi_endpoint,
+    "/v1/nakshatra": nakshatra_endpoint,
+    "/v1/prediction": prediction_endpoint,
+    "/v1/sites": sites_endpoint,
+}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: bots poll over one connection
+    server_version = "astrocore-api"
+    # Headers and body are separate small writes; with Nagle on, each keep-alive
+    # response would wait ~40 ms for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        endpoint = ENDPOINTS.get(url.path)
+        if endpoint is None:
+            return self._send_json(404, {"error": f"unknown endpoint {url.path}", "endpoints": sorted(ENDPOINTS)})
+        params = {name: values[-1] for name, values in urllib.parse.parse_qs(url.query).items()}
+        try:
+            response, max_age = endpoint(params)
+        except ValueError as exc:  # ApiError, or a date outside the ephemeris
+            return self._send_json(400, {"error": str(exc).split("\n")[0]})
+        except Exception:
+            logger.exception("GET %s failed", self.path)
+            return self._send_json(500, {"error": "internal error"})
+
+        headers = {"ETag": response.etag, "Cache-Control": f"public, max-age={max_age}"}
+        if self._not_modified(response.etag):
+            self._send(304, b"", headers)
+        else:
+            self._send(200, response.body, headers)
+
+    def _not_modified(self, etag):
+        header = self.headers.get("If-None-Match")
+        if not header:
+            return False
+        tags = [tag.strip() for tag in header.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload).encode(), {"Cache-Control": "no-store"})
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s " + format, self.address_string(), *args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def make_server(host="127.0.0.1", port=8502):
+    return ApiServer((host, port), ApiHandler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m astrocore.api",
+                                     description="Serve schedules, panchang and predictions as cached JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    if ENGINE != "fast":
+        from .ephemeris import get_ephemeris
+        get_ephemeris()  # Load before accepting requests; the fast engine never needs the kernel
+    server = make_server(args.host, args.port)
+    logger.info("serving on http://%s:%d (%s)", args.host, server.server_address[1], ", ".join(sorted(ENDPOINTS)))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
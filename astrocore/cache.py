@@ -0,0 +1,70 @@
+"""Cross-session memo used for per-date astro results."""
+import time
+import threading
+import collections
+
+from .perf import span
+
+
+class ScheduleCache:
+    """
+    Bounded LRU + TTL memo shared by every caller in the process.
+    Single-flight: when many sessions miss the same key at once, one thread
+    computes and the rest wait for its result instead of repeating the work.
+    """
+    def __init__(self, maxsize=64, ttl_seconds=24 * 3600):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries = collections.OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}                        # key -> threading.Event
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get_or_compute(self, key, compute):
+        with span("cache", kind=key[0]) as timing:
+            outcome = "hit"
+            while True:
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None and entry[0] > time.monotonic():
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        timing.tag(result=outcome)
+                        return entry[1]
+                    waiter = self._inflight.get(key)
+                    is_owner = waiter is None
+                    if is_owner:
+                        waiter = self._inflight[key] = threading.Event()
+                        self.misses += 1
+                    else:
+                        self.coalesced += 1
+
+                if not is_owner:
+                    # Another session is already computing this key; re-check once it lands
+                    outcome = "coalesced"
+                    waiter.wait()
+                    continue
+
+                timing.tag(result="miss")
+                try:
+                    value = compute()
+                    with self._lock:
+                        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+                        self._entries.move_to_end(key)
+                        while len(self._entries) > self.maxsize:
+                            self._entries.popitem(last=False)
+                    return value
+                finally:
+                    with self._lock:
+                        self._inflight.pop(key, None)
+                    waiter.set()
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "coalesced": self.coalesced, "entries": len(self._entries)}
+
+
+SCHEDULE_CACHE = ScheduleCache()
@@ -0,0 +1,57 @@
+"""Static configuration shared by the compute core and the UI."""
+import os
+
+import pytz
+
+TZ_IST = pytz.timezone('Asia/Kolkata')
+# IST has had no DST since 1945, so an IST day is always 86400 s
+IST_OFFSET_SECONDS = 5.5 * 3600
+
+ASSAM_PLACES = {
+    "North Lakhimpur": (27.2360, 94.1028),
+    "Guwahati": (26.1445, 91.7362),
+    "Dibrugarh": (27.4728, 94.9120),
+    "Jorhat": (26.7509, 94.2037),
+    "Silchar": (24.8333, 92.7789),
+    "Tezpur": (26.6528, 92.7926),
+    "Nagaon": (26.3452, 92.6838),
+    "Tinsukia": (27.4886, 95.3558)
+}
+
+# LOCATIONS
+# Critical: Market Timing relies on MUMBAI sunrise, not user location.
+NSE_LAT, NSE_LON = 19.0760, 72.8777
+
+# Market Hours (IST): pre-open 09:00, open 09:15, close 15:30
+PRE_OPEN_HOURS = 9.0
+MARKET_OPEN_HOURS = 9.25
+MARKET_CLOSE_HOURS = 15.5
+
+# GIFT City (NSE IX), Gandhinagar
+GIFT_LAT, GIFT_LON = 23.1645, 72.6835
+# Trading sessions as (start, end) IST hours after midnight; an end past 24 runs into the next day
+SESSIONS = {
+    "NSE": ((PRE_OPEN_HOURS, MARKET_CLOSE_HOURS),),
+    "MCX": ((9.0, 23.5),),
+    "GIFT": ((6.5, 15 + 40 / 60), (16 + 35 / 60, 26.75)),  # 06:30-15:40 and 16:35-02:45
+}
+
+# FILES
+# Resolved against the project, never the working directory, so the page, the
+# API and the CLIs find the same files wherever they are started from.
+# ASTRO_DATA_DIR moves all the data files (e.g. onto a mounted volume).
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.abspath(os.environ.get("ASTRO_DATA_DIR", os.path.join(PROJECT_ROOT, "data")))
+
+# Full JPL kernel; skyfield downloads it here if it is missing
+EPHEMERIS_FILE = os.path.join(PROJECT_ROOT, 'de421.bsp')
+# Sun/Moon/Earth-only excerpt shipped with the app (see astrocore.excerpt); preferred when present
+EPHEMERIS_EXCERPT_FILE = os.path.join(DATA_DIR, 'ephemeris.bsp')
+# Precomputed almanac (see astrocore.store); used when present
+ALMANAC_FILE = os.path.join(DATA_DIR, 'almanac.bin')
+# Persisted natal profiles (see astrocore.natal)
+NATAL_DB_FILE = os.path.join(DATA_DIR, 'natal.sqlite3')
+
+# Position engine for the whole process: "skyfield" (JPL ephemeris) or "fast"
+# (analytic series, see astrocore.fastastro); set ASTRO_ENGINE=fast to switch
+ENGINE = os.environ.get("ASTRO_ENGINE", "skyfield")
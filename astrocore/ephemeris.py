@@ -0,0 +1,124 @@
+"""
+Process-wide JPL ephemeris and timescale.
+
+Nothing is read from disk until get_ephemeris() is first called; after that
+every caller in the process (sessions, workers, CLI tools) shares one copy.
+skyfield itself is only imported on first use, which keeps `import astrocore`
+cheap for workers that never touch the ephemeris.
+
+The trimmed excerpt (EPHEMERIS_EXCERPT_FILE, built by astrocore.excerpt) is
+used when present: it is memory-mapped and never triggers a download. The
+full EPHEMERIS_FILE, fetched by skyfield if missing, is only the fallback.
+"""
+import os
+import time
+import datetime
+import threading
+from dataclasses import dataclass
+
+from .config import TZ_IST, NSE_LAT, NSE_LON, EPHEMERIS_FILE, EPHEMERIS_EXCERPT_FILE
+from .perf import span
+
+
+@dataclass(frozen=True)
+class Ephemeris:
+    eph: object
+    ts: object
+    sun: object
+    moon: object
+    earth: object
+    path: str
+    load_seconds: float
+    loaded_at: datetime.datetime
+
+
+_lock = threading.Lock()
+_ephemeris = None
+_timescale = None
+_warm_up_thread = None
+_locations = {}
+
+
+def get_ephemeris():
+    """Loads the ephemeris ONCE per process; concurrent first callers wait for a single load."""
+    global _ephemeris
+    if _ephemeris is None:
+        with _lock:
+            if _ephemeris is None:
+                _ephemeris = _load()
+    return _ephemeris
+
+
+def _load():
+    from skyfield.api import load, Loader
+    from skyfield.jpllib import SpiceKernel
+
+    started = time.perf_counter()
+    path = ephemeris_path()
+    with span("ephemeris.load", file=os.path.basename(path)):
+        if path == EPHEMERIS_EXCERPT_FILE:
+            eph = SpiceKernel(path)
+        else:
+            # A Loader rooted at the kernel's directory, so a download lands there too
+            eph = Loader(os.path.dirname(path))(os.path.basename(path))
+        ts = load.timescale()
+    return Ephemeris(eph=eph, ts=ts, sun=eph['sun'], moon=eph['moon'], earth=eph['earth'], path=path,
+                     load_seconds=time.perf_counter() - started,
+                     loaded_at=datetime.datetime.now(TZ_IST))
+
+
+def get_timescale():
+    """
+    The ephemeris' timescale once it is loaded; before that skyfield's builtin
+    one, so time-only work (the fast engine) never reads the kernel.
+    """
+    global _timescale
+    if _ephemeris is not None:
+        return _ephemeris.ts
+    if _timescale is None:
+        from skyfield.api import load
+        _timescale = load.timescale()
+    return _timescale
+
+
+def warm_up():
+    """
+    Starts loading on a background thread and returns at once; a no-op once
+    a load has been started, so it is cheap to call on every rerun.
+    """
+    global _warm_up_thread
+    if _ephemeris is not None:
+        return
+    with _lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(target=get_ephemeris, name="ephemeris-warm-up", daemon=True)
+            _warm_up_thread.start()
+
+
+def ephemeris_path():
+    """The shipped excerpt when present, else the full kernel."""
+    return EPHEMERIS_EXCERPT_FILE if os.path.exists(EPHEMERIS_EXCERPT_FILE) else EPHEMERIS_FILE
+
+
+def ephemeris_file_present():
+    """False only when the first load would have to download the full kernel."""
+    return os.path.exists(EPHEMERIS_EXCERPT_FILE) or os.path.exists(EPHEMERIS_FILE)
+
+
+def location(lat, lon):
+    """Memoized wgs84 observer for (lat, lon)."""
+    key = (round(lat, 4), round(lon, 4))
+    loc = _locations.get(key)
+    if loc is None:
+        from skyfield.api import wgs84
+        loc = _locations[key] = wgs84.latlon(lat, lon)
+    return loc
+
+
+def nse_location():
+    return location(NSE_LAT, NSE_LON)
+
+
+def location_key(loc):
+    """Hashable cache key for a wgs84 observer."""
+    return round(loc.latitude.degrees, 4), round(loc.longitude.degrees, 4)
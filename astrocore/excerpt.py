@@ -0,0 +1,82 @@
+"""
+Trimmed ephemeris for offline hosts.
+
+The astro core only ever observes the Sun and Moon from the Earth, so of a
+full JPL kernel it needs SSB->Sun, SSB->Earth-Moon barycenter, EMB->Moon and
+EMB->Earth, plus the Jupiter and Saturn barycenters that skyfield's
+apparent() uses for light deflection (cheap: few, long records). This tool
+cuts those out for a span of years with jplephem's excerpter:
+
+    python -m astrocore.excerpt build --src de421.bsp --start-year 1900 --end-year 2050
+    python -m astrocore.excerpt info
+
+The result (EPHEMERIS_EXCERPT_FILE, a few MB instead of 17) is shipped with
+the app. get_ephemeris() prefers it over EPHEMERIS_FILE and opens it as a
+plain SpiceKernel: memory-mapped by jplephem and never downloaded.
+"""
+import os
+import argparse
+
+from .config import EPHEMERIS_FILE, EPHEMERIS_EXCERPT_FILE
+
+# SPK target codes: Earth-Moon, Jupiter and Saturn barycenters, Sun, Moon, Earth
+TARGETS = (3, 5, 6, 10, 301, 399)
+# Transition searches look a little past each end of the day they cover
+PAD_DAYS = 3
+
+
+def write_excerpt(src, out, start_year, end_year, targets=TARGETS):
+    """Writes the `targets` segments of `src` for 1 Jan start_year .. 31 Dec end_year to `out`."""
+    from jplephem.calendar import compute_julian_date
+    from jplephem.daf import DAF
+    from jplephem.excerpter import write_excerpt as excerpt_spk
+    from jplephem.spk import SPK
+
+    start_jd = compute_julian_date(start_year, 1, 1) - 0.5 - PAD_DAYS
+    end_jd = compute_julian_date(end_year, 12, 31) + 0.5 + PAD_DAYS
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    tmp_path = f"{out}.{os.getpid()}.tmp"
+    with open(src, "rb") as fh:
+        spk = SPK(DAF(fh))
+        summaries = [summary for summary, segment in zip(spk.daf.summaries(), spk.segments)
+                     if segment.target in targets]
+        missing = set(targets) - {segment.target for segment in spk.segments}
+        if missing:
+            raise ValueError(f"{src} has no segments for targets {sorted(missing)}")
+        with open(tmp_path, "w+b") as out_fh:
+            excerpt_spk(spk, out_fh, start_jd, end_jd, summaries)
+    os.replace(tmp_path, out)
+    return out
+
+
+def describe(path):
+    from jplephem.daf import DAF
+    from jplephem.spk import SPK
+    with open(path, "rb") as fh:
+        return str(SPK(DAF(fh)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m astrocore.excerpt",
+                                     description="Build or inspect the trimmed Sun/Moon/Earth ephemeris.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Cut the excerpt out of a full JPL kernel")
+    build.add_argument("--src", default=EPHEMERIS_FILE, help="Full kernel (default %(default)s)")
+    build.add_argument("--start-year", type=int, default=1900)
+    build.add_argument("--end-year", type=int, default=2050)
+    build.add_argument("--out", default=EPHEMERIS_EXCERPT_FILE)
+    info = sub.add_parser("info", help="List the segments of an excerpt")
+    info.add_argument("path", nargs="?", default=EPHEMERIS_EXCERPT_FILE)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        write_excerpt(args.src, args.out, args.start_year, args.end_year)
+        print(f"Wrote {args.out}: {os.path.getsize(args.out) / 1e6:.2f} MB "
+              f"(from {os.path.getsize(args.src) / 1e6:.2f} MB)")
+        print(describe(args.out))
+    else:
+        print(describe(args.path))
+
+
+if __name__ == "__main__":
+    main()
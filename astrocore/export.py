@@ -0,0 +1,220 @@
+"""
+Bulk export of the trading calendar to CSV and iCalendar.
+
+    python -m astrocore.export --start-year 2025 --end-year 2030 --out astro.csv
+    python -m astrocore.export --start-year 2025 --end-year 2025 --format ics --index "NIFTY 50" --out nifty.ics
+
+Every trading day contributes its market horas (planet, Rahu, strategy), the
+Rahu Kaal window and each index's BEST / DANGER ZONE horas exactly as the
+Advanced Planner flags them; tithis are exported for every day. The range is
+cut into calendar months, each computed in a worker process with one
+vectorized schedule batch and one tithi search, and events are streamed out
+as months finish, in order. At most two months per worker are in flight, so
+memory stays flat however many years are exported.
+"""
+import io
+import os
+import csv
+import sys
+import argparse
+import datetime
+import collections
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import TZ_IST
+from .models import CalendarEvent
+from .perf import span
+from .predict import INDICES, PLANET_STRATEGIES, get_slot_index
+
+KINDS = ("hora", "rahu_kaal", "best", "danger", "tithi")
+CSV_COLUMNS = ("date", "kind", "start", "end", "title", "index", "detail")
+_FLUSH_CHARS = 64 * 1024
+
+
+def month_chunks(start_date, end_date):
+    """(first, last) date pairs covering [start_date, end_date], one per calendar month."""
+    first = start_date
+    while first <= end_date:
+        next_month = (first.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+        last = min(next_month - datetime.timedelta(days=1), end_date)
+        yield first, last
+        first = last + datetime.timedelta(days=1)
+
+
+def _day_events(day_schedule, kinds, indices):
+    slots = day_schedule.slots
+    events = []
+    if "hora" in kinds:
+        events.extend(CalendarEvent(kind="hora", start=slot.start, end=slot.end,
+                                    title=f"{slot.planet} Hora" + (" (Rahu Kaal)" if slot.is_rahu else ""),
+                                    index=None, detail=PLANET_STRATEGIES[slot.planet]["strat"])
+                      for slot in slots)
+    if "rahu_kaal" in kinds:
+        events.append(CalendarEvent(kind="rahu_kaal", start=day_schedule.rahu_start, end=day_schedule.rahu_end,
+                                    title="Rahu Kaal", index=None, detail=""))
+    for index_name in indices:
+        # Same signals and wording as the Advanced Planner (render.planner_rows)
+        for slot, signal in zip(slots, get_slot_index(slots).signals(index_name)):
+            if signal == "best" and "best" in kinds:
+                events.append(CalendarEvent(
+                    kind="best", start=slot.start, end=slot.end, title=f"{index_name}: BEST ({slot.planet})",
+                    index=index_name,
+                    detail=f"{PLANET_STRATEGIES[slot.planet]['strat']} | {slot.planet} is Strong for {index_name}"))
+            elif signal == "worst" and "danger" in kinds:
+                events.append(CalendarEvent(
+                    kind="danger", start=slot.start, end=slot.end,
+                    title=f"{index_name}: DANGER ZONE ({slot.planet})", index=index_name,
+                    detail="NO TRADING | " + ("Rahu Kaal (Traps)" if slot.is_rahu
+                                              else f"{slot.planet} is Weak for {index_name}")))
+    return events
+
+
+def chunk_events(first, last, kinds=KINDS, indices=INDICES, include_running_tithi=False):
+    """
+    Time-ordered events for [first, last]. A tithi belongs to the chunk it
+    starts in; the one already running at `first` only with include_running_tithi.
+    """
+    from .schedule import calculate_schedule_batch, schedule_from_batch
+    from .panchang import find_tithi_transitions
+
+    events = []
+    with span("export.chunk", days=(last - first).days + 1):
+        if set(kinds) - {"tithi"}:
+            batch = calculate_schedule_batch(first, last)
+            for day in range(len(batch)):
+                if batch.weekday[day] <= 4:
+                    day_schedule = schedule_from_batch(batch, day)
+                    if day_schedule.slots:
+                        events.extend(_day_events(day_schedule, kinds, indices))
+        if "tithi" in kinds:
+            range_start = TZ_IST.localize(datetime.datetime.combine(first, datetime.time()))
+            range_end = range_start + datetime.timedelta(days=(last - first).days + 1)
+            events.extend(CalendarEvent(kind="tithi", start=seg.start, end=seg.end, title=seg.name,
+                                        index=None, detail=f"Tithi {seg.tithi}")
+                          for seg in find_tithi_transitions(range_start, range_end)
+                          if seg.start >= range_start or include_running_tithi)
+    events.sort(key=lambda event: (event.start, KINDS.index(event.kind)))
+    return events
+
+
+def export_events(start_date, end_date, kinds=KINDS, indices=INDICES, workers=None):
+    """
+    Generator over every event in [start_date, end_date], month by month. With
+    workers != 1 the months are computed in a process pool, keeping at most
+    2 * workers of them in flight.
+    """
+    kinds, indices = tuple(kinds), tuple(indices)
+    chunks = month_chunks(start_date, end_date)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for i, (first, last) in enumerate(chunks):
+            yield from chunk_events(first, last, kinds, indices, i == 0)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for i, (first, last) in enumerate(chunks):
+            pending.append(pool.submit(chunk_events, first, last, kinds, indices, i == 0))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+# --- WRITERS: events -> text chunks ---
+
+def iter_csv(events):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(CSV_COLUMNS)
+    for event in events:
+        writer.writerow((event.start.date().isoformat(), event.kind, event.start.isoformat(timespec="seconds"),
+                         event.end.isoformat(timespec="seconds"), event.title, event.index or "", event.detail))
+        if buf.tell() >= _FLUSH_CHARS:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def _ics_text(value):
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _ics_time(dt):
+    return dt.astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _fold(line):
+    """RFC 5545 line folding: at most 75 octets per physical line."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts, limit = [], 75
+    while data:
+        cut = min(limit, len(data))
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:  # Never split a UTF-8 sequence
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data, limit = data[cut:], 74  # Continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def iter_ics(events, name="Astro Market Calendar"):
+    stamp = _ics_time(datetime.datetime.now(datetime.timezone.utc))
+    chunk = ["BEGIN:VCALENDAR\r\n", "VERSION:2.0\r\n", "PRODID:-//astrocore//market calendar//EN\r\n",
+             "CALSCALE:GREGORIAN\r\n", _fold(f"X-WR-CALNAME:{_ics_text(name)}")]
+    size = 0
+    for event in events:
+        uid = f"{event.kind}-{(event.index or '').replace(' ', '_')}-{_ics_time(event.start)}@astrocore"
+        lines = ["BEGIN:VEVENT\r\n", _fold(f"UID:{_ics_text(uid)}"), f"DTSTAMP:{stamp}\r\n",
+                 f"DTSTART:{_ics_time(event.start)}\r\n", f"DTEND:{_ics_time(event.end)}\r\n",
+                 _fold(f"SUMMARY:{_ics_text(event.title)}"),
+                 _fold(f"DESCRIPTION:{_ics_text(event.detail)}") if event.detail else "",
+                 f"CATEGORIES:{event.kind.upper()}\r\n", "END:VEVENT\r\n"]
+        chunk.extend(lines)
+        size += sum(len(line) for line in lines)
+        if size >= _FLUSH_CHARS:
+            yield "".join(chunk)
+            chunk, size = [], 0
+    chunk.append("END:VCALENDAR\r\n")
+    yield "".join(chunk)
+
+
+WRITERS = {"csv": iter_csv, "ics": iter_ics}
+
+
+def export_text(start_date, end_date, fmt="csv", kinds=KINDS, indices=INDICES, workers=None):
+    """
+    Generator of text chunks of the whole export, to stream into files and
+    responses (the page's download button joins them into one payload).
+    """
+    return WRITERS[fmt](export_events(start_date, end_date, kinds, indices, workers))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m astrocore.export",
+                                     description="Stream horas, Rahu Kaal, planner zones and tithis to CSV / iCalendar.")
+    parser.add_argument("--start-year", type=int, required=True)
+    parser.add_argument("--end-year", type=int, required=True)
+    parser.add_argument("--format", choices=sorted(WRITERS), help="Default: from --out's extension, else csv")
+    parser.add_argument("--kind", action="append", choices=KINDS, help="Event kinds to include (default all)")
+    parser.add_argument("--index", action="append", choices=INDICES, help="Indices for best/danger (default all)")
+    parser.add_argument("--workers", type=int, help="Processes (default: all cores; 1 = no pool)")
+    parser.add_argument("--out", help="Output file (default stdout)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("ics" if args.out and args.out.endswith(".ics") else "csv")
+    chunks = export_text(datetime.date(args.start_year, 1, 1), datetime.date(args.end_year, 12, 31), fmt,
+                         args.kind or KINDS, args.index or INDICES, args.workers)
+    if args.out:
+        # Write beside the target and swap in, so a failed export never leaves half a file
+        tmp_path = args.out + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="") as fh:
+            fh.writelines(chunks)
+        os.replace(tmp_path, args.out)
+    else:
+        sys.stdout.writelines(chunks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+"""
+Fast analytic Sun/Moon engine: truncated series in pure NumPy, no ephemeris file.
+
+Selected for the whole process with ASTRO_ENGINE=fast (config.ENGINE): the
+sunrise/sunset search behind every schedule and the tithi / nakshatra
+transition finders then sample these functions instead of skyfield's
+observe().apparent() chain. Everything is vectorized over arrays of Julian
+dates (TT).
+
+  * Sun: Meeus, Astronomical Algorithms ch. 25 (low accuracy) plus the
+    Venus / Jupiter / Moon perturbation terms, ~0.005 deg.
+  * Moon: Meeus ch. 47 (ELP-2000/82 truncated: 60 longitude terms, the main
+    latitude and distance terms), ~10 arcsec.
+  * Both are made topocentric with the observer's WGS84 position (lunar
+    parallax is up to ~1 deg, solar 9 arcsec).
+  * Both are returned in the same frame as get_sidereal_pos(): apparent
+    longitude on the true ecliptic of date (Meeus ch. 22 nutation), minus
+    the same true Lahiri ayanamsa.
+  * Sunrise/sunset: hour-angle iteration on the Sun's apparent RA/Dec with
+    skyfield's -0.8333 deg horizon; the Sun's 9 arcsec parallax is ignored.
+
+Error bounds against the skyfield/JPL path are measured, not assumed:
+
+    python -m astrocore.fastastro validate --start 1950-01-01 --end 2050-12-31
+
+reports max / p99 longitude errors, the equivalent transition-timing error,
+tithi / nakshatra mismatch rates, sunrise/sunset errors and the speed-up.
+Expect up to ~0.005 deg for the Sun and ~0.003 deg for the Moon, i.e. tithi
+edges within about a minute, nakshatra edges within ~20 s and sunrise/sunset
+within a few seconds; use the skyfield engine when exact times matter.
+The speed-up is about one order of magnitude, not several: measured at
+roughly 30x for the sunrise/sunset search and 10x for batched Moon/Sun
+positions (20000 instants). The fast engine's real saving is that the
+kernel is never loaded, so get_sidereal_pos("moon" / "sun", ...), natal
+profiles, the API and the page all start without it.
+"""
+import sys
+import time
+import json
+import argparse
+import datetime
+
+import numpy as np
+
+from .config import TZ_IST, NSE_LAT, NSE_LON, ASSAM_PLACES
+
+J2000 = 2451545.0
+_UNIX_EPOCH_JD = 2440587.5
+_RAD = np.pi / 180.0
+
+# Delta T = TT - UT in seconds (observed to 2020, extrapolated after); a few
+# seconds of error here move the Moon by well under an arcsec
+_DELTA_T_YEARS = np.arange(1900, 2060, 10)
+_DELTA_T_SECONDS = np.array([-2.8, 10.4, 21.2, 24.0, 24.3, 29.1, 33.2, 40.2,
+                             50.5, 56.9, 63.8, 66.1, 69.4, 71.0, 72.5, 74.0])
+
+# Meeus table 47.A: multiples of D, M, M', F and the longitude (1e-6 deg) term
+_MOON_LON_TERMS = np.array([
+    (0, 0, 1, 0, 6288774), (2, 0, -1, 0, 1274027), (2, 0, 0, 0, 658314), (0, 0, 2, 0, 213618),
+    (0, 1, 0, 0, -185116), (0, 0, 0, 2, -114332), (2, 0, -2, 0, 58793), (2, -1, -1, 0, 57066),
+    (2, 0, 1, 0, 53322), (2, -1, 0, 0, 45758), (0, 1, -1, 0, -40923), (1, 0, 0, 0, -34720),
+    (0, 1, 1, 0, -30383), (2, 0, 0, -2, 15327), (0, 0, 1, 2, -12528), (0, 0, 1, -2, 10980),
+    (4, 0, -1, 0, 10675), (0, 0, 3, 0, 10034), (4, 0, -2, 0, 8548), (2, 1, -1, 0, -7888),
+    (2, 1, 0, 0, -6766), (1, 0, -1, 0, -5163), (1, 1, 0, 0, 4987), (2, -1, 1, 0, 4036),
+    (2, 0, 2, 0, 3994), (4, 0, 0, 0, 3861), (2, 0, -3, 0, 3665), (0, 1, -2, 0, -2689),
+    (2, 0, -1, 2, -2602), (2, -1, -2, 0, 2390), (1, 0, 1, 0, -2348), (2, -2, 0, 0, 2236),
+    (0, 1, 2, 0, -2120), (0, 2, 0, 0, -2069), (2, -2, -1, 0, 2048), (2, 0, 1, -2, -1773),
+    (2, 0, 0, 2, -1595), (4, -1, -1, 0, 1215), (0, 0, 2, 2, -1110), (3, 0, -1, 0, -892),
+    (2, 1, 1, 0, -810), (4, -1, -2, 0, 759), (0, 2, -1, 0, -713), (2, 2, -1, 0, -700),
+    (2, 1, -2, 0, 691), (2, -1, 0, -2, 596), (4, 0, 1, 0, 549), (0, 0, 4, 0, 537),
+    (4, -1, 0, 0, 520), (1, 0, -2, 0, -487), (2, 1, 0, -2, -399), (0, 0, 2, -2, -381),
+    (1, 1, 1, 0, 351), (3, 0, -2, 0, -340), (4, 0, -3, 0, 330), (2, -1, 2, 0, 327),
+    (0, 2, 1, 0, -323), (1, 1, -1, 0, 299), (2, 0, 3, 0, 294),
+])
+# Largest distance terms of table 47.A (1e-3 km): enough for the parallax
+_MOON_DIST_TERMS = np.array([
+    (0, 0, 1, 0, -20905355), (2, 0, -1, 0, -3699111), (2, 0, 0, 0, -2955968), (0, 0, 2, 0, -569925),
+    (2, 0, -2, 0, 246158), (2, -1, 0, 0, -204586), (2, 0, 1, 0, -170733), (2, -1, -1, 0, -152138),
+    (0, 1, -1, 0, -129620), (1, 0, 0, 0, 108743), (0, 1, 1, 0, 104755), (0, 0, 1, -2, 79661),
+    (0, 1, 0, 0, 48888), (4, 0, -1, 0, -34782),
+])
+# Largest latitude terms of table 47.B (1e-6 deg)
+_MOON_LAT_TERMS = np.array([
+    (0, 0, 0, 1, 5128122), (0, 0, 1, 1, 280602), (0, 0, 1, -1, 277693), (2, 0, 0, -1, 173237),
+    (2, 0, -1, 1, 55413), (2, 0, -1, -1, 46271), (2, 0, 0, 1, 32573), (0, 0, 2, 1, 17198),
+    (2, 0, 1, -1, 9266), (0, 0, 2, -1, 8822), (2, -1, 0, -1, 8216), (2, 0, -2, -1, 4324),
+    (2, 0, 1, 1, 4200), (2, 1, 0, -1, -3359),
+])
+
+AU_KM = 149597870.7
+EARTH_RADIUS_KM = 6378.137
+EARTH_AXIS_RATIO = 0.99664719  # b / a (WGS84)
+SUNRISE_ALTITUDE = -0.8333     # Same horizon as almanac.sunrise_sunset()
+
+
+def _centuries(jd_tt):
+    return (np.asarray(jd_tt, dtype=float) - J2000) / 36525.0
+
+
+def delta_t_seconds(jd):
+    year = 2000.0 + (np.asarray(jd, dtype=float) - J2000) / 365.25
+    return np.interp(year, _DELTA_T_YEARS, _DELTA_T_SECONDS)
+
+
+def jd_tt_from_posix(seconds):
+    jd_ut = np.asarray(seconds, dtype=float) / 86400.0 + _UNIX_EPOCH_JD
+    return jd_ut + delta_t_seconds(jd_ut) / 86400.0
+
+
+def _nutation_longitude(T):
+    """Nutation in longitude (deg), Meeus ch. 22 short series (~0.5 arcsec)."""
+    omega = (125.04452 - 1934.136261 * T) * _RAD
+    L = (280.4665 + 36000.7698 * T) * _RAD
+    Lp = (218.3165 + 481267.8813 * T) * _RAD
+    return (-17.20 * np.sin(omega) - 1.32 * np.sin(2 * L) - 0.23 * np.sin(2 * Lp)
+            + 0.21 * np.sin(2 * omega)) / 3600.0
+
+
+def _mean_obliquity(T):
+    return 23.439291111 - 0.0130041667 * T - 1.64e-7 * T * T
+
+
+def _gmst_degrees(jd_ut):
+    d = jd_ut - J2000
+    T = d / 36525.0
+    return (280.46061837 + 360.98564736629 * d + 0.000387933 * T * T - T ** 3 / 38710000.0) % 360.0
+
+
+def sun_longitude_of_date(jd_tt):
+    """Geometric longitude of the Sun, mean equinox of date (deg), and its distance (AU)."""
+    T = _centuries(jd_tt)
+    L0 = 280.46646 + 36000.76983 * T + 0.0003032 * T * T
+    M = (357.52911 + 35999.05029 * T - 0.0001537 * T * T) * _RAD
+    C = ((1.914602 - 0.004817 * T - 0.000014 * T * T) * np.sin(M)
+         + (0.019993 - 0.000101 * T) * np.sin(2 * M) + 0.000289 * np.sin(3 * M))
+    # Venus, Jupiter, Moon and long-period terms (Meeus, Astronomical Formulae for Calculators)
+    perturbation = (0.00134 * np.cos((153.23 + 22518.7541 * T) * _RAD)
+                    + 0.00154 * np.cos((216.57 + 45037.5082 * T) * _RAD)
+                    + 0.00200 * np.cos((312.69 + 32964.3577 * T) * _RAD)
+                    + 0.00179 * np.sin((350.74 + 445267.1142 * T) * _RAD)
+                    + 0.00178 * np.sin((231.19 + 20.20 * T) * _RAD))
+    e = 0.016708634 - 0.000042037 * T
+    distance = 1.000001018 * (1 - e * e) / (1 + e * np.cos(M + C * _RAD))
+    return (L0 + C + perturbation) % 360.0, distance
+
+
+def _moon_arguments(T):
+    Lp = 218.3164477 + 481267.88123421 * T - 0.0015786 * T ** 2 + T ** 3 / 538841.0 - T ** 4 / 65194000.0
+    D = 297.8501921 + 445267.1114034 * T - 0.0018819 * T ** 2 + T ** 3 / 545868.0 - T ** 4 / 113065000.0
+    M = 357.5291092 + 35999.0502909 * T - 0.0001536 * T ** 2 + T ** 3 / 24490000.0
+    Mp = 134.9633964 + 477198.8675055 * T + 0.0087414 * T ** 2 + T ** 3 / 69699.0 - T ** 4 / 14712000.0
+    F = 93.2720950 + 483202.0175233 * T - 0.0036539 * T ** 2 - T ** 3 / 3526000.0 + T ** 4 / 863310000.0
+    return Lp * _RAD, D * _RAD, M * _RAD, Mp * _RAD, F * _RAD
+
+
+def _series(terms, args, E, trig):
+    D, M, Mp, F = args
+    total = np.zeros_like(D)
+    for d, m, mp, f, coeff in terms:
+        term = coeff * trig(d * D + m * M + mp * Mp + f * F)
+        if m:
+            term *= E if abs(m) == 1 else E * E
+        total += term
+    return total
+
+
+def moon_position_of_date(jd_tt):
+    """Geocentric Moon: longitude, latitude (deg, mean equinox of date) and distance (km)."""
+    T = _centuries(jd_tt)
+    Lp, D, M, Mp, F = _moon_arguments(T)
+    E = 1 - 0.002516 * T - 0.0000074 * T * T
+    A1 = (119.75 + 131.849 * T) * _RAD
+    A2 = (53.09 + 479264.290 * T) * _RAD
+    A3 = (313.45 + 481266.484 * T) * _RAD
+    args = (D, M, Mp, F)
+
+    sum_l = _series(_MOON_LON_TERMS, args, E, np.sin)
+    sum_l += 3958 * np.sin(A1) + 1962 * np.sin(Lp - F) + 318 * np.sin(A2)
+    sum_b = _series(_MOON_LAT_TERMS, args, E, np.sin)
+    sum_b += (-2235 * np.sin(Lp) + 382 * np.sin(A3) + 175 * np.sin(A1 - F) + 175 * np.sin(A1 + F)
+              + 127 * np.sin(Lp - Mp) - 115 * np.sin(Lp + Mp))
+    sum_r = _series(_MOON_DIST_TERMS, args, E, np.cos)
+
+    lon = (Lp / _RAD + sum_l / 1e6) % 360.0
+    return lon, sum_b / 1e6, 385000.56 + sum_r / 1000.0
+
+
+def _observer_ecliptic(jd_tt, lat, lon, T):
+    """Observer's geocentric position (km) in the ecliptic-of-date frame."""
+    lat_r = np.asarray(lat, dtype=float) * _RAD
+    u = np.arctan(EARTH_AXIS_RATIO * np.tan(lat_r))
+    rho_sin, rho_cos = EARTH_AXIS_RATIO * np.sin(u), np.cos(u)
+    jd_ut = jd_tt - delta_t_seconds(jd_tt) / 86400.0
+    theta = (_gmst_degrees(jd_ut) + np.asarray(lon, dtype=float)) * _RAD
+    x = EARTH_RADIUS_KM * rho_cos * np.cos(theta)
+    y = EARTH_RADIUS_KM * rho_cos * np.sin(theta)
+    z = EARTH_RADIUS_KM * rho_sin
+    eps = _mean_obliquity(T) * _RAD
+    return x, y * np.cos(eps) + z * np.sin(eps), -y * np.sin(eps) + z * np.cos(eps)
+
+
+def _topocentric(lam, beta, dist_km, jd_tt, lat, lon, T):
+    """Shifts an ecliptic-of-date longitude (deg) from the geocentre to the observer."""
+    lam_r, beta_r = lam * _RAD, beta * _RAD
+    ox, oy, _ = _observer_ecliptic(jd_tt, lat, lon, T)
+    x = dist_km * np.cos(beta_r) * np.cos(lam_r) - ox
+    y = dist_km * np.cos(beta_r) * np.sin(lam_r) - oy
+    return np.arctan2(y, x) / _RAD
+
+
+def moon_longitude(jd_tt, lat=None, lon=None):
+    """
+    Apparent longitude of the Moon on the true ecliptic of date (deg),
+    topocentric when lat/lon are given: the tropical value get_sidereal_pos()
+    starts from.
+    """
+    jd_tt = np.asarray(jd_tt, dtype=float)
+    T = _centuries(jd_tt)
+    lam, beta, dist = moon_position_of_date(jd_tt)
+    if lat is not None:
+        lam = _topocentric(lam, beta, dist, jd_tt, lat, lon, T)
+    return (lam + _nutation_longitude(T)) % 360.0
+
+
+def sun_longitude(jd_tt, lat=None, lon=None):
+    """Apparent longitude of the Sun on the true ecliptic of date (deg), topocentric with lat/lon."""
+    jd_tt = np.asarray(jd_tt, dtype=float)
+    T = _centuries(jd_tt)
+    lam, distance = sun_longitude_of_date(jd_tt)
+    lam = lam - 0.005691611 / distance
+    if lat is not None:
+        lam = _topocentric(lam, 0.0, distance * AU_KM, jd_tt, lat, lon, T)
+    return (lam + _nutation_longitude(T)) % 360.0
+
+
+def _ayanamsa(jd_tt):
+    from .panchang import lahiri_ayanamsa
+    return lahiri_ayanamsa(jd_tt)
+
+
+def moon_sidereal(jd_tt, lat=NSE_LAT, lon=NSE_LON):
+    """Fast counterpart of get_sidereal_pos(moon, t, location(lat, lon))."""
+    return (moon_longitude(jd_tt, lat, lon) - _ayanamsa(jd_tt)) % 360.0
+
+
+def sun_sidereal(jd_tt, lat=NSE_LAT, lon=NSE_LON):
+    """Fast counterpart of get_sidereal_pos(sun, t, location(lat, lon))."""
+    return (sun_longitude(jd_tt, lat, lon) - _ayanamsa(jd_tt)) % 360.0
+
+
+def tithi_index(jd_tt, lat=NSE_LAT, lon=NSE_LON):
+    """0-based tithi (0-29): Moon-Sun elongation in 12 deg steps."""
+    return ((moon_longitude(jd_tt, lat, lon) - sun_longitude(jd_tt, lat, lon)) % 360.0 // 12).astype(int)
+
+
+def padam_index(jd_tt, lat=NSE_LAT, lon=NSE_LON):
+    """0-based nakshatra padam (0-107) of the sidereal Moon."""
+    return (moon_sidereal(jd_tt, lat, lon) // (360.0 / 108)).astype(int)
+
+
+# --- SUNRISE / SUNSET ---
+
+def _sun_equatorial(jd_tt):
+    """Apparent right ascension and declination of the Sun (radians), true equinox of date."""
+    T = _centuries(jd_tt)
+    lam, distance = sun_longitude_of_date(jd_tt)
+    omega = (125.04 - 1934.136 * T) * _RAD
+    lam_app = (lam - 0.00569 - 0.00478 * np.sin(omega)) * _RAD
+    eps = (_mean_obliquity(T) + 0.00256 * np.cos(omega)) * _RAD
+    return (np.arctan2(np.cos(eps) * np.sin(lam_app), np.cos(lam_app)),
+            np.arcsin(np.sin(eps) * np.sin(lam_app)))
+
+
+def _solve_hour_angle(guess_s, lat, lon, rising, iterations=4):
+    """POSIX seconds when the Sun crosses SUNRISE_ALTITUDE nearest `guess_s` (NaN if it never does)."""
+    lat_r = lat * _RAD
+    sin_h0 = np.sin(SUNRISE_ALTITUDE * _RAD)
+    t = guess_s.copy()
+    for _ in range(iterations):
+        jd_ut = t / 86400.0 + _UNIX_EPOCH_JD
+        ra, dec = _sun_equatorial(jd_ut + delta_t_seconds(jd_ut) / 86400.0)
+        cos_h0 = (sin_h0 - np.sin(lat_r) * np.sin(dec)) / (np.cos(lat_r) * np.cos(dec))
+        h0 = np.arccos(np.clip(cos_h0, -1.0, 1.0)) / _RAD
+        target = np.where(rising, -h0, h0)
+        hour_angle = _gmst_degrees(jd_ut) + lon - ra / _RAD
+        step = (target - hour_angle + 180.0) % 360.0 - 180.0
+        t = t + step / 360.98564736629 * 86400.0
+    return np.where(np.abs(cos_h0) <= 1.0, t, np.nan)
+
+
+def find_sun_events(start_date, n_days, lats, lons):
+    """
+    Same contract as schedule.find_sun_events(): first sunrise and sunset of
+    each IST day, (n_sites, n_days) POSIX seconds, NaN where there is none.
+    Each event is solved from the local noon of its day, which keeps it on
+    the right IST day wherever sunrise and sunset fall inside it (all India).
+    """
+    lats = np.atleast_1d(np.asarray(lats, dtype=float))[:, None]
+    lons = np.atleast_1d(np.asarray(lons, dtype=float))[:, None]
+    midnight = TZ_IST.localize(datetime.datetime.combine(start_date, datetime.time())).timestamp()
+    midnight_s = midnight + 86400.0 * np.arange(n_days)[None, :]
+    noon_s = midnight_s + (12.0 - lons / 15.0 + 5.5) * 3600.0  # Local mean noon, as IST clock time
+    shape = np.broadcast_shapes(lats.shape, midnight_s.shape)
+    lat, lon = np.broadcast_to(lats, shape), np.broadcast_to(lons, shape)
+    sunrise = _solve_hour_angle(np.broadcast_to(noon_s - 6 * 3600.0, shape).copy(), lat, lon, True)
+    sunset = _solve_hour_angle(np.broadcast_to(noon_s + 6 * 3600.0, shape).copy(), lat, lon, False)
+    for out in (sunrise, sunset):
+        out[(out < midnight_s) | (out >= midnight_s + 86400.0)] = np.nan
+    return sunrise, sunset
+
+
+# --- VALIDATION ---
+
+def _wrap(delta):
+    return np.abs((delta + 180.0) % 360.0 - 180.0)
+
+
+def _stats(errors):
+    return {"max": float(np.max(errors)), "p99": float(np.percentile(errors, 99)),
+            "mean": float(np.mean(errors))}
+
+
+def validate(start, end, samples=20000, sun_days=60, seed=0):
+    """Error and speed of this engine against the skyfield path over [start, end] (dates)."""
+    from .ephemeris import get_ephemeris, location
+    from .panchang import get_sidereal_pos
+    from .schedule import find_sun_events as skyfield_sun_events
+
+    ephem = get_ephemeris()
+    rng = np.random.default_rng(seed)
+    first = TZ_IST.localize(datetime.datetime.combine(start, datetime.time())).timestamp()
+    last = TZ_IST.localize(datetime.datetime.combine(end, datetime.time(23, 59))).timestamp()
+    posix = np.sort(rng.uniform(first, last, samples))
+    t = ephem.ts.from_datetimes([datetime.datetime.fromtimestamp(s, TZ_IST) for s in posix])
+    jd_tt = t.tt
+    report = {"start": start.isoformat(), "end": end.isoformat(), "samples": samples}
+
+    started = time.perf_counter()
+    ref_moon = get_sidereal_pos(ephem.moon, t, location(NSE_LAT, NSE_LON))
+    ref_sun = get_sidereal_pos(ephem.sun, t, location(NSE_LAT, NSE_LON))
+    skyfield_s = time.perf_counter() - started
+    started = time.perf_counter()
+    moon = moon_sidereal(jd_tt)
+    sun = sun_sidereal(jd_tt)
+    fast_s = time.perf_counter() - started
+    report["speedup_positions"] = skyfield_s / fast_s
+
+    moon_err, sun_err = _wrap(moon - ref_moon), _wrap(sun - ref_sun)
+    elong_err = _wrap((moon - sun) - (ref_moon - ref_sun))
+    report["moon_deg"] = _stats(moon_err)
+    report["sun_deg"] = _stats(sun_err)
+    # Equivalent timing error of a transition: longitude error / mean rate
+    report["nakshatra_timing_s"] = _stats(moon_err / 13.176 * 86400.0)
+    report["tithi_timing_s"] = _stats(elong_err / 12.19 * 86400.0)
+    report["nakshatra_mismatch_rate"] = float(np.mean(moon // (360 / 27) != ref_moon // (360 / 27)))
+    report["tithi_mismatch_rate"] = float(np.mean((moon - sun) % 360 // 12 != (ref_moon - ref_sun) % 360 // 12))
+
+    sites = [(NSE_LAT, NSE_LON)] + list(ASSAM_PLACES.values())
+    lats, lons = [s[0] for s in sites], [s[1] for s in sites]
+    span_days = (end - start).days + 1
+    days = sorted({start + datetime.timedelta(days=int(d)) for d in rng.integers(0, span_days, sun_days)})
+    errors, skyfield_s, fast_s = [], 0.0, 0.0
+    for day in days:
+        started = time.perf_counter()
+        ref = skyfield_sun_events(day, 1, lats, lons)
+        skyfield_s += time.perf_counter() - started
+        started = time.perf_counter()
+        got = find_sun_events(day, 1, lats, lons)
+        fast_s += time.perf_counter() - started
+        for a, b in zip(got, ref):
+            errors.append(np.abs(a - b).ravel())
+    errors = np.concatenate(errors)
+    report["sun_event_days"] = len(days)
+    report["sun_event_missing"] = int(np.isnan(errors).sum())
+    report["sun_event_s"] = _stats(errors[~np.isnan(errors)])
+    report["speedup_sun_events"] = skyfield_s / fast_s
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m astrocore.fastastro",
+                                     description="Validate the fast analytic engine against skyfield.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    check = sub.add_parser("validate", help="Measure errors and speed-up over a date range")
+    check.add_argument("--start", type=datetime.date.fromisoformat, default=datetime.date(1950, 1, 1))
+    check.add_argument("--end", type=datetime.date.fromisoformat, default=datetime.date(2050, 12, 31))
+    check.add_argument("--samples", type=int, default=20000, help="Random instants for positions")
+    check.add_argument("--sun-days", type=int, default=60, help="Random days for sunrise/sunset")
+    check.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = validate(args.start, args.end, args.samples, args.sun_days)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['start']} .. {report['end']}, {report['samples']} instants, "
+          f"{report['sun_event_days']} days x {1 + len(ASSAM_PLACES)} sites")
+    for key, unit in (("moon_deg", "deg"), ("sun_deg", "deg"), ("nakshatra_timing_s", "s"),
+                      ("tithi_timing_s", "s"), ("sun_event_s", "s")):
+        s = report[key]
+        print(f"  {key:20s} max {s['max']:10.5f} {unit}  p99 {s['p99']:10.5f}  mean {s['mean']:10.5f}")
+    print(f"  nakshatra mismatch {report['nakshatra_mismatch_rate']:.2e}, "
+          f"tithi mismatch {report['tithi_mismatch_rate']:.2e}, "
+          f"sunrise/sunset missing {report['sun_event_missing']}")
+    print(f"  speed-up: positions x{report['speedup_positions']:.0f}, "
+          f"sunrise/sunset x{report['speedup_sun_events']:.0f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Typed results of the compute core. All are immutable, so cached values can be shared safely."""
+import datetime
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class HoraSlot:
+    start: datetime.datetime
+    end: datetime.datetime
+    planet: str
+    is_rahu: bool
+
+
+@dataclass(frozen=True)
+class DaySchedule:
+    """Market-hours view of one trading date (slots is empty if the Sun never rose)."""
+    date: datetime.date
+    slots: Tuple[HoraSlot, ...]
+    day_lord: Optional[str]
+    rahu_start: Optional[datetime.datetime]
+    rahu_end: Optional[datetime.datetime]
+
+
+@dataclass(frozen=True, eq=False)
+class ScheduleBatch:
+    """
+    Vectorized schedules for consecutive dates. Times are POSIX seconds
+    (NaN where the Sun never rises); hora_planet indexes HORA_FIXED_ORDER.
+    """
+    dates: np.ndarray        # (n,) datetime64[D]
+    weekday: np.ndarray      # (n,) 0=Mon
+    sunrise: np.ndarray      # (n,)
+    sunset: np.ndarray       # (n,)
+    hora_bounds: np.ndarray  # (n, 13)
+    hora_planet: np.ndarray  # (n, 12)
+    rahu_start: np.ndarray   # (n,)
+    rahu_end: np.ndarray     # (n,)
+    in_market: np.ndarray    # (n, 12) bool, hora overlaps 09:00-15:30
+    is_rahu: np.ndarray      # (n, 12) bool, hora touches Rahu Kaal
+
+    def __len__(self):
+        return len(self.dates)
+
+
+@dataclass(frozen=True)
+class Site:
+    """A place whose sunrise sets the horas, traded in one of config.SESSIONS."""
+    name: str
+    lat: float
+    lon: float
+    session: str
+
+
+@dataclass(frozen=True, eq=False)
+class SiteBatch:
+    """
+    Vectorized schedules for many sites over consecutive dates. Each date has
+    25 horas: 0 is the last night hora before sunrise, 1-12 the day horas and
+    13-24 the night horas up to the next sunrise. Times are POSIX seconds
+    (NaN where the Sun does not rise and set); hora_planet indexes
+    HORA_FIXED_ORDER.
+    """
+    sites: Tuple[Site, ...]
+    dates: np.ndarray        # (n,) datetime64[D]
+    weekday: np.ndarray      # (n,) 0=Mon
+    sunrise: np.ndarray      # (sites, n)
+    sunset: np.ndarray       # (sites, n)
+    hora_bounds: np.ndarray  # (sites, n, 26)
+    hora_planet: np.ndarray  # (n, 25), the same for every site
+    rahu_start: np.ndarray   # (sites, n)
+    rahu_end: np.ndarray     # (sites, n)
+    in_session: np.ndarray   # (sites, n, 25) bool, hora overlaps the site's session
+    is_rahu: np.ndarray      # (sites, n, 25) bool, hora overlaps Rahu Kaal
+
+    def __len__(self):
+        return len(self.dates)
+
+
+@dataclass(frozen=True)
+class TithiSegment:
+    tithi: int          # 1-30
+    name: str
+    start: datetime.datetime
+    end: datetime.datetime
+
+
+@dataclass(frozen=True)
+class NakshatraSegment:
+    nakshatra: str
+    lord: str
+    padam: Optional[int]  # Only set for padam-level segments
+    start: datetime.datetime
+    end: datetime.datetime
+
+
+@dataclass(frozen=True)
+class NatalProfile:
+    """Birth Moon of one person: sidereal longitude, nakshatra, lord and padam."""
+    dob: datetime.date
+    tob: datetime.time
+    lat: float
+    lon: float
+    moon_deg: float
+    nakshatra: str
+    lord: str
+    padam: int
+
+
+@dataclass(frozen=True)
+class CalendarEvent:
+    """One exported calendar entry (see astrocore.export)."""
+    kind: str             # "hora", "rahu_kaal", "best", "danger" or "tithi"
+    start: datetime.datetime
+    end: datetime.datetime
+    title: str
+    index: Optional[str]  # Only set for "best" / "danger"
+    detail: str
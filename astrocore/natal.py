@@ -0,0 +1,160 @@
+"""
+Natal (birth Moon) profiles for one user or a whole desk.
+
+A birth chart never changes, so each (DOB, TOB, place) is computed once and
+kept in a small SQLite file. Missing profiles are computed together: one
+skyfield call (or one fastastro call with ASTRO_ENGINE=fast) observes the
+Moon for every birth time from every birthplace (time and observer arrays
+broadcast). Luck against a hora planet is then a LUCK_TABLE lookup per
+person.
+
+    python -m astrocore.natal roster.csv --hora Jupiter > desk.csv
+
+where roster.csv has columns name,dob,tob,lat,lon (ISO date / HH:MM).
+"""
+import os
+import csv
+import sys
+import sqlite3
+import argparse
+import datetime
+import threading
+
+import numpy as np
+
+from .config import TZ_IST, NATAL_DB_FILE
+from .models import NatalProfile
+from .perf import span
+
+VERSION = 2  # 2: nakshatras on the true Lahiri ayanamsa (equinox of date), as store.VERSION
+
+
+def profile_key(dob, tob, lat, lon):
+    return dob.isoformat(), tob.isoformat(), round(lat, 4), round(lon, 4)
+
+
+def compute_profiles(births):
+    """NatalProfile for every (dob, tob, lat, lon) in `births`, in one vectorized pass."""
+    from skyfield.api import wgs84
+    from .ephemeris import get_timescale
+    from .panchang import NAKSHATRAS, NAKSHATRA_LORDS, get_sidereal_pos
+
+    births = list(births)
+    if not births:
+        return []
+    with span("natal.batch", profiles=len(births)):
+        t = get_timescale().from_datetimes([TZ_IST.localize(datetime.datetime.combine(dob, tob))
+                                     for dob, tob, _, _ in births])
+        observers = wgs84.latlon(np.array([b[2] for b in births], dtype=float),
+                                 np.array([b[3] for b in births], dtype=float))
+        moon_deg = np.atleast_1d(get_sidereal_pos("moon", t, observers))
+
+    # Same nakshatra / padam arithmetic as get_nakshatra_info_sidereal()
+    idx = (moon_deg / 13.333333333).astype(int) % 27
+    padam = ((moon_deg % 13.333333333) / 3.333333333).astype(int) + 1
+    return [NatalProfile(dob=dob, tob=tob, lat=lat, lon=lon, moon_deg=float(deg),
+                         nakshatra=NAKSHATRAS[i], lord=NAKSHATRA_LORDS[i], padam=int(p))
+            for (dob, tob, lat, lon), deg, i, p in zip(births, moon_deg, idx, padam)]
+
+
+class NatalStore:
+    """
+    Profiles keyed by (DOB, TOB, place), held in memory and persisted to
+    SQLite (path=None keeps them in memory only). Safe to share between
+    sessions and threads. The file's PRAGMA user_version records VERSION;
+    profiles written by another version are dropped on open and recomputed
+    when next asked for.
+    """
+
+    def __init__(self, path=NATAL_DB_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._profiles = {}
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS natal (dob TEXT, tob TEXT, lat REAL, lon REAL, "
+                "moon_deg REAL, nakshatra TEXT, lord TEXT, padam INTEGER, PRIMARY KEY (dob, tob, lat, lon))")
+            if self._db.execute("PRAGMA user_version").fetchone()[0] != VERSION:
+                with self._db:
+                    self._db.execute("DELETE FROM natal")
+                    self._db.execute(f"PRAGMA user_version = {VERSION}")
+            for row in self._db.execute("SELECT * FROM natal"):
+                dob, tob, lat, lon, moon_deg, nakshatra, lord, padam = row
+                self._profiles[(dob, tob, lat, lon)] = NatalProfile(
+                    dob=datetime.date.fromisoformat(dob), tob=datetime.time.fromisoformat(tob),
+                    lat=lat, lon=lon, moon_deg=moon_deg, nakshatra=nakshatra, lord=lord, padam=padam)
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def get(self, dob, tob, lat, lon):
+        return self.get_many([(dob, tob, lat, lon)])[0]
+
+    def get_many(self, births):
+        """Profiles for `births` in order; whatever is missing is computed in one batch."""
+        births = [(dob, tob, round(lat, 4), round(lon, 4)) for dob, tob, lat, lon in births]
+        keys = [profile_key(*b) for b in births]
+        with self._lock:
+            missing = {key: birth for key, birth in zip(keys, births) if key not in self._profiles}
+        if missing:
+            computed = compute_profiles(missing.values())
+            with self._lock:
+                for key, profile in zip(missing, computed):
+                    self._profiles[key] = profile
+                if self._db is not None:
+                    with self._db:
+                        self._db.executemany(
+                            "INSERT OR REPLACE INTO natal VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            [key + (p.moon_deg, p.nakshatra, p.lord, p.padam)
+                             for key, p in zip(missing, computed)])
+        with self._lock:
+            return [self._profiles[key] for key in keys]
+
+
+def desk_luck(profiles, hora_planet):
+    """(label, badge, pct) for each profile against `hora_planet`: one table lookup each."""
+    from .predict import LUCK_TABLE
+    neutral = ("Neutral", "badge-neutral", 50)
+    return [LUCK_TABLE.get((p.lord, hora_planet), neutral) for p in profiles]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_natal_store():
+    """Process-wide store backed by NATAL_DB_FILE."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = NatalStore()
+        return _store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m astrocore.natal",
+                                     description="Birth nakshatra (and luck for a hora) for a roster CSV.")
+    parser.add_argument("roster", help="CSV with columns name,dob,tob,lat,lon")
+    parser.add_argument("--hora", help="Also report luck against this hora planet")
+    parser.add_argument("--db", default=NATAL_DB_FILE, help="Profile store (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    with open(args.roster, newline="") as fh:
+        rows = list(csv.DictReader(fh))
+    births = [(datetime.date.fromisoformat(r["dob"]), datetime.time.fromisoformat(r["tob"]),
+               float(r["lat"]), float(r["lon"])) for r in rows]
+    profiles = NatalStore(args.db).get_many(births)
+    lucks = desk_luck(profiles, args.hora) if args.hora else [None] * len(profiles)
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["name", "nakshatra", "padam", "lord", "moon_deg"] + (["luck", "luck_pct"] if args.hora else []))
+    for row, p, luck in zip(rows, profiles, lucks):
+        writer.writerow([row["name"], p.nakshatra, p.padam, p.lord, f"{p.moon_deg:.4f}"]
+                        + ([luck[0], luck[2]] if luck else []))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""Sidereal (Lahiri) positions, tithi and nakshatra, plus exact transition finders."""
+import copy
+import datetime
+import threading
+
+import numpy as np
+
+from .cache import SCHEDULE_CACHE
+from .config import TZ_IST, NSE_LAT, NSE_LON, ENGINE
+from .ephemeris import get_ephemeris, get_timescale, location, nse_location, location_key
+from .models import TithiSegment, NakshatraSegment
+from .perf import span
+from .store import get_store
+
+TITHI_NAMES = ["Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", 
+               "Shashthi", "Saptami", "Ashtami", "Navami", "Dashami", 
+               "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi", "Purnima/Amavasya"]
+
+NAKSHATRAS = [
+    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra", "Punarvasu", "Pushya", "Ashlesha",
+    "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
+    "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
+]
+NAKSHATRA_LORDS = [
+    "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury",
+    "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury",
+    "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"
+]
+
+
+# --- AYANAMSA ---
+# Lahiri as defined by the Indian Astronomical Ephemeris: 23 deg 15' 00.658" at
+# 1956-03-21 0h TT (as restated for IAU 2006 precession, i.e. 23 deg 51' 25.5"
+# at J2000), carried forward by the general precession in longitude. The
+# "true" ayanamsa adds the nutation in longitude, measured from the true
+# equinox of date like get_sidereal_pos()'s tropical longitude.
+LAHIRI_EPOCH_JD = 2435553.5
+LAHIRI_AT_EPOCH = 23.245524743
+# Table span (TT Julian dates, 1900-01-01 .. 2100-01-01) and spacing; linear
+# interpolation between daily nodes is good to ~0.01 arcsec
+AYANAMSA_TABLE_SPAN = (2415020.5, 2488069.5)
+AYANAMSA_TABLE_STEP_DAYS = 1.0
+
+_ayanamsa_lock = threading.Lock()
+_ayanamsa_table = None
+
+
+def _general_precession(jd_tt):
+    """IAU 2006 general precession in longitude since J2000, arcseconds."""
+    T = (jd_tt - 2451545.0) / 36525.0
+    return T * (5028.796195 + T * (1.1054348 + T * (0.00007964 + T * (-0.000023857 + T * -0.0000000383))))
+
+
+def true_lahiri_ayanamsa(jd_tt):
+    """True Lahiri ayanamsa (deg) evaluated directly: precession from the 1956 epoch plus nutation."""
+    from skyfield.nutationlib import iau2000b
+
+    jd_tt = np.asarray(jd_tt, dtype=float)
+    mean = LAHIRI_AT_EPOCH + (_general_precession(jd_tt) - _general_precession(LAHIRI_EPOCH_JD)) / 3600.0
+    d_psi, _ = iau2000b(jd_tt)  # tenths of a microarcsecond
+    return mean + d_psi * 1e-7 / 3600.0
+
+
+def _table():
+    """(jd grid, ayanamsa) over AYANAMSA_TABLE_SPAN, built once per process on first use."""
+    global _ayanamsa_table
+    if _ayanamsa_table is None:
+        with _ayanamsa_lock:
+            if _ayanamsa_table is None:
+                with span("ayanamsa.table"):
+                    first, last = AYANAMSA_TABLE_SPAN
+                    grid = np.arange(first, last + AYANAMSA_TABLE_STEP_DAYS, AYANAMSA_TABLE_STEP_DAYS)
+                    _ayanamsa_table = (grid, true_lahiri_ayanamsa(grid))
+    return _ayanamsa_table
+
+
+def lahiri_ayanamsa(jd_tt):
+    """
+    True Lahiri ayanamsa (deg) for TT Julian dates, scalar or array: one
+    np.interp over the precomputed table, direct evaluation outside its span.
+    """
+    jd = np.asarray(jd_tt, dtype=float)
+    grid, values = _table()
+    ayanamsa = np.interp(jd, grid, values)
+    outside = (jd < grid[0]) | (jd > grid[-1])
+    if np.any(outside):
+        ayanamsa = np.where(outside, true_lahiri_ayanamsa(jd), ayanamsa)
+    return ayanamsa if ayanamsa.ndim else float(ayanamsa)
+
+
+def get_lahiri_ayanamsa(t):
+    """
+    True Lahiri Ayanamsa for a skyfield Time (scalar or array).
+    This converts Western (Tropical) Longitude to Vedic (Sidereal).
+    """
+    return lahiri_ayanamsa(t.tt)
+
+
+def _use_iau2000b(t):
+    """
+    Same shortcut as almanac.sunrise_sunset(): IAU 2000B nutation (within
+    1 mas of 2000A) is ~8x cheaper, and the observer's GAST needs it anyway.
+    Returns a copy carrying it; the caller's Time is never modified. Times
+    whose nutation was already computed are returned as they are.
+    """
+    from skyfield.nutationlib import iau2000b_radians
+    if "_nutation_angles_radians" in vars(t):
+        return t
+    t = copy.copy(t)
+    t._nutation_angles_radians = iau2000b_radians(t)
+    return t
+
+
+def get_sidereal_pos(body, t, observer_loc):
+    """
+    Returns the Sidereal Longitude (0-360) of a planet: an ephemeris body, or
+    "moon" / "sun", which ASTRO_ENGINE=fast computes without loading the kernel.
+    """
+    if isinstance(body, str):
+        if ENGINE == "fast":
+            from . import fastastro
+            fast = {"moon": fastastro.moon_sidereal, "sun": fastastro.sun_sidereal}[body]
+            sidereal_lon = fast(t.tt, observer_loc.latitude.degrees, observer_loc.longitude.degrees)
+            return sidereal_lon if np.ndim(sidereal_lon) else float(sidereal_lon)
+        body = getattr(get_ephemeris(), body)
+    with span("sidereal_pos"):
+        t = _use_iau2000b(t)
+        observer = get_ephemeris().earth + observer_loc
+        astrometric = observer.at(t).observe(body)
+        # Ayanamsa is measured from the true equinox of date, so the tropical longitude must be too
+        _, lon_ecl, _ = astrometric.apparent().ecliptic_latlon(epoch='date')
+    
+    tropical_lon = lon_ecl.degrees
+    ayanamsa = get_lahiri_ayanamsa(t)
+    
+    sidereal_lon = (tropical_lon - ayanamsa) % 360
+    return sidereal_lon
+
+
+def tithi_label(tithi_idx):
+    """Display name for a 1-based tithi number (1-30)"""
+    # Paksha (Waxing/Waning)
+    paksha = "Shukla (Waxing)" if tithi_idx <= 15 else "Krishna (Waning)"
+    display_tithi = tithi_idx if tithi_idx <= 15 else tithi_idx - 15
+    
+    name = TITHI_NAMES[display_tithi-1]
+    if tithi_idx == 30: name = "Amavasya (New Moon)"
+    if tithi_idx == 15: name = "Purnima (Full Moon)"
+    
+    return f"{name} ({paksha})"
+
+
+def get_tithi(t, observer_loc=None):
+    """Calculates the Lunar Day (Tithi) based on Sidereal positions"""
+    # Tithi is independent of Ayanamsa actually (relative distance), 
+    # but using sidereal for consistency.
+    observer_loc = observer_loc or nse_location()
+    moon_lon = get_sidereal_pos("moon", t, observer_loc)
+    sun_lon = get_sidereal_pos("sun", t, observer_loc)
+    
+    diff = (moon_lon - sun_lon) % 360
+    tithi_idx = int(diff / 12) + 1
+    return tithi_label(tithi_idx)
+
+
+def get_nakshatra_info_sidereal(t_obj, lat, lon):
+    # Use user location object
+    user_loc_obj = location(lat, lon)
+    
+    # GET SIDEREAL LONGITUDE (The Fix)
+    sidereal_deg = get_sidereal_pos("moon", t_obj, user_loc_obj)
+    
+    # 360 degrees / 27 nakshatras = 13.3333... degrees per nakshatra
+    index = int(sidereal_deg / 13.333333333)
+    
+    # Correct index wraparound
+    idx = index % 27
+    
+    # Calculate Padam (Quarter 1,2,3,4)
+    remainder = sidereal_deg % 13.333333333
+    padam = int(remainder / 3.333333333) + 1
+    
+    return NAKSHATRAS[idx], NAKSHATRA_LORDS[idx], padam, sidereal_deg
+
+
+# --- TRANSITION FINDERS (ROOT-FINDING OVER TIME ARRAYS) ---
+# Longest tithi / nakshatra is ~27 h, so padding the search by 1.2 days
+# guarantees the segments touching the range start and end inside the window.
+TRANSITION_PAD_DAYS = 1.2
+
+
+def _find_segments(f, start_dt, end_dt):
+    """
+    Runs skyfield's find_discrete() on f over a padded window around
+    [start_dt, end_dt] and returns every complete (value, start, end) segment.
+    """
+    from skyfield import almanac
+
+    ts = get_timescale()
+    pad = datetime.timedelta(days=TRANSITION_PAD_DAYS)
+    t_events, values = almanac.find_discrete(
+        ts.from_datetime(start_dt - pad), ts.from_datetime(end_dt + pad), f)
+    edges = t_events.astimezone(TZ_IST)
+    return [(int(values[i]), edges[i], edges[i + 1]) for i in range(len(values) - 1)]
+
+
+def _overlapping(segments, start_dt, end_dt):
+    return [seg for seg in segments if seg[2] > start_dt and seg[1] < end_dt]
+
+
+def find_tithi_transitions(start_dt, end_dt, observer_loc=None):
+    """
+    Exact start/end time of every tithi overlapping [start_dt, end_dt].
+    Tithi = floor(Moon-Sun elongation / 12 deg); the ayanamsa cancels out, so
+    one observer.at(t) per sample array feeds both bodies.
+    """
+    observer_loc = observer_loc or nse_location()
+    if ENGINE == "fast":
+        from . import fastastro
+        lat, lon = location_key(observer_loc)
+
+        def tithi_at(t):
+            return fastastro.tithi_index(t.tt, lat, lon)
+    else:
+        ephem = get_ephemeris()
+        observer = ephem.earth + observer_loc
+
+        def tithi_at(t):
+            at = observer.at(_use_iau2000b(t))
+            _, moon_lon, _ = at.observe(ephem.moon).apparent().ecliptic_latlon()
+            _, sun_lon, _ = at.observe(ephem.sun).apparent().ecliptic_latlon()
+            return ((moon_lon.degrees - sun_lon.degrees) % 360 // 12).astype(int)
+    tithi_at.step_days = 0.25  # shortest tithi is ~19 h
+
+    segments = _find_segments(tithi_at, start_dt, end_dt)
+    return [TithiSegment(tithi=idx + 1, name=tithi_label(idx + 1), start=start, end=end)
+            for idx, start, end in _overlapping(segments, start_dt, end_dt)]
+
+
+def find_nakshatra_transitions(start_dt, end_dt, lat, lon, by_padam=False):
+    """
+    Exact start/end time of every nakshatra (or nakshatra padam when by_padam=True)
+    of the sidereal Moon overlapping [start_dt, end_dt].
+    """
+    if ENGINE == "fast":
+        from . import fastastro
+
+        def padam_at(t):
+            return fastastro.padam_index(t.tt, lat, lon)
+    else:
+        moon = get_ephemeris().moon
+        observer_loc = location(lat, lon)
+
+        def padam_at(t):
+            # 108 padams of 3 deg 20 min each
+            return (get_sidereal_pos(moon, t, observer_loc) // (360.0 / 108)).astype(int)
+    padam_at.step_days = 0.1  # shortest padam is ~5 h
+
+    segments = _find_segments(padam_at, start_dt, end_dt)
+    if not by_padam:
+        # Merge consecutive padams of the same nakshatra
+        merged = []
+        for value, start, end in segments:
+            if merged and merged[-1][0] // 4 == value // 4:
+                merged[-1] = (merged[-1][0], merged[-1][1], end)
+            else:
+                merged.append((value, start, end))
+        segments = merged
+
+    return [NakshatraSegment(nakshatra=NAKSHATRAS[value // 4], lord=NAKSHATRA_LORDS[value // 4],
+                             padam=value % 4 + 1 if by_padam else None, start=start, end=end)
+            for value, start, end in _overlapping(segments, start_dt, end_dt)]
+
+
+def get_day_tithis(date_obj_py, observer_loc=None):
+    """Tithi transitions covering the whole IST day of date_obj_py (store first, then cached live)."""
+    observer_loc = observer_loc or nse_location()
+    store = get_store()
+    if store is not None and store.covers(date_obj_py.date(), observer_loc):
+        with span("store", kind="tithi"):
+            segments = store.tithi_segments(date_obj_py.date())
+        if segments is not None:
+            return segments
+    midnight = date_obj_py.replace(hour=0, minute=0, second=0, microsecond=0)
+    key = ("tithi", date_obj_py.date().isoformat()) + location_key(observer_loc)
+    return SCHEDULE_CACHE.get_or_compute(
+        key, lambda: tuple(find_tithi_transitions(midnight, midnight + datetime.timedelta(days=1),
+                                                  observer_loc)))
+
+
+def get_day_nakshatras(date_obj_py, lat=NSE_LAT, lon=NSE_LON):
+    """Nakshatra transitions covering the whole IST day of date_obj_py (store first, then cached live)."""
+    observer_loc = location(lat, lon)
+    store = get_store()
+    if store is not None and store.covers(date_obj_py.date(), observer_loc):
+        with span("store", kind="nakshatra"):
+            segments = store.nakshatra_segments(date_obj_py.date())
+        if segments is not None:
+            return segments
+    midnight = date_obj_py.replace(hour=0, minute=0, second=0, microsecond=0)
+    key = ("nakshatra", date_obj_py.date().isoformat()) + location_key(observer_loc)
+    return SCHEDULE_CACHE.get_or_compute(
+        key, lambda: tuple(find_nakshatra_transitions(midnight, midnight + datetime.timedelta(days=1),
+                                                      lat, lon)))
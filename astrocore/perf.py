@@ -0,0 +1,141 @@
+"""
+Lightweight timing spans.
+
+    with span("schedule.sunrise_search", days=n) as s:
+        ...
+        s.tag(cache="hit")
+
+Disabled by default: span() then returns a shared no-op object, so an
+instrumented call costs one flag check. Enable with ASTRO_PERF=1 (or
+enable()). When enabled every finished span is
+  * added to the spans list of the active collect() on this thread/context
+    (one page rerun),
+  * folded into process-wide count / total-seconds counters, exported in
+    Prometheus text format by prometheus_text() / write_prometheus(),
+  * logged as one JSON line on the "astrocore.perf" logger (INFO).
+Only the low-cardinality tags in LABEL_TAGS split the counters (and become
+Prometheus labels); unbounded ones such as days= or items= only go to the
+JSON log, so the number of series stays fixed however long the process runs.
+"""
+import os
+import json
+import time
+import logging
+import threading
+import contextvars
+
+ENABLED = os.environ.get("ASTRO_PERF", "") not in ("", "0")
+# Optional Prometheus textfile-collector target, rewritten after each page rerun
+PROMETHEUS_FILE = os.environ.get("ASTRO_PERF_PROM_FILE")
+
+logger = logging.getLogger("astrocore.perf")
+
+# Tags with a small, fixed set of values: the only ones that become Prometheus labels
+LABEL_TAGS = frozenset({"kind", "error", "index", "source", "event", "cache"})
+
+_collector = contextvars.ContextVar("astrocore_perf_collector", default=None)
+_totals = {}  # (name, sorted LABEL_TAGS items) -> [count, total_seconds]
+_totals_lock = threading.Lock()
+
+
+def enable(on=True):
+    global ENABLED
+    ENABLED = on
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def tag(self, **tags):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("name", "tags", "started", "seconds")
+
+    def __init__(self, name, tags):
+        self.name = name
+        self.tags = tags
+        self.started = None
+        self.seconds = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self.started
+        if exc_type is not None:
+            self.tags["error"] = exc_type.__name__
+        _finish(self)
+        return False
+
+    def tag(self, **tags):
+        self.tags.update(tags)
+
+
+def span(name, **tags):
+    """Times the `with` block; a no-op unless perf collection is enabled."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return Span(name, tags)
+
+
+def _finish(s):
+    spans = _collector.get()
+    if spans is not None:
+        spans.append(s)
+    key = (s.name, tuple(sorted((k, str(v)) for k, v in s.tags.items() if k in LABEL_TAGS)))
+    with _totals_lock:
+        total = _totals.setdefault(key, [0, 0.0])
+        total[0] += 1
+        total[1] += s.seconds
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({"span": s.name, "ms": round(s.seconds * 1000, 3), **s.tags}, default=str))
+
+
+def collect():
+    """Starts a fresh span list for the current context (e.g. one page rerun) and returns it."""
+    spans = []
+    _collector.set(spans)
+    return spans
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def prometheus_text():
+    """Process-wide span counters in the Prometheus text exposition format."""
+    with _totals_lock:
+        totals = sorted(_totals.items())
+    lines = ["# HELP astro_span_seconds_total Time spent inside each span.",
+             "# TYPE astro_span_seconds_total counter"]
+    counts = ["# HELP astro_span_count_total Finished spans.",
+              "# TYPE astro_span_count_total counter"]
+    for (name, tags), (count, seconds) in totals:
+        labels = ",".join([f'span="{_label(name)}"'] + [f'{k}="{_label(v)}"' for k, v in tags])
+        lines.append(f"astro_span_seconds_total{{{labels}}} {seconds:.6f}")
+        counts.append(f"astro_span_count_total{{{labels}}} {count}")
+    return "\n".join(lines + counts) + "\n"
+
+
+def write_prometheus(path=None):
+    """Atomically rewrites the textfile-collector file (no-op without a path)."""
+    path = path or PROMETHEUS_FILE
+    if not path:
+        return
+    # Sessions are threads of one process, so concurrent reruns need their own temp files
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as fh:
+        fh.write(prometheus_text())
+    os.replace(tmp_path, path)
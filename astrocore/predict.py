@@ -0,0 +1,153 @@
+"""Hora-based trade signals per index and the user's luck for a hora."""
+import bisect
+import functools
+import threading
+import collections
+
+PLANET_STRATEGIES = {
+    "Jupiter": {"strat": "BUY CALL", "reason": "Trend Expansion / Banking"},
+    "Sun":      {"strat": "BUY CALL", "reason": "Institutional Buying / PSU"},
+    "Mars":     {"strat": "BUY PUT",  "reason": "Aggressive Selling / Panic"},
+    "Mercury": {"strat": "SCALP BOTH", "reason": "High Speed / Volatility"},
+    "Venus":    {"strat": "AVOID",    "reason": "Rangebound / Premium Decay"},
+    "Saturn":  {"strat": "SELL OPT", "reason": "Slow Movement / Theta Decay"},
+    "Moon":     {"strat": "TRAP",      "reason": "Erratic / Fake Breakouts"}
+}
+
+INDEX_PREFS = {
+    "NIFTY 50":     {"best": ["Jupiter", "Sun"], "worst": ["Saturn", "Rahu"]}, 
+    "BANK NIFTY":   {"best": ["Mercury", "Mars", "Jupiter"], "worst": ["Saturn", "Venus"]}, 
+    "SENSEX":       {"best": ["Sun", "Jupiter"], "worst": ["Ketu", "Rahu"]},
+    "MIDCAP SEL":   {"best": ["Mars", "Mercury"], "worst": ["Saturn", "Venus"]}
+}
+
+INDICES = list(INDEX_PREFS)
+
+FRIENDSHIP_TABLE = {
+    "Sun":      {"friends": ["Moon", "Mars", "Jupiter"], "enemies": ["Venus", "Saturn", "Rahu", "Ketu"]},
+    "Moon":     {"friends": ["Sun", "Mercury"], "enemies": ["Rahu", "Ketu", "Saturn"]}, # Updated Sat as enemy/neutral
+    "Mars":     {"friends": ["Sun", "Moon", "Jupiter"], "enemies": ["Mercury", "Rahu"]},
+    "Mercury": {"friends": ["Sun", "Venus"], "enemies": ["Moon"]},
+    "Jupiter": {"friends": ["Sun", "Moon", "Mars"], "enemies": ["Mercury", "Venus"]},
+    "Venus":    {"friends": ["Mercury", "Saturn", "Rahu"], "enemies": ["Sun", "Moon"]},
+    "Saturn":  {"friends": ["Mercury", "Venus", "Rahu"], "enemies": ["Sun", "Moon", "Mars"]},
+    "Rahu":    {"friends": ["Venus", "Saturn", "Mercury"], "enemies": ["Sun", "Moon", "Mars"]},
+    "Ketu":    {"friends": ["Mars", "Jupiter"], "enemies": ["Sun", "Moon"]}
+}
+
+
+def check_compatibility(user_lord, hora_planet):
+    rel = FRIENDSHIP_TABLE.get(user_lord, {})
+    if hora_planet in rel.get("friends", []): return "Lucky", "badge-good", 100
+    elif hora_planet in rel.get("enemies", []): return "Avoid", "badge-bad", 20
+    return "Neutral", "badge-neutral", 50
+
+
+# Every (user lord, hora planet) pair up front, so luck for a whole desk is a dict lookup
+LUCK_TABLE = {(lord, planet): check_compatibility(lord, planet)
+              for lord in FRIENDSHIP_TABLE for planet in FRIENDSHIP_TABLE}
+
+
+# --- SLOT INDEX ---
+# One bit per hora planet, plus Rahu/Ketu (Rahu's bit marks slots inside Rahu Kaal)
+PLANET_BITS = {planet: 1 << i for i, planet in enumerate(
+    ["Sun", "Venus", "Mercury", "Moon", "Saturn", "Jupiter", "Mars", "Rahu", "Ketu"])}
+RAHU_BIT = PLANET_BITS["Rahu"]
+
+
+@functools.lru_cache(maxsize=None)
+def index_masks(index_name):
+    """(best_mask, worst_mask) bitmasks for one index's INDEX_PREFS entry, compiled once."""
+    prefs = INDEX_PREFS[index_name]
+    best_mask = 0
+    for planet in prefs['best']:
+        best_mask |= PLANET_BITS.get(planet, 0) & ~(RAHU_BIT | PLANET_BITS["Ketu"])  # never hora lords
+    worst_mask = RAHU_BIT  # Rahu Kaal is always a slot to avoid
+    for planet in prefs['worst']:
+        worst_mask |= PLANET_BITS.get(planet, 0)
+    return best_mask, worst_mask
+
+
+class SlotIndex:
+    """
+    Precompiled view of one day's slots. Slot ends are kept sorted for bisect,
+    every slot carries a planet bitmask, and for each (mask, exclusion) pair a
+    suffix array gives the next matching slot from any position. A next-best /
+    next-avoid query for any index at any time is then one bisect plus one
+    list lookup, and indices sharing preferences share the suffix arrays.
+    """
+
+    def __init__(self, slots):
+        self.slots = tuple(slots)
+        self.ends = [slot.end for slot in self.slots]
+        self.bits = [PLANET_BITS[slot.planet] | (RAHU_BIT if slot.is_rahu else 0) for slot in self.slots]
+        self._next = {}
+
+    def _next_match(self, mask, exclude=0):
+        nxt = self._next.get((mask, exclude))
+        if nxt is None:
+            n = len(self.bits)
+            nxt = [n] * (n + 1)  # n means "no such slot"
+            for i in range(n - 1, -1, -1):
+                bits = self.bits[i]
+                nxt[i] = i if bits & mask and not bits & exclude else nxt[i + 1]
+            self._next[(mask, exclude)] = nxt
+        return nxt
+
+    def position(self, t=None):
+        """First slot still running at `t` (slot.end > t); t=None means the start of the day."""
+        return 0 if t is None else bisect.bisect_right(self.ends, t)
+
+    def _find(self, mask, t, exclude=0):
+        i = self._next_match(mask, exclude)[self.position(t)]
+        return self.slots[i] if i < len(self.slots) else None
+
+    def next_best(self, index_name, t=None, exclude_rahu=False):
+        return self._find(index_masks(index_name)[0], t, RAHU_BIT if exclude_rahu else 0)
+
+    def next_worst(self, index_name, t=None):
+        return self._find(index_masks(index_name)[1], t)
+
+    def signals(self, index_name):
+        """Planner view per slot: 'best' (never inside Rahu Kaal), 'worst' or None."""
+        best_mask, worst_mask = index_masks(index_name)
+        return tuple("best" if bits & best_mask and not bits & RAHU_BIT
+                     else "worst" if bits & worst_mask else None
+                     for bits in self.bits)
+
+
+_slot_indexes = collections.OrderedDict()  # slots -> SlotIndex, least recently used first
+_slot_indexes_lock = threading.Lock()
+
+
+def get_slot_index(slots, maxsize=64):
+    """
+    Shared SlotIndex per day's slot tuple. Keyed by content (slots are frozen
+    dataclasses, ~1 us to hash), so an equal schedule shares the index and a
+    different one can never be handed another day's.
+    """
+    with _slot_indexes_lock:
+        index = _slot_indexes.get(slots)
+        if index is None:
+            index = _slot_indexes[slots] = SlotIndex(slots)
+            while len(_slot_indexes) > maxsize:
+                _slot_indexes.popitem(last=False)
+        else:
+            _slot_indexes.move_to_end(slots)
+        return index
+
+
+def get_astro_prediction(schedule, index_name, is_today_view, now_reference):
+    # Today: the next slots still running now; other days: the first of the day
+    index = get_slot_index(schedule if isinstance(schedule, tuple) else tuple(schedule))
+    t = now_reference if is_today_view else None
+    best_slot = index.next_best(index_name, t)
+    worst_slot = index.next_worst(index_name, t)
+
+    best_t, strategy, reason = "None", "WAIT", "Neutral Market"
+    if best_slot is not None:
+        best_t = best_slot.start.strftime('%I:%M')
+        strat_info = PLANET_STRATEGIES.get(best_slot.planet)
+        strategy, reason = strat_info['strat'], strat_info['reason']
+    worst_t = worst_slot.start.strftime('%I:%M') if worst_slot is not None else "None"
+    return best_t, worst_t, strategy, reason
@@ -0,0 +1,218 @@
+"""Sunrise-based hora schedule and Rahu Kaal for NSE trading days."""
+import datetime
+
+import numpy as np
+
+from .cache import SCHEDULE_CACHE
+from .config import TZ_IST, PRE_OPEN_HOURS, MARKET_CLOSE_HOURS, ENGINE
+from .ephemeris import get_ephemeris, nse_location, location_key
+from .models import HoraSlot, DaySchedule, ScheduleBatch
+from .perf import span
+from .store import get_store
+
+# 0=Mon, 1=Tue... Day lords and the fixed Hora order
+WEEKDAY_LORDS = ["Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Sun"]
+# Hora Order logic: Start with Day Lord, then 6th planet from it
+# Order: Sun -> Venus -> Mercury -> Moon -> Saturn -> Jupiter -> Mars
+HORA_FIXED_ORDER = ["Sun", "Venus", "Mercury", "Moon", "Saturn", "Jupiter", "Mars"]
+# Rahu Kaal part (1-based eighth of the day) per weekday: Mon(1), Tue(6), Wed(4), Thu(5), Fri(3), Sat(2), Sun(7)
+RAHU_KAAL_PART = {0: 1, 1: 6, 2: 4, 3: 5, 4: 3, 5: 2, 6: 7}
+
+# Lookup arrays for the vectorized engine (indexed by weekday, 0=Mon)
+_DAY_LORD_START = np.array([HORA_FIXED_ORDER.index(lord) for lord in WEEKDAY_LORDS])
+_RAHU_KAAL_PART = np.array([RAHU_KAAL_PART[d] for d in range(7)])
+_UNIX_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+# Rahu Kaal edges (eighths of the day) often fall exactly on hora edges (twelfths:
+# 2/8 = 3/12, 4/8 = 6/12, 6/8 = 9/12). The old per-slot test (start < rk_end and
+# end > rk_start) flagged the neighbouring hora whenever rounding left a few
+# microseconds of "overlap", so a hora now only counts as Rahu if it overlaps by
+# more than this. Any real overlap is a whole hora or half of one.
+_RAHU_MIN_OVERLAP_S = 1.0
+
+
+def calculate_rahu_kaal(weekday_idx, sunrise, sunset):
+    # Accurate Rahu Kaal Segments (Sunrise to Sunset / 8)
+    duration = (sunset - sunrise).total_seconds()
+    part = duration / 8.0
+    segment_idx = RAHU_KAAL_PART[weekday_idx]
+    
+    # Logic: Start time is sunrise + (segment_idx * part) NOT (segment_idx - 1)
+    # Actually standard chart:
+    # Mon: 2nd part (7:30-9:00 approx) -> Index 1 in 0-7 scale? 
+    # Let's use the standard "Part Number" logic where Sunrise is part 0.
+    # Standard Map (1st part is 0): 
+    # Mon(1), Tue(6), Wed(4), Thu(5), Fri(3), Sat(2), Sun(7)
+    
+    start_seconds = (segment_idx - 1) * part # Because map is 1-based (1st part, 2nd part...)
+    start = sunrise + datetime.timedelta(seconds=start_seconds)
+    end = start + datetime.timedelta(seconds=part)
+    return start, end
+
+
+# find_discrete()'s search for almanac.sunrise_sunset(): 0.04-day grid, 12-way subdivision down to 1 ms
+_SUN_STEP_DAYS = 0.04
+_SUN_SUBDIVISIONS = 12
+_SUN_EPSILON_DAYS = 0.001 / 86400.0
+
+
+def _sun_up(ephem, jd, lats, lons):
+    """Whether the Sun is up (skyfield's -0.8333 deg criterion) for each (TT jd, lat, lon) element."""
+    from skyfield.api import wgs84
+    from skyfield.nutationlib import iau2000b_radians
+
+    t = ephem.ts.tt_jd(jd)
+    t._nutation_angles_radians = iau2000b_radians(t)  # Same shortcut as almanac.sunrise_sunset()
+    observer = ephem.earth + wgs84.latlon(lats, lons)
+    return observer.at(t).observe(ephem.sun).apparent().altaz()[0].degrees >= -0.8333
+
+
+def find_sun_events(start_date, n_days, lats, lons):
+    """
+    First sunrise and first sunset of each IST day from `start_date`, for
+    many observers at once: (sunrise, sunset), each (n_sites, n_days) POSIX
+    seconds, NaN where the event does not happen. The same criterion and
+    search as find_discrete(sunrise_sunset()), but the grid of every site and
+    each refinement step over all brackets is one skyfield call on an array
+    of observers. With ASTRO_ENGINE=fast, fastastro's analytic solver instead.
+    """
+    if ENGINE == "fast":
+        from .fastastro import find_sun_events as fast_sun_events
+        with span("schedule.sunrise_search", days=n_days, sites=len(np.atleast_1d(lats)), engine="fast"):
+            return fast_sun_events(start_date, n_days, lats, lons)
+    ephem = get_ephemeris()
+    lats = np.atleast_1d(np.asarray(lats, dtype=float))
+    lons = np.atleast_1d(np.asarray(lons, dtype=float))
+    n_sites = len(lats)
+    midnight = TZ_IST.localize(datetime.datetime.combine(start_date, datetime.time()))
+    t0 = ephem.ts.from_datetime(midnight).tt
+    grid = np.linspace(t0, t0 + n_days, int(n_days / _SUN_STEP_DAYS) + 2)
+
+    with span("schedule.sunrise_search", days=n_days, sites=n_sites):
+        up = _sun_up(ephem, np.tile(grid, n_sites), np.repeat(lats, len(grid)),
+                     np.repeat(lons, len(grid))).reshape(n_sites, len(grid))
+        site, step = np.nonzero(np.diff(up, axis=1))
+        lo, hi = grid[step], grid[step + 1]
+        fractions = np.linspace(0.0, 1.0, _SUN_SUBDIVISIONS)
+        rows = np.arange(len(site))
+        while len(site) and (hi - lo).max() > _SUN_EPSILON_DAYS:
+            jd = lo[:, None] + (hi - lo)[:, None] * fractions
+            y = _sun_up(ephem, jd.ravel(), np.repeat(lats[site], _SUN_SUBDIVISIONS),
+                        np.repeat(lons[site], _SUN_SUBDIVISIONS)).reshape(jd.shape)
+            change = np.argmax(y != y[:, :1], axis=1)
+            lo, hi = jd[rows, change - 1], jd[rows, change]
+    is_rise = up[site, step + 1]
+
+    # Bucket every event into its IST calendar day (IST has no DST, so days are 86400 s)
+    event_s = (ephem.ts.tt_jd(hi).toordinal() - _UNIX_EPOCH_ORDINAL) * 86400.0
+    day_idx = np.floor((event_s - midnight.timestamp()) / 86400.0).astype(int)
+
+    # Keep the FIRST sunrise and FIRST sunset of each day (events are in time order per site)
+    sunrise = np.full((n_sites, n_days), np.nan)
+    sunset = np.full((n_sites, n_days), np.nan)
+    for flag, out in ((True, sunrise), (False, sunset)):
+        mask = (is_rise == flag) & (day_idx >= 0) & (day_idx < n_days)
+        cells, first = np.unique(site[mask] * n_days + day_idx[mask], return_index=True)
+        out.flat[cells] = event_s[mask][first]
+    return sunrise, sunset
+
+
+def calculate_schedule_batch(start_date, end_date, location=None):
+    """
+    Vectorized schedule engine for every date in [start_date, end_date].
+    One find_sun_events() pass finds all sunrises/sunsets in the range;
+    hora boundaries, hora planets and Rahu Kaal windows are then built as
+    NumPy arrays. All times are POSIX seconds (NaN when the Sun never rises).
+    """
+    location = location or nse_location()
+    n_days = (end_date - start_date).days + 1
+    midnight = TZ_IST.localize(datetime.datetime.combine(start_date, datetime.time()))
+    midnight_s = midnight.timestamp() + 86400.0 * np.arange(n_days)
+    sunrise, sunset = find_sun_events(start_date, n_days, location.latitude.degrees,
+                                      location.longitude.degrees)
+    sunrise, sunset = sunrise[0], sunset[0]
+
+    dates = np.datetime64(start_date, 'D') + np.arange(n_days)
+    weekday = (dates.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+
+    hora_len = (sunset - sunrise) / 12.0
+    hora_bounds = sunrise[:, None] + np.arange(13) * hora_len[:, None]
+    hora_planet = (_DAY_LORD_START[weekday][:, None] + np.arange(12)) % 7
+
+    part = (sunset - sunrise) / 8.0
+    rahu_start = sunrise + (_RAHU_KAAL_PART[weekday] - 1) * part
+    rahu_end = rahu_start + part
+
+    # Market window (pre-open 09:00 to close 15:30) intersection and Rahu overlap per hora
+    starts, ends = hora_bounds[:, :-1], hora_bounds[:, 1:]
+    pre_open = midnight_s + PRE_OPEN_HOURS * 3600.0
+    mkt_close = midnight_s + MARKET_CLOSE_HOURS * 3600.0
+    in_market = np.maximum(starts, pre_open[:, None]) < np.minimum(ends, mkt_close[:, None])
+    is_rahu = rahu_overlap(starts, ends, rahu_start[:, None], rahu_end[:, None])
+
+    return ScheduleBatch(dates=dates, weekday=weekday, sunrise=sunrise, sunset=sunset,
+                         hora_bounds=hora_bounds, hora_planet=hora_planet,
+                         rahu_start=rahu_start, rahu_end=rahu_end,
+                         in_market=in_market, is_rahu=is_rahu)
+
+
+def rahu_overlap(starts, ends, rahu_start, rahu_end):
+    """Whether each [start, end) hora really overlaps Rahu Kaal (touching edges do not count)."""
+    return np.minimum(ends, rahu_end) - np.maximum(starts, rahu_start) > _RAHU_MIN_OVERLAP_S
+
+
+def _to_ist(seconds):
+    return datetime.datetime.fromtimestamp(seconds, TZ_IST)
+
+
+def schedule_from_batch(batch, day):
+    """Builds the market-hours DaySchedule for row `day` of a ScheduleBatch."""
+    date = batch.dates[day].item()
+    if np.isnan(batch.sunrise[day]) or np.isnan(batch.sunset[day]):
+        return DaySchedule(date=date, slots=(), day_lord=None, rahu_start=None, rahu_end=None)
+
+    bounds = batch.hora_bounds[day]
+    slots = tuple(HoraSlot(start=_to_ist(bounds[i]), end=_to_ist(bounds[i + 1]),
+                           planet=HORA_FIXED_ORDER[batch.hora_planet[day, i]],
+                           is_rahu=bool(batch.is_rahu[day, i]))
+                  for i in np.flatnonzero(batch.in_market[day]))
+
+    return DaySchedule(date=date, slots=slots, day_lord=WEEKDAY_LORDS[batch.weekday[day]],
+                       rahu_start=_to_ist(batch.rahu_start[day]),
+                       rahu_end=_to_ist(batch.rahu_end[day]))
+
+
+def calculate_market_schedule(date_obj_py, location=None):
+    # USE NSE LOCATION FOR MARKET TIMING
+    # Thin single-day view over the vectorized engine
+    day = date_obj_py.date()
+    return schedule_from_batch(calculate_schedule_batch(day, day, location), 0)
+
+
+def get_market_schedule(date_obj_py, location=None):
+    """
+    Cached view of calculate_market_schedule(), keyed by (trading date, location).
+    The result only depends on the date, so every session on the same day
+    shares one skyfield root-find. Dates covered by the precomputed almanac
+    store are read straight from it.
+    """
+    location = location or nse_location()
+    store = get_store()
+    if store is not None and store.covers(date_obj_py.date(), location):
+        with span("store", kind="schedule"):
+            return store.day_schedule(date_obj_py.date())
+    key = ("schedule", date_obj_py.date().isoformat()) + location_key(location)
+    return SCHEDULE_CACHE.get_or_compute(
+        key, lambda: calculate_market_schedule(date_obj_py, location))
+
+
+def next_change(day_schedule, now, extra=()):
+    """
+    First instant after `now` at which the live view of `day_schedule` changes:
+    a hora edge (which also covers Rahu and market open/close), any extra
+    instants such as a tithi change, or the next IST midnight.
+    """
+    midnight = TZ_IST.localize(datetime.datetime.combine(now.date() + datetime.timedelta(days=1),
+                                                         datetime.time()))
+    edges = [edge for slot in day_schedule.slots for edge in (slot.start, slot.end)]
+    return min(t for t in edges + list(extra) + [midnight] if t > now)
+
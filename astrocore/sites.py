@@ -0,0 +1,107 @@
+"""
+Hora schedules for many (place, trading session) pairs in one pass.
+
+The NSE view in astrocore.schedule uses Mumbai's sunrise and the 09:00-15:30
+session. Here each Site names its own place and one of config.SESSIONS, and
+calculate_site_batch() finds every site's sunrises and sunsets with a single
+find_sun_events() pass over an array of observers. Dates carry the whole
+hora day plus the night hora before sunrise, so early (GIFT City) and
+evening (MCX) sessions get their planets too.
+"""
+import types
+import datetime
+
+import numpy as np
+
+from .cache import SCHEDULE_CACHE
+from .config import TZ_IST, NSE_LAT, NSE_LON, GIFT_LAT, GIFT_LON, ASSAM_PLACES, SESSIONS
+from .models import HoraSlot, DaySchedule, Site, SiteBatch
+from .schedule import (WEEKDAY_LORDS, HORA_FIXED_ORDER, _DAY_LORD_START, _RAHU_KAAL_PART,
+                       find_sun_events, rahu_overlap)
+
+# The exchanges we track, plus the NSE session on local sunrise for each Assam place
+DEFAULT_SITES = (
+    Site("NSE", NSE_LAT, NSE_LON, "NSE"),
+    Site("MCX", NSE_LAT, NSE_LON, "MCX"),
+    Site("GIFT City", GIFT_LAT, GIFT_LON, "GIFT"),
+) + tuple(Site(name, lat, lon, "NSE") for name, (lat, lon) in ASSAM_PLACES.items())
+
+
+def calculate_site_batch(sites, start_date, end_date):
+    """Vectorized schedules for every site and every date in [start_date, end_date]."""
+    sites = tuple(sites)
+    n_days = (end_date - start_date).days + 1
+    midnight = TZ_IST.localize(datetime.datetime.combine(start_date, datetime.time()))
+    midnight_s = midnight.timestamp() + 86400.0 * np.arange(n_days)
+
+    # One extra day each side: the previous sunset and the next sunrise bound the night horas
+    rise, sets = find_sun_events(start_date - datetime.timedelta(days=1), n_days + 2,
+                                 [site.lat for site in sites], [site.lon for site in sites])
+    sunrise, sunset = rise[:, 1:-1], sets[:, 1:-1]
+    prev_sunset, next_sunrise = sets[:, :-2], rise[:, 2:]
+
+    day_hora = (sunset - sunrise) / 12.0
+    night_hora = (next_sunrise - sunset) / 12.0
+    hora_bounds = np.concatenate([
+        (sunrise - (sunrise - prev_sunset) / 12.0)[..., None],
+        sunrise[..., None] + np.arange(13) * day_hora[..., None],
+        sunset[..., None] + np.arange(1, 13) * night_hora[..., None],
+    ], axis=-1)
+
+    dates = np.datetime64(start_date, 'D') + np.arange(n_days)
+    weekday = (dates.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    hora_planet = (_DAY_LORD_START[weekday][:, None] + np.arange(-1, 24)) % 7
+
+    part = (sunset - sunrise) / 8.0
+    rahu_start = sunrise + (_RAHU_KAAL_PART[weekday] - 1) * part
+    rahu_end = rahu_start + part
+
+    starts, ends = hora_bounds[..., :-1], hora_bounds[..., 1:]
+    is_rahu = rahu_overlap(starts, ends, rahu_start[..., None], rahu_end[..., None])
+    in_session = np.zeros(starts.shape, dtype=bool)
+    for i, site in enumerate(sites):
+        for open_hours, close_hours in SESSIONS[site.session]:
+            opens = midnight_s + open_hours * 3600.0
+            closes = midnight_s + close_hours * 3600.0
+            in_session[i] |= np.maximum(starts[i], opens[:, None]) < np.minimum(ends[i], closes[:, None])
+
+    return SiteBatch(sites=sites, dates=dates, weekday=weekday, sunrise=sunrise, sunset=sunset,
+                     hora_bounds=hora_bounds, hora_planet=hora_planet,
+                     rahu_start=rahu_start, rahu_end=rahu_end,
+                     in_session=in_session, is_rahu=is_rahu)
+
+
+def _to_ist(seconds):
+    return datetime.datetime.fromtimestamp(seconds, TZ_IST)
+
+
+def site_schedule(batch, site_idx, day):
+    """Session-hours DaySchedule for site `site_idx` on row `day` of a SiteBatch."""
+    date = batch.dates[day].item()
+    bounds = batch.hora_bounds[site_idx, day]
+    if np.isnan(bounds).any():
+        return DaySchedule(date=date, slots=(), day_lord=None, rahu_start=None, rahu_end=None)
+
+    slots = tuple(HoraSlot(start=_to_ist(bounds[i]), end=_to_ist(bounds[i + 1]),
+                           planet=HORA_FIXED_ORDER[batch.hora_planet[day, i]],
+                           is_rahu=bool(batch.is_rahu[site_idx, day, i]))
+                  for i in np.flatnonzero(batch.in_session[site_idx, day]))
+
+    return DaySchedule(date=date, slots=slots, day_lord=WEEKDAY_LORDS[batch.weekday[day]],
+                       rahu_start=_to_ist(batch.rahu_start[site_idx, day]),
+                       rahu_end=_to_ist(batch.rahu_end[site_idx, day]))
+
+
+def get_site_schedules(date_obj_py, sites=DEFAULT_SITES):
+    """
+    Read-only {site name: DaySchedule} for one date, all sites computed
+    together and cached like get_market_schedule().
+    """
+    sites = tuple(sites)
+    day = date_obj_py.date() if isinstance(date_obj_py, datetime.datetime) else date_obj_py
+
+    def compute():
+        batch = calculate_site_batch(sites, day, day)
+        return types.MappingProxyType({site.name: site_schedule(batch, i, 0) for i, site in enumerate(sites)})
+
+    return SCHEDULE_CACHE.get_or_compute(("sites", day.isoformat(), sites), compute)
@@ -0,0 +1,273 @@
+"""
+Precomputed almanac store.
+
+Everything the market day needs (sunrise, sunset, hora boundaries and planets,
+Rahu Kaal, tithi and nakshatra changes) is deterministic per date, so it can
+be computed once and written as fixed-width binary records, one per IST date.
+The file is memory-mapped and record i belongs to first_day + i, so a lookup
+is a constant-time index instead of a skyfield run.
+
+Build it with:
+
+    python -m astrocore.store build --start-year 2020 --end-year 2040
+
+Dates outside the stored range fall back to the live calculation.
+"""
+import os
+import logging
+import argparse
+import datetime
+import threading
+
+import numpy as np
+
+from .config import TZ_IST, ALMANAC_FILE
+from .ephemeris import nse_location, location_key
+from .models import ScheduleBatch, TithiSegment, NakshatraSegment
+
+logger = logging.getLogger("astrocore.store")
+
+MAGIC = b"ALMANAC1"
+VERSION = 2  # 2: nakshatras on the true Lahiri ayanamsa (equinox of date)
+MAX_CHANGES = 2  # A tithi / nakshatra lasts at least ~19 h, so at most 2 changes per day
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("record_size", "<u4"),
+    ("first_day", "<i8"),   # proleptic ordinal of the first date
+    ("count", "<u8"),
+    ("lat", "<f8"),
+    ("lon", "<f8"),
+])
+
+RECORD_DTYPE = np.dtype([
+    ("weekday", "u1"),
+    ("sunrise", "<f8"),
+    ("sunset", "<f8"),
+    ("hora_bounds", "<f8", (13,)),
+    ("hora_planet", "u1", (12,)),
+    ("in_market", "u1", (12,)),
+    ("is_rahu", "u1", (12,)),
+    ("rahu_start", "<f8"),
+    ("rahu_end", "<f8"),
+    ("tithi_at_midnight", "u1"),                  # 1-30
+    ("tithi_change", "<f8", (MAX_CHANGES,)),      # POSIX seconds, NaN padded
+    ("tithi_next", "u1", (MAX_CHANGES,)),
+    ("nakshatra_at_midnight", "u1"),              # 0-26
+    ("nakshatra_change", "<f8", (MAX_CHANGES,)),
+    ("nakshatra_next", "u1", (MAX_CHANGES,)),
+])
+
+
+def _midnights(dates):
+    first = TZ_IST.localize(datetime.datetime.combine(dates[0].item(), datetime.time()))
+    return first.timestamp() + 86400.0 * np.arange(len(dates))
+
+
+def _day_changes(seg_starts, seg_values, midnight_s):
+    """
+    Per day: the value in force at IST midnight plus up to MAX_CHANGES
+    (time, new value) changes before the next midnight.
+    """
+    first = np.searchsorted(seg_starts, midnight_s, side='right') - 1
+    last = np.searchsorted(seg_starts, midnight_s + 86400.0, side='left') - 1
+    times = np.full((len(midnight_s), MAX_CHANGES), np.nan)
+    values = np.zeros((len(midnight_s), MAX_CHANGES), dtype=np.uint8)
+    for k in range(MAX_CHANGES):
+        j = first + 1 + k
+        valid = j <= last
+        times[valid, k] = seg_starts[j[valid]]
+        values[valid, k] = seg_values[j[valid]]
+    return seg_values[first], times, values
+
+
+def build_records(start_date, end_date, location=None):
+    """Computes the fixed-width records for every date in [start_date, end_date]."""
+    from .schedule import calculate_schedule_batch
+    from .panchang import NAKSHATRAS, find_tithi_transitions, find_nakshatra_transitions
+
+    location = location or nse_location()
+    batch = calculate_schedule_batch(start_date, end_date, location)
+    midnight_s = _midnights(batch.dates)
+
+    range_start = TZ_IST.localize(datetime.datetime.combine(start_date, datetime.time()))
+    range_end = range_start + datetime.timedelta(days=len(batch))
+    tithis = find_tithi_transitions(range_start, range_end, location)
+    naks = find_nakshatra_transitions(range_start, range_end,
+                                      location.latitude.degrees, location.longitude.degrees)
+
+    records = np.zeros(len(batch), dtype=RECORD_DTYPE)
+    for field in ("weekday", "sunrise", "sunset", "hora_bounds", "hora_planet",
+                  "in_market", "is_rahu", "rahu_start", "rahu_end"):
+        records[field] = getattr(batch, field)
+
+    records["tithi_at_midnight"], records["tithi_change"], records["tithi_next"] = _day_changes(
+        np.array([s.start.timestamp() for s in tithis]), np.array([s.tithi for s in tithis]), midnight_s)
+    records["nakshatra_at_midnight"], records["nakshatra_change"], records["nakshatra_next"] = _day_changes(
+        np.array([s.start.timestamp() for s in naks]),
+        np.array([NAKSHATRAS.index(s.nakshatra) for s in naks]), midnight_s)
+    return records
+
+
+def build_store(path, first, last, location=None, progress=None):
+    """
+    Writes records for [first, last] one year at a time (memory stays
+    bounded), then swaps the file in atomically.
+    """
+    location = location or nse_location()
+    lat, lon = location_key(location)
+
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header[0] = (MAGIC, VERSION, RECORD_DTYPE.itemsize, first.toordinal(),
+                 (last - first).days + 1, lat, lon)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(header.tobytes())
+        chunk_start = first
+        while chunk_start <= last:
+            chunk_end = min(datetime.date(chunk_start.year, 12, 31), last)
+            fh.write(build_records(chunk_start, chunk_end, location).tobytes())
+            if progress:
+                progress(chunk_end)
+            chunk_start = chunk_end + datetime.timedelta(days=1)
+    os.replace(tmp_path, path)
+
+
+class AlmanacStore:
+    """Read-only, memory-mapped view of a store file; lookups are O(1) by date."""
+
+    def __init__(self, path):
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if len(header) != 1 or header["magic"][0] != MAGIC or header["version"][0] != VERSION \
+                or header["record_size"][0] != RECORD_DTYPE.itemsize:
+            raise ValueError(f"{path} is not a version {VERSION} almanac store")
+        self.path = path
+        self.first_day = datetime.date.fromordinal(int(header["first_day"][0]))
+        self.count = int(header["count"][0])
+        self.location_key = (float(header["lat"][0]), float(header["lon"][0]))
+        self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r",
+                                 offset=HEADER_DTYPE.itemsize, shape=(self.count,))
+
+    @property
+    def last_day(self):
+        return self.first_day + datetime.timedelta(days=self.count - 1)
+
+    def index(self, date):
+        """Record index for `date`, or None outside the stored range."""
+        i = (date - self.first_day).days
+        return i if 0 <= i < self.count else None
+
+    def covers(self, date, location=None):
+        location = location or nse_location()
+        return self.index(date) is not None and location_key(location) == self.location_key
+
+    def batch(self, date):
+        """One-row ScheduleBatch for `date` (no astronomy involved)."""
+        i = self.index(date)
+        rec = self.records[i:i + 1]
+        return ScheduleBatch(dates=np.array([date], dtype='datetime64[D]'),
+                             weekday=rec["weekday"].astype(np.int64),
+                             sunrise=rec["sunrise"], sunset=rec["sunset"],
+                             hora_bounds=rec["hora_bounds"], hora_planet=rec["hora_planet"],
+                             rahu_start=rec["rahu_start"], rahu_end=rec["rahu_end"],
+                             in_market=rec["in_market"].astype(bool),
+                             is_rahu=rec["is_rahu"].astype(bool))
+
+    def day_schedule(self, date):
+        from .schedule import schedule_from_batch
+        return schedule_from_batch(self.batch(date), 0)
+
+    def _segments(self, date, prefix):
+        """
+        (value, start, end) segments overlapping the IST day of `date`, stitched
+        from the changes stored in the neighbouring records. None when the
+        neighbours needed to close the first/last segment are out of range.
+        """
+        i = self.index(date)
+        lo, hi = max(i - 2, 0), min(i + 3, self.count)
+        rec = self.records[lo:hi]
+        times = rec[f"{prefix}_change"].ravel()
+        values = rec[f"{prefix}_next"].ravel()
+        known = ~np.isnan(times)
+        times, values = times[known], values[known]
+
+        day_start = _midnights(np.array([date], dtype='datetime64[D]'))[0]
+        day_end = day_start + 86400.0
+        if not len(times) or times[0] > day_start or times[-1] < day_end:
+            return None
+        return [(int(values[k]), times[k], times[k + 1]) for k in range(len(times) - 1)
+                if times[k + 1] > day_start and times[k] < day_end]
+
+    def tithi_segments(self, date):
+        from .panchang import tithi_label
+        segments = self._segments(date, "tithi")
+        if segments is None:
+            return None
+        return tuple(TithiSegment(tithi=value, name=tithi_label(value),
+                                  start=datetime.datetime.fromtimestamp(start, TZ_IST),
+                                  end=datetime.datetime.fromtimestamp(end, TZ_IST))
+                     for value, start, end in segments)
+
+    def nakshatra_segments(self, date):
+        from .panchang import NAKSHATRAS, NAKSHATRA_LORDS
+        segments = self._segments(date, "nakshatra")
+        if segments is None:
+            return None
+        return tuple(NakshatraSegment(nakshatra=NAKSHATRAS[value], lord=NAKSHATRA_LORDS[value],
+                                      padam=None,
+                                      start=datetime.datetime.fromtimestamp(start, TZ_IST),
+                                      end=datetime.datetime.fromtimestamp(end, TZ_IST))
+                     for value, start, end in segments)
+
+
+_store = None
+_store_checked = False
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    The shipped store (opened once per process), or None if it was never built
+    or cannot be used (e.g. written by another VERSION): every date then falls
+    back to the live calculation until the store is rebuilt.
+    """
+    global _store, _store_checked
+    if not _store_checked:
+        with _store_lock:
+            if not _store_checked:
+                if os.path.exists(ALMANAC_FILE):
+                    try:
+                        _store = AlmanacStore(ALMANAC_FILE)
+                    except ValueError as exc:
+                        logger.warning("%s; computing live instead (rebuild with python -m astrocore.store build)", exc)
+                _store_checked = True
+    return _store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m astrocore.store",
+                                     description="Build or inspect the precomputed almanac store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Precompute a span of years for NSE (Mumbai)")
+    build.add_argument("--start-year", type=int, required=True)
+    build.add_argument("--end-year", type=int, required=True)
+    build.add_argument("--out", default=ALMANAC_FILE)
+    info = sub.add_parser("info", help="Show the range and size of a store file")
+    info.add_argument("path", nargs="?", default=ALMANAC_FILE)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        build_store(args.out, datetime.date(args.start_year, 1, 1), datetime.date(args.end_year, 12, 31),
+                    progress=lambda day: print(f"  through {day}", flush=True))
+        print(f"Wrote {args.out}")
+    else:
+        store = AlmanacStore(args.path)
+        print(f"{store.path}: {store.first_day} .. {store.last_day} ({store.count} days, "
+              f"{RECORD_DTYPE.itemsize} B/record) for {store.location_key}")
+
+
+if __name__ == "__main__":
+    main()
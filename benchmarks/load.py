@@ -0,0 +1,182 @@
+"""
+Concurrent-session load test for newindex.py.
+
+    python -m benchmarks.load --sessions 1 5 10 25 --interval 60 --duration 180
+    python -m benchmarks.load --sessions 1 10 --interval 5 --duration 30 --max-p95-ms 2000
+
+For each session count, N simulated browser sessions (Streamlit AppTest
+instances, each with its own session state, all in this process like on the
+real server) rerun the page every `--interval` seconds, with start times
+spread evenly over one interval. The news feeds point at a local stub server
+(ASTRO_NEWS_SOURCES), so nothing leaves the machine. Each level reports rerun
+latency p50/p95/p99, CPU cores used and process RSS, overall and per session
+above a warmed-up single-session baseline.
+
+Every tick is a full script rerun, so this is an upper bound on the page's
+fragment refreshes. With --max-p95-ms, the exit status is 1 if any level's
+p95 exceeds it.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import platform
+import resource
+import statistics
+import threading
+
+from benchmarks.run import REPO_ROOT, _versions
+from benchmarks.stub_feeds import StubFeedServer
+
+
+def rss_mb():
+    """Current resident set size (Linux /proc), else the peak from getrusage."""
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def percentiles(samples):
+    if len(samples) < 2:
+        value = samples[0] if samples else float("nan")
+        return value, value, value
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+def new_session(date):
+    from streamlit.testing.v1 import AppTest
+    app = AppTest.from_file(os.path.join(REPO_ROOT, "newindex.py"), default_timeout=120)
+    app.run()
+    if date is not None:
+        app.date_input[1].set_value(date)
+        app.run()
+    if app.exception:
+        raise RuntimeError(f"newindex.py failed: {app.exception[0].value}")
+    return app
+
+
+def run_level(n_sessions, args, baseline_rss):
+    """Drives `n_sessions` sessions for args.duration seconds; returns the level's report."""
+    apps = [new_session(args.date) for _ in range(n_sessions)]
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    stop = threading.Event()
+    started = time.monotonic()
+
+    def session_loop(i, app):
+        next_tick = started + args.interval * i / n_sessions
+        while not stop.wait(max(0.0, next_tick - time.monotonic())):
+            t0 = time.perf_counter()
+            try:
+                app.run()
+                failed = app.exception[0].value if app.exception else None
+            except Exception as exc:  # e.g. a rerun timing out under load
+                failed = repr(exc)
+            elapsed = time.perf_counter() - t0
+            with lock:
+                latencies.append(elapsed)
+                if failed:
+                    errors.append(failed)
+            next_tick += args.interval
+            if next_tick < time.monotonic():
+                next_tick = time.monotonic()  # Overloaded: rerun again right away, like a queued refresh
+
+    cpu_before = cpu_seconds()
+    threads = [threading.Thread(target=session_loop, args=(i, app), name=f"session-{i}", daemon=True)
+               for i, app in enumerate(apps)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    wall = time.monotonic() - started
+    cpu = cpu_seconds() - cpu_before
+
+    p50, p95, p99 = percentiles(latencies)
+    rss = rss_mb()
+    return {
+        "sessions": n_sessions, "reruns": len(latencies), "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "p50_ms": p50 * 1000, "p95_ms": p95 * 1000, "p99_ms": p99 * 1000,
+        "max_ms": max(latencies) * 1000 if latencies else None,
+        "cpu_cores": cpu / wall, "cpu_ms_per_rerun": cpu * 1000 / len(latencies) if latencies else None,
+        "rss_mb": rss, "rss_per_session_mb": (rss - baseline_rss) / n_sessions,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25],
+                        help="Session counts to run, in order")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between reruns of one session")
+    parser.add_argument("--duration", type=float, default=180.0, help="Seconds to run each session count")
+    parser.add_argument("--date", type=datetime.date.fromisoformat,
+                        help="Trading date to show (default: the page's default, today)")
+    parser.add_argument("--feeds", type=int, default=4)
+    parser.add_argument("--feed-latency", type=float, default=0.05, help="Stub feed response delay, seconds")
+    parser.add_argument("--max-p95-ms", type=float, help="Fail if any level's p95 rerun latency exceeds this")
+    parser.add_argument("--out", help="Write the JSON report here (default: stdout only)")
+    args = parser.parse_args(argv)
+
+    server = StubFeedServer(feeds=args.feeds, latency=args.feed_latency).start()
+    # Must be set before news_feed is first imported by the page
+    os.environ["ASTRO_NEWS_SOURCES"] = ";".join(f"{name}={url}" for name, url in server.sources)
+    levels = []
+    try:
+        # One throwaway session pays for imports, the ephemeris and the shared caches
+        new_session(args.date)
+        baseline_rss = rss_mb()
+        for n_sessions in args.sessions:
+            level = run_level(n_sessions, args, baseline_rss)
+            levels.append(level)
+            print(f"{n_sessions:4d} sessions: p50 {level['p50_ms']:8.1f} ms  p95 {level['p95_ms']:8.1f} ms  "
+                  f"p99 {level['p99_ms']:8.1f} ms  cpu {level['cpu_cores']:.2f} cores  "
+                  f"rss {level['rss_mb']:.0f} MB  ({level['reruns']} reruns, {level['errors']} errors)",
+                  file=sys.stderr, flush=True)
+    finally:
+        server.stop()
+
+    report = {
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "interval": args.interval, "duration": args.duration,
+            "date": args.date.isoformat() if args.date else None,
+            "feeds": args.feeds, "feed_latency": args.feed_latency, "baseline_rss_mb": baseline_rss,
+            "cpu_count": os.cpu_count(), "platform": platform.platform(), "versions": _versions(),
+        },
+        "levels": levels,
+    }
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as fh:
+            fh.write(output)
+    print(output)
+
+    if args.max_p95_ms is not None:
+        over = [level for level in levels if level["p95_ms"] > args.max_p95_ms]
+        if over:
+            print(f"\nREGRESSION: p95 above {args.max_p95_ms:.0f} ms at "
+                  + ", ".join(f"{level['sessions']} sessions ({level['p95_ms']:.0f} ms)" for level in over),
+                  file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""
+Benchmark runner.
+
+    python -m benchmarks.run                         # run all, compare with benchmarks/baseline.json
+    python -m benchmarks.run --only tithi schedule_live --out results.json
+    python -m benchmarks.run --save-baseline         # record this machine's numbers as the baseline
+    python -m benchmarks.run --ci                    # regression gate: a missing baseline is an error
+
+Every benchmark reports the median / min seconds per call over `--repeat` rounds.
+With a baseline present, any benchmark whose median is more than
+`--tolerance` slower than the baseline is listed and the exit status is 1.
+The date is fixed by default so runs are comparable across commits.
+
+Timings only compare on the same machine, so no baseline is committed: record
+one on the CI runner (or locally) with --save-baseline first. Without --ci a
+missing baseline is only a warning. With --ci (the default when the CI
+environment variable is set) the run fails with exit status 2 before timing
+anything if the baseline file is missing, was recorded with another
+--date/--batch-days, or lacks any of the selected benchmarks, so the gate can
+never pass by comparing against nothing.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import platform
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_DATE = "2025-03-04"  # A Tuesday, inside the page's date-picker range
+DEFAULT_BATCH_DAYS = 30
+
+BENCHMARKS = {}
+
+
+def benchmark(name, number=10):
+    """Registers setup(args) -> zero-argument callable, timed `number` calls per round."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, number)
+        return setup
+    return register
+
+
+def _day(args, hour=10, minute=0):
+    from astrocore import TZ_IST
+    return TZ_IST.localize(datetime.datetime.combine(args.date, datetime.time(hour, minute)))
+
+
+# --- ASTRO CORE ---
+
+@benchmark("cold_start", number=1)
+def _cold_start(args):
+    # A fresh interpreter: imports, ephemeris load and one live schedule
+    code = (
+        "import time, datetime; t0 = time.perf_counter()\n"
+        "from astrocore import TZ_IST, get_ephemeris, calculate_market_schedule\n"
+        "get_ephemeris()\n"
+        f"calculate_market_schedule(TZ_IST.localize(datetime.datetime({args.date.year}, {args.date.month}, {args.date.day}, 10)))\n"
+        "print(time.perf_counter() - t0)\n"
+    )
+
+    def run():
+        subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+    return run
+
+
+@benchmark("sidereal_pos", number=50)
+def _sidereal_pos(args):
+    from astrocore import get_ephemeris, get_sidereal_pos, nse_location
+    ephem = get_ephemeris()
+    t = ephem.ts.from_datetime(_day(args))
+    return lambda: get_sidereal_pos(ephem.moon, t, nse_location())
+
+
+@benchmark("tithi", number=50)
+def _tithi(args):
+    from astrocore import get_ephemeris, get_tithi
+    t = get_ephemeris().ts.from_datetime(_day(args))
+    return lambda: get_tithi(t)
+
+
+@benchmark("nakshatra", number=50)
+def _nakshatra(args):
+    from astrocore import get_ephemeris, get_nakshatra_info_sidereal
+    t = get_ephemeris().ts.from_datetime(_day(args))
+    return lambda: get_nakshatra_info_sidereal(t, 27.2360, 94.1028)
+
+
+@benchmark("schedule_live", number=5)
+def _schedule_live(args):
+    from astrocore import calculate_market_schedule
+    dt = _day(args)
+    return lambda: calculate_market_schedule(dt)
+
+
+@benchmark("schedule_cached", number=200)
+def _schedule_cached(args):
+    from astrocore import get_market_schedule
+    dt = _day(args)
+    get_market_schedule(dt)
+    return lambda: get_market_schedule(dt)
+
+
+@benchmark("schedule_batch", number=1)
+def _schedule_batch(args):
+    from astrocore import calculate_schedule_batch
+    end = args.date + datetime.timedelta(days=args.batch_days - 1)
+    return lambda: calculate_schedule_batch(args.date, end)
+
+
+@benchmark("tithi_transitions_batch", number=1)
+def _tithi_transitions_batch(args):
+    from astrocore import find_tithi_transitions
+    start = _day(args, 0)
+    end = start + datetime.timedelta(days=args.batch_days)
+    return lambda: find_tithi_transitions(start, end)
+
+
+@benchmark("astro_prediction", number=500)
+def _astro_prediction(args):
+    from astrocore import get_market_schedule, get_astro_prediction
+    dt = _day(args, 11)
+    slots = get_market_schedule(dt).slots
+    return lambda: get_astro_prediction(slots, "NIFTY 50", True, dt)
+
+
+# --- PAGE ---
+
+@benchmark("page_rerun", number=3)
+def _page_rerun(args):
+    # Full script rerun through Streamlit's headless test harness
+    from streamlit.testing.v1 import AppTest
+    app = AppTest.from_file(os.path.join(REPO_ROOT, "newindex.py"), default_timeout=120)
+    app.run()
+    app.date_input[0].set_value(datetime.date(1984, 9, 6))
+    app.date_input[1].set_value(args.date)
+    app.run()
+    if app.exception:
+        raise RuntimeError(f"newindex.py failed: {app.exception[0].value}")
+    if app.date_input[1].value != args.date or app.error:
+        # Otherwise we would be timing the "market closed" early stop
+        raise RuntimeError(f"The page did not render a full day for {args.date} (weekend, or outside "
+                           "the date picker's range); pick another --date")
+    return app.run
+
+
+# --- NEWS ---
+
+@benchmark("fetch_news_stub", number=5)
+def _fetch_news_stub(args):
+    import news_feed
+    from benchmarks.stub_feeds import StubFeedServer
+    server = StubFeedServer(feeds=4, items=50).start()
+    args.cleanup.append(server.stop)
+    return lambda: news_feed.fetch_real_news(server.sources)
+
+
+# --- API ---
+
+@benchmark("api_prediction", number=200)
+def _api_prediction(args):
+    # One keep-alive client against the JSON API; every call after the warm-up is a cache hit
+    import http.client
+    import threading
+    from astrocore.api import make_server
+    server = make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    args.cleanup.append(server.shutdown)
+    conn = http.client.HTTPConnection(*server.server_address)
+    path = f"/v1/prediction?date={args.date}&time=11:00"
+
+    def run():
+        conn.request("GET", path)
+        conn.getresponse().read()
+    return run
+
+
+def run_benchmark(name, args):
+    setup, number = BENCHMARKS[name]
+    fn = setup(args)
+    fn()  # warm-up, not timed
+    rounds = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - started) / number)
+    return {
+        "median": statistics.median(rounds),
+        "min": min(rounds),
+        "stdev": statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+        "calls_per_round": number,
+        "rounds": len(rounds),
+    }
+
+
+def _versions():
+    versions = {"python": platform.python_version()}
+    for module in ("numpy", "skyfield", "streamlit", "requests"):
+        try:
+            versions[module] = __import__(module).__version__
+        except Exception:
+            versions[module] = None
+    return versions
+
+
+def compare(results, baseline, tolerance):
+    """Names of benchmarks whose median regressed by more than `tolerance` (a fraction)."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else float("inf")
+        result["baseline_median"] = base["median"]
+        result["ratio"] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def baseline_problem(path, names, args):
+    """Why the baseline at `path` cannot gate a run of `names` with `args`, or None if it can."""
+    if not os.path.exists(path):
+        return f"no baseline at {path}"
+    with open(path) as fh:
+        baseline = json.load(fh)
+    if (baseline["meta"]["date"], baseline["meta"]["batch_days"]) != (args.date.isoformat(), args.batch_days):
+        return f"{path} was recorded with a different --date/--batch-days"
+    missing = [name for name in names if name not in baseline.get("results", {})]
+    if missing:
+        return f"{path} has no results for {', '.join(missing)}"
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--date", type=datetime.date.fromisoformat, default=DEFAULT_DATE,
+                        help=f"Trading date used throughout (default {DEFAULT_DATE})")
+    parser.add_argument("--batch-days", type=int, default=DEFAULT_BATCH_DAYS)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed rounds per benchmark")
+    parser.add_argument("--out", help="Write the JSON report here (default: stdout only)")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown vs baseline median, as a fraction (default 0.25)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--ci", action="store_true", default=bool(os.environ.get("CI")),
+                        help="Fail (exit 2) unless the baseline covers this run (default: on when $CI is set)")
+    args = parser.parse_args(argv)
+    args.cleanup = []
+
+    names = args.only or list(BENCHMARKS)
+    if args.ci and not args.save_baseline:
+        problem = baseline_problem(args.baseline, names, args)
+        if problem:
+            print(f"ERROR: {problem}; record one with --save-baseline", file=sys.stderr)
+            return 2
+
+    results = {}
+    try:
+        for name in names:
+            results[name] = run_benchmark(name, args)
+            print(f"{name:26s} {results[name]['median'] * 1000:10.3f} ms/call "
+                  f"(min {results[name]['min'] * 1000:.3f})", file=sys.stderr, flush=True)
+    finally:
+        for stop in args.cleanup:
+            stop()
+
+    report = {
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "date": args.date.isoformat(), "batch_days": args.batch_days, "repeat": args.repeat,
+            "platform": platform.platform(), "versions": _versions(),
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.save_baseline:
+        with open(args.baseline, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Baseline saved to {args.baseline}", file=sys.stderr)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        if (baseline["meta"]["date"], baseline["meta"]["batch_days"]) != (report["meta"]["date"], args.batch_days):
+            print("WARNING: baseline was recorded with a different --date/--batch-days", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        report["regressions"] = regressions
+    else:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as fh:
+            fh.write(output)
+    print(output)
+
+    if regressions:
+        print(f"\nREGRESSION: {len(regressions)} benchmark(s) slower than baseline by more than "
+              f"{args.tolerance:.0%}:", file=sys.stderr)
+        for name in regressions:
+            print(f"  {name}: {results[name]['ratio']:.2f}x baseline "
+                  f"({results[name]['median'] * 1000:.3f} ms vs {results[name]['baseline_median'] * 1000:.3f} ms)",
+                  file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
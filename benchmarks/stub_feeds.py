@@ -0,0 +1,77 @@
+"""
+Local RSS stub server for benchmarks and load tests.
+
+Serves deterministic feeds at http://127.0.0.1:<port>/feed/<n> with optional
+per-request latency, and answers conditional GETs with 304 like the real
+feeds do, so news_feed can be exercised without touching the internet.
+"""
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+def make_feed(feed_no, items=50):
+    entries = "".join(
+        f"<item><title>Stub feed {feed_no} headline {i}: markets move on data</title>"
+        f"<link>http://stub.invalid/{feed_no}/{i}</link>"
+        f"<description>{'Body text. ' * 40}</description></item>"
+        for i in range(items))
+    return (f"<?xml version='1.0' encoding='UTF-8'?><rss version='2.0'><channel>"
+            f"<title>Stub {feed_no}</title>{entries}</channel></rss>").encode("utf-8")
+
+
+class StubFeedServer:
+    """Context manager running the stub on a free port in a daemon thread."""
+
+    def __init__(self, feeds=4, items=50, latency=0.0):
+        self.latency = latency
+        self._bodies = {f"/feed/{n}": make_feed(n, items) for n in range(feeds)}
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = stub._bodies.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                if stub.latency:
+                    time.sleep(stub.latency)
+                etag = f'"{hash(body) & 0xffffffff:x}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def sources(self):
+        """(name, url) pairs in the same shape as news_feed.SOURCES."""
+        port = self._server.server_address[1]
+        return [(f"Stub {path.rsplit('/', 1)[-1]}", f"http://127.0.0.1:{port}{path}") for path in self._bodies]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-feeds", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -1,19 +1,26 @@
+import io
 import streamlit as st
 import datetime
-import pytz
-import math
-import requests
-import xml.etree.ElementTree as ET
-from streamlit_autorefresh import st_autorefresh
-from skyfield import almanac
-from skyfield.api import load, wgs84
-from skyfield.framelib import ecliptic_frame
+import news_feed
+import news_archive
+import render
+from astrocore import perf
+from astrocore import (
+    TZ_IST, ASSAM_PLACES, INDICES, SCHEDULE_CACHE, ENGINE,
+    get_ephemeris, warm_up, ephemeris_file_present, get_market_schedule, get_day_tithis,
+    get_natal_store, get_astro_prediction, check_compatibility, next_change, export_text,
+)
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(page_title="Indian Market Astro-Algo Pro", layout="wide", page_icon="🕉️")
 
-# --- AUTO REFRESH (Every 60 Seconds) ---
-count = st_autorefresh(interval=60000, key="datarefresh")
+# --- PERFORMANCE SPANS (ASTRO_PERF=1) ---
+# Spans finished during this rerun land here; shown in the sidebar at the end
+perf_spans = perf.collect() if perf.ENABLED else None
+
+# --- LIVE REFRESH ---
+# No whole-page autorefresh: the time-sensitive widgets live in st.fragment
+# blocks that rerun on their own timers (see LIVE PANEL and NEWS SECTION).
 
 # --- CUSTOM CSS ---
 st.markdown("""
@@ -75,295 +82,18 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# --- 1. CONFIGURATION ---
-TZ_IST = pytz.timezone('Asia/Kolkata')
-ASSAM_PLACES = {
-    "North Lakhimpur": (27.2360, 94.1028),
-    "Guwahati": (26.1445, 91.7362),
-    "Dibrugarh": (27.4728, 94.9120),
-    "Jorhat": (26.7509, 94.2037),
-    "Silchar": (24.8333, 92.7789),
-    "Tezpur": (26.6528, 92.7926),
-    "Nagaon": (26.3452, 92.6838),
-    "Tinsukia": (27.4886, 95.3558)
-}
-
-# --- 2. DATA ENGINES ---
-@st.cache_data(ttl=60)
-def fetch_real_news():
-    """Fetches Live Market News with Browser Headers"""
-    news_items = []
-    
-    # Headers to mimic a real browser (Fixes 5paisa blocking)
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-
-    sources = [
-        ("Economic Times", "https://economictimes.indiatimes.com/markets/stocks/rssfeeds/2146842.cms"),
-        ("MoneyControl", "https://www.moneycontrol.com/rss/marketreports.xml"),
-        ("5paisa", "https://www.5paisa.com/rss/latest-share-market-news-moving-stocks.xml"),
-        ("LiveMint", "https://www.livemint.com/rss/markets")
-    ]
-    
-    for source_name, url in sources:
-        try:
-            response = requests.get(url, headers=headers, timeout=5)
-            if response.status_code == 200:
-                root = ET.fromstring(response.content)
-                count = 0
-                for item in root.findall('./channel/item'):
-                    if count >= 3: break
-                    title = item.find('title').text
-                    link = item.find('link').text
-                    
-                    # Avoid duplicates
-                    if not any(d['title'] == title for d in news_items):
-                        news_items.append({"title": title, "link": link, "source": source_name})
-                    count += 1
-        except Exception:
-            continue
-            
-    if not news_items: return [{"title": "News feed unavailable. Check internet connection.", "link": "#", "source": "System"}]
-    return news_items
-
-# --- 3. IMPROVED ASTRO LOGIC (SIDEREAL) ---
-try:
-    eph = load('de421.bsp')
-except:
-    st.warning("Downloading NASA Data...")
-    eph = load('de421.bsp')
-
-sun, moon, earth = eph['sun'], eph['moon'], eph['earth']
-ts = load.timescale()
-
-# LOCATIONS
-# Critical: Market Timing relies on MUMBAI sunrise, not user location.
-NSE_LOC = wgs84.latlon(19.0760, 72.8777) 
-
-def get_lahiri_ayanamsa(t):
-    """
-    Calculates approximate Lahiri Ayanamsa for the given time.
-    Formula: ~24 degrees (modern era)
-    This converts Western (Tropical) Longitude to Vedic (Sidereal).
-    """
-    # Approximate J2000 epoch difference
-    # A simplified but effective calculation for Lahiri
-    # Mean Ayanamsa = 23 deg 51 min 25.5 sec + rate * t
-    days_since_j2000 = t.tt - 2451545.0
-    # Rate of precession approx 50.29 arcseconds per year
-    precession = (50.29 / 3600.0) * (days_since_j2000 / 365.25)
-    # Base Ayanamsa for J2000 (Lahiri) approx 23.85 degrees
-    ayanamsa = 23.85 + precession
-    return ayanamsa
-
-def get_sidereal_pos(body, t, observer_loc):
-    """Returns the Sidereal Longitude (0-360) of a planet"""
-    observer = earth + observer_loc
-    astrometric = observer.at(t).observe(body)
-    _, lon_ecl, _ = astrometric.apparent().ecliptic_latlon()
-    
-    tropical_lon = lon_ecl.degrees
-    ayanamsa = get_lahiri_ayanamsa(t)
-    
-    sidereal_lon = (tropical_lon - ayanamsa) % 360
-    return sidereal_lon
-
-def get_tithi(t, observer_loc):
-    """Calculates the Lunar Day (Tithi) based on Sidereal positions"""
-    # Tithi is independent of Ayanamsa actually (relative distance), 
-    # but using sidereal for consistency.
-    moon_lon = get_sidereal_pos(moon, t, observer_loc)
-    sun_lon = get_sidereal_pos(sun, t, observer_loc)
-    
-    diff = (moon_lon - sun_lon) % 360
-    tithi_idx = int(diff / 12) + 1
-    
-    # Paksha (Waxing/Waning)
-    paksha = "Shukla (Waxing)" if tithi_idx <= 15 else "Krishna (Waning)"
-    display_tithi = tithi_idx if tithi_idx <= 15 else tithi_idx - 15
-    
-    tithi_names = ["Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", 
-                   "Shashthi", "Saptami", "Ashtami", "Navami", "Dashami", 
-                   "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi", "Purnima/Amavasya"]
-    
-    name = tithi_names[display_tithi-1]
-    if tithi_idx == 30: name = "Amavasya (New Moon)"
-    if tithi_idx == 15: name = "Purnima (Full Moon)"
-    
-    return f"{name} ({paksha})"
-
-def calculate_rahu_kaal(weekday_idx, sunrise, sunset):
-    # Accurate Rahu Kaal Segments (Sunrise to Sunset / 8)
-    rk_map = {0: 1, 1: 6, 2: 4, 3: 5, 4: 3, 5: 2, 6: 7} # 0=Mon, 1=Tue...
-    duration = (sunset - sunrise).total_seconds()
-    part = duration / 8.0
-    segment_idx = rk_map[weekday_idx]
-    
-    # Logic: Start time is sunrise + (segment_idx * part) NOT (segment_idx - 1)
-    # Actually standard chart:
-    # Mon: 2nd part (7:30-9:00 approx) -> Index 1 in 0-7 scale? 
-    # Let's use the standard "Part Number" logic where Sunrise is part 0.
-    # Standard Map (1st part is 0): 
-    # Mon(1), Tue(6), Wed(4), Thu(5), Fri(3), Sat(2), Sun(7)
-    
-    start_seconds = (segment_idx - 1) * part # Because map is 1-based (1st part, 2nd part...)
-    start = sunrise + datetime.timedelta(seconds=start_seconds)
-    end = start + datetime.timedelta(seconds=part)
-    return start, end
-
-def calculate_market_schedule(date_obj_py):
-    # USE NSE LOCATION FOR MARKET TIMING
-    midnight = date_obj_py.replace(hour=0, minute=0, second=0, microsecond=0)
-    t0 = ts.from_datetime(midnight)
-    t1 = ts.from_datetime(midnight + datetime.timedelta(days=1))
-    t_rise, y_rise = almanac.find_discrete(t0, t1, almanac.sunrise_sunset(eph, NSE_LOC))
-    
-    sunrise_t, sunset_t = None, None
-    for t, event in zip(t_rise, y_rise):
-        if event == 1 and sunrise_t is None: sunrise_t = t
-        elif event == 0 and sunset_t is None: sunset_t = t
-    
-    if sunrise_t is None or sunset_t is None: return [], None, None, None
-
-    sunrise_dt = sunrise_t.astimezone(TZ_IST)
-    sunset_dt = sunset_t.astimezone(TZ_IST)
-    
-    rk_start, rk_end = calculate_rahu_kaal(date_obj_py.weekday(), sunrise_dt, sunset_dt)
-    
-    day_duration = (sunset_dt - sunrise_dt).total_seconds()
-    hora_len = day_duration / 12.0
-    
-    weekday = date_obj_py.weekday()
-    # 0=Mon, 1=Tue...
-    weekdays_lords = ["Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Sun"]
-    day_lord = weekdays_lords[weekday]
-    
-    # Hora Order logic: Start with Day Lord, then 6th planet from it
-    # Order: Sun -> Venus -> Mercury -> Moon -> Saturn -> Jupiter -> Mars
-    hora_fixed_order = ["Sun", "Venus", "Mercury", "Moon", "Saturn", "Jupiter", "Mars"]
-    
-    # Find start index
-    start_idx = hora_fixed_order.index(day_lord)
-    
-    schedule = []
-    curr = sunrise_dt
-    
-    # Define Market Hours
-    mkt_open = date_obj_py.replace(hour=9, minute=15, second=0, microsecond=0)
-    mkt_close = date_obj_py.replace(hour=15, minute=30, second=0, microsecond=0)
-    pre_open = date_obj_py.replace(hour=9, minute=0, second=0, microsecond=0)
-    
-    for i in range(12):
-        end = curr + datetime.timedelta(seconds=hora_len)
-        planet = hora_fixed_order[(start_idx + i) % 7]
-        
-        # Check overlaps
-        # Case 1: Hora is completely inside market hours
-        # Case 2: Hora starts before market, ends in market
-        # Case 3: Hora starts in market, ends after market
-        
-        # Intersection logic
-        latest_start = max(curr, pre_open)
-        earliest_end = min(end, mkt_close)
-        
-        if latest_start < earliest_end:
-            # Re-calculate Rahu overlap strictly based on time
-            is_rahu = (curr < rk_end) and (end > rk_start)
-            # Refine Rahu: Only flag if the intersection actually overlaps Rahu
-            # (Simplification: if the Hora block touches Rahu Kaal, mark it)
-            
-            schedule.append({
-                "start": curr, 
-                "end": end, 
-                "planet": planet, 
-                "is_rahu": is_rahu
-            })
-            
-        curr = end
-        
-    return schedule, day_lord, rk_start, rk_end
-
-def get_nakshatra_info_sidereal(t_obj, lat, lon):
-    # Use user location object
-    user_loc_obj = wgs84.latlon(lat, lon)
-    
-    # GET SIDEREAL LONGITUDE (The Fix)
-    sidereal_deg = get_sidereal_pos(moon, t_obj, user_loc_obj)
-    
-    # 360 degrees / 27 nakshatras = 13.3333... degrees per nakshatra
-    index = int(sidereal_deg / 13.333333333)
-    
-    nakshatras = [
-        "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra", "Punarvasu", "Pushya", "Ashlesha",
-        "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
-        "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
-    ]
-    lords = [
-        "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury",
-        "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury",
-        "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"
-    ]
-    
-    # Correct index wraparound
-    idx = index % 27
-    
-    # Calculate Padam (Quarter 1,2,3,4)
-    remainder = sidereal_deg % 13.333333333
-    padam = int(remainder / 3.333333333) + 1
-    
-    return nakshatras[idx], lords[idx], padam, sidereal_deg
-
-# --- 4. PREDICTION LOGIC ---
-PLANET_STRATEGIES = {
-    "Jupiter": {"strat": "BUY CALL", "reason": "Trend Expansion / Banking"},
-    "Sun":      {"strat": "BUY CALL", "reason": "Institutional Buying / PSU"},
-    "Mars":     {"strat": "BUY PUT",  "reason": "Aggressive Selling / Panic"},
-    "Mercury": {"strat": "SCALP BOTH", "reason": "High Speed / Volatility"},
-    "Venus":    {"strat": "AVOID",    "reason": "Rangebound / Premium Decay"},
-    "Saturn":  {"strat": "SELL OPT", "reason": "Slow Movement / Theta Decay"},
-    "Moon":     {"strat": "TRAP",      "reason": "Erratic / Fake Breakouts"}
-}
-
-INDEX_PREFS = {
-    "NIFTY 50":     {"best": ["Jupiter", "Sun"], "worst": ["Saturn", "Rahu"]}, 
-    "BANK NIFTY":   {"best": ["Mercury", "Mars", "Jupiter"], "worst": ["Saturn", "Venus"]}, 
-    "SENSEX":       {"best": ["Sun", "Jupiter"], "worst": ["Ketu", "Rahu"]},
-    "MIDCAP SEL":   {"best": ["Mars", "Mercury"], "worst": ["Saturn", "Venus"]}
-}
-
-def get_astro_prediction(schedule, index_name, is_today_view, now_reference):
-    prefs = INDEX_PREFS.get(index_name)
-    best_t = "None"
-    worst_t = "None"
-    strategy = "WAIT"
-    reason = "Neutral Market"
-    
-    # Find NEXT Best
-    for slot in schedule:
-        check_time = now_reference if is_today_view else slot['start'] - datetime.timedelta(minutes=1)
-
-        if slot['end'] > check_time:
-            if slot['planet'] in prefs['best']:
-                if best_t == "None":
-                    best_t = slot['start'].strftime('%I:%M')
-                    strat_info = PLANET_STRATEGIES.get(slot['planet'])
-                    strategy = strat_info['strat']
-                    reason = strat_info['reason']
-                    break
-    
-    # Find NEXT Worst
-    for slot in schedule:
-        check_time = now_reference if is_today_view else slot['start'] - datetime.timedelta(minutes=1)
-        if slot['end'] > check_time:
-            if slot['planet'] in prefs['worst'] or slot['is_rahu']:
-                if worst_t == "None":
-                    worst_t = slot['start'].strftime('%I:%M')
-                    break
-                
-    return best_t, worst_t, strategy, reason
-
-# --- 5. EXECUTION ---
+# --- 1. ASTRO ENGINE ---
+# All astro logic lives in the headless `astrocore` package; this page only renders it.
+# Live news is refreshed in the background by news_feed.NewsRefresher
+# The first rerun in the process starts loading the ephemeris in the background
+# (once per process, shared by every session) and draws the sidebar meanwhile.
+# ASTRO_ENGINE=fast never reads the kernel, so there is nothing to load or download.
+if ENGINE != "fast":
+    if not ephemeris_file_present():
+        st.warning("Downloading NASA Data...")
+    warm_up()
+
+# --- 2. EXECUTION ---
 with st.sidebar:
     st.header("⚙️ Configuration")
     
@@ -383,6 +113,12 @@ with st.sidebar:
     
     st.info("System uses **Sidereal (Lahiri)** Calculations for accuracy.")
 
+EPHEMERIS = None
+if ENGINE != "fast":
+    with st.spinner("Loading NASA ephemeris..."):
+        with perf.span("page.ephemeris"):
+            EPHEMERIS = get_ephemeris()  # Waits for the warm-up load; returns at once afterwards
+
 # --- DATE LOGIC ---
 real_now_ist = datetime.datetime.now(TZ_IST)
 is_today_view = (target_date == datetime.date.today())
@@ -401,184 +137,158 @@ else:
     display_date_str = f"FUTURE ({target_date.strftime('%d %b %Y')})"
 
 # Calculate Schedule using NSE (Mumbai) Location for accuracy
-schedule, day_lord, rk_start, rk_end = calculate_market_schedule(calculation_dt)
+day_schedule = get_market_schedule(calculation_dt)
+schedule, day_lord = day_schedule.slots, day_schedule.day_lord
 
 if not schedule:
     st.error("Time calculation failed.")
     st.stop()
 
 # --- USER ASTRO CALCULATIONS ---
-# Combine Date and Time
-dt_naive = datetime.datetime.combine(user_dob, user_tob)
-dt_ist = TZ_IST.localize(dt_naive)
-t_user = ts.from_datetime(dt_ist)
+# Sidereal birth nakshatra: computed once per (DOB, TOB, place) and persisted
+with perf.span("page.natal"):
+    natal = get_natal_store().get(user_dob, user_tob, pob_coords[0], pob_coords[1])
+user_star, user_lord, user_padam, moon_deg = natal.nakshatra, natal.lord, natal.padam, natal.moon_deg
 
-# Get Sidereal Nakshatra (Corrected from Tropical)
-user_star, user_lord, user_padam, moon_deg = get_nakshatra_info_sidereal(t_user, pob_coords[0], pob_coords[1])
+# Get Tithi for Market Day (and when it ends)
+tithi_now = next(x for x in get_day_tithis(calculation_dt) if x.start <= calculation_dt < x.end)
+current_tithi = f"{tithi_now.name}, ends {tithi_now.end.strftime('%d %b %I:%M %p')}"
 
-# Get Tithi for Market Day
-t_market = ts.from_datetime(calculation_dt)
-current_tithi = get_tithi(t_market, NSE_LOC)
-
-# Determine "Current Hora"
-current_hora = {"planet": "OFF", "start": calculation_dt, "end": calculation_dt, "is_rahu": False}
-if is_today_view:
-    curr = next((s for s in schedule if s['start'] <= real_now_ist < s['end']), None)
-    if curr: current_hora = curr
-else:
-    current_hora["planet"] = "N/A (Future)"
+# The live panel only has to change at the next hora edge (or tithi change /
+# midnight), so its timer fires exactly then instead of polling every minute
+refresh_at = next_change(day_schedule, real_now_ist, [tithi_now.end]) if is_today_view else None
+live_run_every = (refresh_at - real_now_ist).total_seconds() + 1 if refresh_at else None
 
 # --- DASHBOARD HEADER ---
 st.markdown(f"### 🔮 Astro-Scalping Signals: {display_date_str}")
-if is_today_view:
-    st.caption(f"Current Time: {real_now_ist.strftime('%I:%M %p')} | Tithi: **{current_tithi}**")
-else:
-    st.caption(f"Forecast for: {target_date} | Tithi: **{current_tithi}**")
-
-m1, m2, m3, m4 = st.columns(4)
-indices = ["NIFTY 50", "BANK NIFTY", "SENSEX", "MIDCAP SEL"]
-cols_ref = [m1, m2, m3, m4]
+indices = INDICES
+
+# --- LIVE PANEL ---
+@st.fragment(run_every=live_run_every)
+def live_panel():
+    now_ist = datetime.datetime.now(TZ_IST)
+    if refresh_at is not None and now_ist >= refresh_at:
+        # A boundary passed: rerun the whole page so the schedule's live row and
+        # the planner catch up, and the timer is re-armed for the next boundary
+        st.rerun()
+
+    # Determine "Current Hora"
+    current_hora_planet = "OFF"
+    if is_today_view:
+        curr = next((s for s in schedule if s.start <= now_ist < s.end), None)
+        if curr: current_hora_planet = curr.planet
+    else:
+        current_hora_planet = "N/A (Future)"
 
-for idx, label in enumerate(indices):
-    best_t, worst_t, strat, reason = get_astro_prediction(schedule, label, is_today_view, real_now_ist)
-    
-    with cols_ref[idx]:
-        st.markdown(f"""
-        <div class='prediction-box'>
-            <div class='index-title'>{label}</div>
-            <div class='stat-row'><span class='stat-label'>Next Best:</span> <span class='stat-val-green'>{best_t}</span></div>
-            <div class='stat-row'><span class='stat-label'>Avoid:</span> <span class='stat-val-red'>{worst_t}</span></div>
-            <div class='stat-row'><span class='stat-label'>Logic:</span> <span class='stat-val-white'>{reason}</span></div>
-            <div class='strategy-tag'>{strat}</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-# --- USER LUCK & DETAILS ---
-st.markdown("---")
-u1, u2 = st.columns([3, 1])
-
-FRIENDSHIP_TABLE = {
-    "Sun":      {"friends": ["Moon", "Mars", "Jupiter"], "enemies": ["Venus", "Saturn", "Rahu", "Ketu"]},
-    "Moon":     {"friends": ["Sun", "Mercury"], "enemies": ["Rahu", "Ketu", "Saturn"]}, # Updated Sat as enemy/neutral
-    "Mars":     {"friends": ["Sun", "Moon", "Jupiter"], "enemies": ["Mercury", "Rahu"]},
-    "Mercury": {"friends": ["Sun", "Venus"], "enemies": ["Moon"]},
-    "Jupiter": {"friends": ["Sun", "Moon", "Mars"], "enemies": ["Mercury", "Venus"]},
-    "Venus":    {"friends": ["Mercury", "Saturn", "Rahu"], "enemies": ["Sun", "Moon"]},
-    "Saturn":  {"friends": ["Mercury", "Venus", "Rahu"], "enemies": ["Sun", "Moon", "Mars"]},
-    "Rahu":    {"friends": ["Venus", "Saturn", "Mercury"], "enemies": ["Sun", "Moon", "Mars"]},
-    "Ketu":    {"friends": ["Mars", "Jupiter"], "enemies": ["Sun", "Moon"]}
-}
-
-def check_compatibility(user_lord, hora_planet):
-    rel = FRIENDSHIP_TABLE.get(user_lord, {})
-    if hora_planet in rel.get("friends", []): return "Lucky", "badge-good", 100
-    elif hora_planet in rel.get("enemies", []): return "Avoid", "badge-bad", 20
-    return "Neutral", "badge-neutral", 50
-
-with u1:
-    st.markdown(f"**Day Lord:** {day_lord} | **Your Birth Star:** {user_star} (Padam {user_padam}) | **Your Lord:** {user_lord}")
-    with st.expander("Show Astronomical Details"):
-        st.text(f"Moon Longitude (Sidereal): {moon_deg:.2f}°")
-        st.text(f"Algorithm: Lahiri Ayanamsa Correction applied to NASA JPL Data")
-        st.text(f"Market Timing Source: NSE Mumbai (19.07N, 72.87E)")
-
-with u2:
-    if is_today_view and current_hora['planet'] != "OFF":
-        luck_label, luck_badge, luck_pct = check_compatibility(user_lord, current_hora['planet'])
-        d_col = "normal" if luck_pct == 100 else ("inverse" if luck_pct == 20 else "off")
-        st.metric("My Luck Now", f"{luck_pct}%", delta=luck_label, delta_color=d_col)
-    elif not is_today_view:
-        st.metric("My Luck Now", "--", delta="Future View", delta_color="off")
+    if is_today_view:
+        st.caption(f"Current Hora: **{current_hora_planet}** (as of {now_ist.strftime('%I:%M %p')}) | Tithi: **{current_tithi}**")
     else:
-        st.metric("My Luck Now", "Closed", delta="Off-Market", delta_color="off")
+        st.caption(f"Forecast for: {target_date} | Tithi: **{current_tithi}**")
+
+    cols_ref = st.columns(4)
+    for idx, label in enumerate(indices):
+        best_t, worst_t, strat, reason = get_astro_prediction(schedule, label, is_today_view, now_ist)
+
+        with cols_ref[idx]:
+            st.markdown(f"""
+            <div class='prediction-box'>
+                <div class='index-title'>{label}</div>
+                <div class='stat-row'><span class='stat-label'>Next Best:</span> <span class='stat-val-green'>{best_t}</span></div>
+                <div class='stat-row'><span class='stat-label'>Avoid:</span> <span class='stat-val-red'>{worst_t}</span></div>
+                <div class='stat-row'><span class='stat-label'>Logic:</span> <span class='stat-val-white'>{reason}</span></div>
+                <div class='strategy-tag'>{strat}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+    # --- USER LUCK & DETAILS ---
+    st.markdown("---")
+    u1, u2 = st.columns([3, 1])
+
+    with u1:
+        st.markdown(f"**Day Lord:** {day_lord} | **Your Birth Star:** {user_star} (Padam {user_padam}) | **Your Lord:** {user_lord}")
+        with st.expander("Show Astronomical Details"):
+            st.text(f"Moon Longitude (Sidereal): {moon_deg:.2f}°")
+            if EPHEMERIS is None:
+                st.text(f"Algorithm: Lahiri Ayanamsa Correction applied to the fast analytic engine (ASTRO_ENGINE=fast)")
+            else:
+                st.text(f"Algorithm: Lahiri Ayanamsa Correction applied to NASA JPL Data")
+            st.text(f"Market Timing Source: NSE Mumbai (19.07N, 72.87E)")
+            if EPHEMERIS is not None:
+                st.text(f"Ephemeris: {EPHEMERIS.path} loaded once at {EPHEMERIS.loaded_at.strftime('%d %b %I:%M %p')} "
+                        f"in {EPHEMERIS.load_seconds * 1000:.0f} ms (shared by all sessions)")
+            cache_stats = SCHEDULE_CACHE.stats()
+            st.text(f"Schedule Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                    f"/ {cache_stats['coalesced']} coalesced ({cache_stats['entries']} days cached)")
+            if refresh_at is not None:
+                st.text(f"Live panel refreshes next at {refresh_at.strftime('%I:%M:%S %p')}")
+
+    with u2:
+        if is_today_view and current_hora_planet != "OFF":
+            luck_label, luck_badge, luck_pct = check_compatibility(user_lord, current_hora_planet)
+            d_col = "normal" if luck_pct == 100 else ("inverse" if luck_pct == 20 else "off")
+            st.metric("My Luck Now", f"{luck_pct}%", delta=luck_label, delta_color=d_col)
+        elif not is_today_view:
+            st.metric("My Luck Now", "--", delta="Future View", delta_color="off")
+        else:
+            st.metric("My Luck Now", "Closed", delta="Off-Market", delta_color="off")
+
+with perf.span("page.live_panel"):
+    live_panel()
 
 # --- NEWS SECTION ---
-news = fetch_real_news()
-st.markdown("### 📰 Real-Time Headlines")
-n1, n2 = st.columns(2)
-half = (len(news) // 2) + 1
-with n1:
-    for item in news[:half]:
-        st.markdown(f"<div class='news-item'><a class='news-link' href='{item['link']}' target='_blank'>{item['title']}</a><span class='news-source'>{item['source']}</span></div>", unsafe_allow_html=True)
-with n2:
-    for item in news[half:]:
-        st.markdown(f"<div class='news-item'><a class='news-link' href='{item['link']}' target='_blank'>{item['title']}</a><span class='news-source'>{item['source']}</span></div>", unsafe_allow_html=True)
+# Stale-while-revalidate: only read the refresher's latest snapshot, never fetch here.
+# Its own fragment picks up each background refresh without rerunning the page.
+@st.fragment(run_every=news_feed.REFRESH_INTERVAL_SECONDS)
+def news_section():
+    news_snapshot = news_feed.get_refresher().snapshot()
+    news = news_snapshot["items"]
+    st.markdown("### 📰 Real-Time Headlines")
+    if news_snapshot["loading"]:
+        st.caption("Fetching headlines in the background...")
+    elif news_snapshot["is_stale"] and news_snapshot["age_seconds"] is not None:
+        st.caption(f"⚠️ Feeds unreachable, showing headlines from {news_snapshot['age_seconds'] / 60:.0f} min ago")
+    n1, n2 = st.columns(2)
+    half = (len(news) // 2) + 1
+    with n1:
+        st.markdown(render.news_column_html(news[:half]), unsafe_allow_html=True)
+    with n2:
+        st.markdown(render.news_column_html(news[half:]), unsafe_allow_html=True)
+    with st.expander("Feed Health"):
+        for source_name, feed in news_feed.FEED_STATS.snapshot().items():
+            avg_ms = f"{feed['avg_latency'] * 1000:.0f} ms" if feed['avg_latency'] is not None else "--"
+            st.text(f"{source_name}: avg {avg_ms} | {feed['requests']} requests | "
+                    f"{feed['errors']} errors | {feed['deadline_misses']} late"
+                    + (f" | last error: {feed['last_error'][:120]}" if feed['last_error'] else ""))
+    with st.expander("Headlines by Hora / Rahu Kaal"):
+        # Served from the local archive: an indexed range query, never a feed fetch
+        windows = {f"{slot.planet} {slot.start.strftime('%I:%M %p')} - {slot.end.strftime('%I:%M %p')}"
+                   + (" (Rahu)" if slot.is_rahu else ""): (slot.start, slot.end) for slot in schedule}
+        windows[f"Rahu Kaal {day_schedule.rahu_start.strftime('%I:%M %p')} - "
+                f"{day_schedule.rahu_end.strftime('%I:%M %p')}"] = (day_schedule.rahu_start, day_schedule.rahu_end)
+        w1, w2 = st.columns([1, 1])
+        window_start, window_end = windows[w1.selectbox("Window", list(windows), key="news_window")]
+        search_text = w2.text_input("Search titles", key="news_search")
+        archive = news_archive.get_archive()
+        if search_text.strip():
+            archived = archive.search(search_text, window_start, window_end)
+        else:
+            archived = archive.window(window_start, window_end)
+        if archived:
+            st.markdown(render.news_column_html(archived), unsafe_allow_html=True)
+        else:
+            st.caption("No archived headlines in this window.")
+
+with perf.span("page.news"):
+    news_section()
 
 # --- SCHEDULE SECTION ---
+# Each table is one pre-assembled HTML block (see render.py)
+live_index, past_count = render.live_position(schedule, real_now_ist if is_today_view else None)
+
 st.markdown("---")
 st.subheader(f"📜 Schedule (Filtered for Trading): {target_date.strftime('%A, %d %B')}")
-cols = st.columns([2, 1, 1, 2, 2, 3])
-cols[0].markdown("**Time (IST)**")
-cols[1].markdown("**Hora**")
-cols[2].markdown("**Rahu?**")
-cols[3].markdown(f"**Luck ({user_lord})**")
-cols[4].markdown("**Status**")
-cols[5].markdown("**Explanation**")
-
-for slot in schedule:
-    s_str = slot['start'].strftime('%I:%M %p')
-    e_str = slot['end'].strftime('%I:%M %p')
-    planet = slot['planet']
-    
-    # Logic for Active/Past
-    is_active = False
-    is_past = False
-    if is_today_view:
-        is_active = slot['start'] <= real_now_ist < slot['end']
-        is_past = real_now_ist > slot['end']
-    
-    # --- STATUS LOGIC with BEST/WORST Flagging ---
-    luck_txt, luck_badge, luck_val = check_compatibility(user_lord, planet)
-    
-    # Default State
-    status_text = "🟢 OPEN"
-    text_color = "#00FFA3" # Green
-    expl = "Scalping Zone"
-    row_class = "trade-row"
-    opacity = "1.0"
-
-    # 1. Astro Logic Override
-    if luck_val == 100:
-        status_text = "🌟 BEST"
-        text_color = "#FFD700" # Gold
-        expl = f"High Luck with {planet}"
-    elif luck_val == 20:
-        status_text = "🛑 AVOID"
-        text_color = "#FF453A" # Red
-        expl = "Incompatible Planet"
-    
-    # 2. Safety Overrides (Rahu / Pre-Open)
-    if slot['is_rahu']:
-        status_text = "⛔ RAHU"
-        text_color = "#FF453A"
-        expl = "Trap Zone / High Risk"
-        row_class = "trade-row rahu"
-    
-    if slot['start'].hour == 9 and slot['start'].minute < 15:
-        status_text = "🟠 PRE"
-        text_color = "#FEAE00"
-        expl = "Pre-Open / Volatility"
-
-    # 3. Active/Past Logic
-    if is_active:
-        status_text = f"🟢 LIVE ({status_text})"
-        row_class += " active"
-    elif is_past:
-        opacity = "0.5" # Dim past rows
-
-    rahu_txt = "💀 YES" if slot['is_rahu'] else "-"
-    rahu_col = "#FF453A" if slot['is_rahu'] else "#444"
-
-    st.markdown(f"""
-    <div class='{row_class}' style='opacity:{opacity}'>
-        <div style='width:16%; font-family:monospace; font-size:1.0rem;'>{s_str} &nbsp;&nbsp;-&nbsp;&nbsp; {e_str}</div>
-        <div style='width:10%; font-weight:bold; color:#00FFA3'>{planet}</div>
-        <div style='width:10%; color:{rahu_col}; font-weight:bold'>{rahu_txt}</div>
-        <div style='width:16%'><span class='{luck_badge}'>{luck_txt}</span></div>
-        <div style='width:16%; font-weight:bold; color:{text_color}'>{status_text}</div>
-        <div style='width:25%; font-size:0.9rem; color:#aaa'>{expl}</div>
-    </div>
-    """, unsafe_allow_html=True)
+with perf.span("render.schedule"):
+    st.markdown(render.schedule_table_html(schedule, user_lord, live_index, past_count), unsafe_allow_html=True)
 
 
 # --- ADVANCED PLANNER ---
@@ -590,59 +300,54 @@ planner_tabs = st.tabs(indices)
 
 for i, index_name in enumerate(indices):
     with planner_tabs[i]:
-        prefs = INDEX_PREFS.get(index_name)
-        valid_slots = []
-        
-        for slot in schedule:
-            show_slot = True
-            if is_today_view and slot['end'] < real_now_ist:
-                show_slot = False
-            
-            if show_slot:
-                is_best = slot['planet'] in prefs['best']
-                is_worst = (slot['planet'] in prefs['worst']) or slot['is_rahu']
-                
-                if is_best and not slot['is_rahu']: # Added Rahu check to Best
-                    strat_data = PLANET_STRATEGIES[slot['planet']]
-                    valid_slots.append({
-                        "time": f"{slot['start'].strftime('%I:%M %p')} - {slot['end'].strftime('%I:%M %p')}",
-                        "hora": slot['planet'],
-                        "status": "🌟 HIGH PROBABILITY",
-                        "action": f"✅ {strat_data['strat']}", 
-                        "logic": f"{slot['planet']} is Strong for {index_name}",
-                        "color": "#00FFA3",
-                        "bg": "rgba(0, 255, 163, 0.05)"
-                    })
-                elif is_worst:
-                    reason = "Rahu Kaal (Traps)" if slot['is_rahu'] else f"{slot['planet']} is Weak for {index_name}"
-                    valid_slots.append({
-                        "time": f"{slot['start'].strftime('%I:%M %p')} - {slot['end'].strftime('%I:%M %p')}",
-                        "hora": slot['planet'],
-                        "status": "🛑 DANGER ZONE",
-                        "action": "⛔ NO TRADING",
-                        "logic": reason,
-                        "color": "#FF453A",
-                        "bg": "rgba(255, 69, 58, 0.05)"
-                    })
-
-        if valid_slots:
-            st.markdown(f"""
-            <div style="display:flex; font-weight:bold; color:#888; padding:5px 10px; border-bottom:1px solid #444; margin-bottom:10px;">
-                <div style="width:25%">Time</div>
-                <div style="width:15%">Hora</div>
-                <div style="width:25%">Signal</div>
-                <div style="width:35%">Action</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            for v in valid_slots:
-                st.markdown(f"""
-                <div style="border-left: 4px solid {v['color']}; background-color: {v.get('bg', '#1A1C24')}; padding: 12px; margin-bottom: 8px; border-radius: 4px; display: flex; align-items: center;">
-                    <div style="width: 25%; font-family:monospace; font-size:1.0rem;">{v['time']}</div>
-                    <div style="width: 15%; font-weight:bold; color: #FFF;">{v['hora']}</div>
-                    <div style="width: 25%; font-weight:bold; color: {v['color']};">{v['status']}</div>
-                    <div style="width: 35%;"><span style="background:{v.get('bg', 'transparent')}; color:{v['color']}; padding:4px 8px; border-radius:4px; border:1px solid {v['color']}; font-size:0.9rem; font-weight:bold;">{v['action']}</span></div>
-                </div>
-                """, unsafe_allow_html=True)
+        with perf.span("render.planner", index=index_name):
+            planner_html = render.planner_table_html(schedule, index_name, past_count)
+        if planner_html:
+            st.markdown(planner_html, unsafe_allow_html=True)
         else:
-            st.info(f"No significant High/Low probability events found for {index_name} for the remainder of {target_date}.")
\ No newline at end of file
+            st.info(f"No significant High/Low probability events found for {index_name} for the remainder of {target_date}.")
+
+# Whole years of horas, Rahu Kaal, planner zones and tithis. A download button
+# needs the whole file up front, so it is built only when asked for and kept for
+# this session until the options change; streamed to a file: python -m astrocore.export
+EXPORT_MAX_YEARS = 3
+
+
+@st.fragment
+def export_panel():
+    # Its own fragment, so changing the options or building the file reruns only this panel
+    e1, e2, e3 = st.columns(3)
+    export_from = int(e1.number_input("From year", 1900, 2050, target_date.year, key="export_from"))
+    export_years = int(e2.number_input("Years", 1, EXPORT_MAX_YEARS, 1, key="export_years"))
+    export_format = e3.radio("Format", ["ics", "csv"], horizontal=True, key="export_format")
+    export_first = datetime.date(export_from, 1, 1)
+    export_last = datetime.date(min(export_from + export_years - 1, 2050), 12, 31)
+    export_span = f"{export_first.year}" + (f"-{export_last.year}" if export_last.year != export_first.year else "")
+    export_key = (export_first, export_last, export_format)
+
+    prepared = st.session_state.get("export_file")
+    if prepared is None or prepared[0] != export_key:
+        if not st.button(f"Prepare {export_span} .{export_format}", key="export_prepare"):
+            return
+        with st.spinner(f"Building the {export_span} calendar..."), perf.span("page.export", years=export_years):
+            data = io.BytesIO()
+            for chunk in export_text(export_first, export_last, export_format, workers=1):
+                data.write(chunk.encode("utf-8"))
+        st.session_state["export_file"] = prepared = (export_key, data.getvalue())
+    st.download_button(
+        f"⬇️ Download {export_span} .{export_format}", data=prepared[1],
+        file_name=f"astro_market_{export_span}.{export_format}",
+        mime="text/calendar" if export_format == "ics" else "text/csv")
+
+
+with st.expander("📅 Export Calendar (CSV / iCalendar)"):
+    export_panel()
+
+# --- PERFORMANCE PANEL ---
+if perf_spans is not None:
+    with st.sidebar.expander("⏱️ Performance"):
+        st.caption("Spans from this rerun (ms); tags in brackets")
+        for s in sorted(perf_spans, key=lambda s: s.started):
+            tags = ", ".join(f"{k}={v}" for k, v in s.tags.items())
+            st.text(f"{s.seconds * 1000:8.2f}  {s.name}" + (f" [{tags}]" if tags else ""))
+    perf.write_prometheus()
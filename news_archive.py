@@ -0,0 +1,209 @@
+"""
+Persistent headline archive.
+
+Every item the NewsRefresher pulls from a feed is kept in a local SQLite file
+(ARCHIVE_FILE, in config.DATA_DIR whatever the working directory), so
+headlines can be lined up against hora and Rahu Kaal windows after the fact.
+Items are keyed by a hash of their GUID (else link, else title), so
+re-fetching a feed is a no-op upsert. Titles are indexed with FTS5 for
+search, and each item's time (its pubDate, else when it was first seen) is
+indexed, so a window query is one index range scan with a LIMIT and stays in
+milliseconds however long the archive grows.
+
+    python news_archive.py info
+    python news_archive.py search "rbi policy" --start 2025-03-04T09:15 --end 2025-03-04T15:30
+"""
+import os
+import time
+import sqlite3
+import hashlib
+import argparse
+import datetime
+import threading
+
+from astrocore.config import TZ_IST, DATA_DIR
+from astrocore.perf import span
+
+ARCHIVE_FILE = os.path.join(DATA_DIR, 'news.sqlite3')
+DEFAULT_LIMIT = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    item_key BLOB NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    link TEXT,
+    published REAL,
+    first_seen REAL NOT NULL,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_at ON items (at);
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5 (title, content='items', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts (rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+"""
+
+
+def item_key(item):
+    """Stable identity of a feed item: its GUID, else its link, else source and title."""
+    identity = item.get("guid") or item.get("link") or f"{item['source']}\n{item['title']}"
+    return hashlib.blake2b(identity.encode("utf-8"), digest_size=16).digest()
+
+
+def _match_query(text):
+    """User text as an FTS5 query: every word must appear (prefix match on the last one)."""
+    words = ['"%s"' % word.replace('"', '""') for word in text.split()]
+    if words:
+        words[-1] += "*"
+    return " ".join(words)
+
+
+def _seconds(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return value.timestamp()
+
+
+class NewsArchive:
+    """
+    SQLite-backed headline archive (path=None keeps it in memory). One
+    connection behind a lock, safe to share between sessions and the
+    refresher thread.
+    """
+
+    def __init__(self, path=ARCHIVE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        if path:
+            self._db.execute("PRAGMA journal_mode=WAL")  # Readers in other processes never block ingestion
+        self._db.executescript(_SCHEMA)
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def ingest(self, items, now=None):
+        """Upserts feed items; already archived ones are left untouched. Returns how many were new."""
+        now = time.time() if now is None else now
+        rows = []
+        for item in items:
+            published = item.get("published")
+            rows.append((item_key(item), item["source"], item["title"], item.get("link"),
+                         published, now, published if published is not None else now))
+        if not rows:
+            return 0
+        with self._lock, span("news.archive.ingest", items=len(rows)):
+            with self._db:
+                cursor = self._db.executemany(
+                    "INSERT INTO items (item_key, source, title, link, published, first_seen, at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (item_key) DO NOTHING", rows)
+            return cursor.rowcount
+
+    def window(self, start, end, limit=DEFAULT_LIMIT, source=None):
+        """Headlines timed in [start, end) (aware datetimes or POSIX seconds), oldest first."""
+        sql = "SELECT source, title, link, at FROM items WHERE at >= ? AND at < ?"
+        params = [_seconds(start), _seconds(end)]
+        if source is not None:
+            sql += " AND source = ?"
+            params.append(source)
+        sql += " ORDER BY at LIMIT ?"
+        params.append(limit)
+        return self._query("window", sql, params)
+
+    def search(self, text, start=None, end=None, limit=DEFAULT_LIMIT):
+        """Headlines whose title matches every word of `text`, newest first, optionally within [start, end)."""
+        query = _match_query(text)
+        if not query:
+            return []
+        start = _seconds(start) if start is not None else float("-inf")
+        end = _seconds(end) if end is not None else float("inf")
+        sql = ("SELECT items.source, items.title, items.link, items.at FROM items_fts "
+               "JOIN items ON items.id = items_fts.rowid WHERE items_fts MATCH ? AND items.at >= ? AND items.at < ?")
+        params = [query, start, end]
+        if start != float("-inf") or end != float("inf"):
+            # Ids grow with ingestion time, so the window's id range bounds the
+            # FTS scan itself instead of filtering every match of a common word
+            with self._lock:
+                lo, hi = self._db.execute("SELECT MIN(id), MAX(id) FROM items WHERE at >= ? AND at < ?",
+                                          (start, end)).fetchone()
+            if lo is None:
+                return []
+            sql += " AND items_fts.rowid BETWEEN ? AND ?"
+            params += [lo, hi]
+        sql += " ORDER BY items.at DESC LIMIT ?"
+        params.append(limit)
+        return self._query("search", sql, params)
+
+    def _query(self, kind, sql, params):
+        with self._lock, span("news.archive.query", kind=kind):
+            rows = self._db.execute(sql, params).fetchall()
+        return [{"source": row["source"], "title": row["title"], "link": row["link"],
+                 "at": datetime.datetime.fromtimestamp(row["at"], TZ_IST)} for row in rows]
+
+    def stats(self):
+        with self._lock:
+            count, first, last = self._db.execute("SELECT COUNT(*), MIN(at), MAX(at) FROM items").fetchone()
+            sources = dict(self._db.execute("SELECT source, COUNT(*) FROM items GROUP BY source").fetchall())
+        return {
+            "items": count, "sources": sources,
+            "first": datetime.datetime.fromtimestamp(first, TZ_IST) if first is not None else None,
+            "last": datetime.datetime.fromtimestamp(last, TZ_IST) if last is not None else None,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive():
+    """Process-wide archive backed by ARCHIVE_FILE."""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = NewsArchive()
+        return _archive
+
+
+def _ist_datetime(value):
+    dt = datetime.datetime.fromisoformat(value)
+    return TZ_IST.localize(dt) if dt.tzinfo is None else dt
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python news_archive.py", description="Inspect the headline archive.")
+    parser.add_argument("--db", default=ARCHIVE_FILE, help="Archive file (default %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("info", help="Item counts and time span")
+    search = sub.add_parser("search", help="Full-text search over titles")
+    search.add_argument("text")
+    search.add_argument("--start", type=_ist_datetime, help="ISO date-time, IST unless it has an offset")
+    search.add_argument("--end", type=_ist_datetime)
+    search.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    args = parser.parse_args(argv)
+
+    archive = NewsArchive(args.db)
+    if args.command == "info":
+        stats = archive.stats()
+        print(f"{args.db}: {stats['items']} items, {stats['first']} .. {stats['last']}")
+        for source, count in sorted(stats["sources"].items()):
+            print(f"  {source}: {count}")
+    else:
+        for item in archive.search(args.text, args.start, args.end, args.limit):
+            print(f"{item['at']:%Y-%m-%d %H:%M}  [{item['source']}]  {item['title']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""
+Live market news engine.
+
+Feeds are fetched in parallel through one pooled keep-alive session under a
+global deadline, so a slow host can no longer hold up the page render.
+NewsRefresher keeps a headline snapshot fresh on a background thread with
+conditional GETs (ETag / Last-Modified); the page only ever reads the latest
+snapshot. Feeds are parsed incrementally and the download stops as soon as
+enough new items have arrived. Given an archive (news_archive.NewsArchive),
+the refresher also stores every new item it scans, not just the ones shown.
+This module does not import Streamlit: point `sources` at a local
+stub HTTP server to exercise it on its own, or set ASTRO_NEWS_SOURCES
+("Name=url;Name=url") to redirect the whole page (e.g. for load tests).
+"""
+import os
+import re
+import time
+import hashlib
+import logging
+import datetime
+import threading
+import email.utils
+import collections
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from astrocore.perf import span
+
+logger = logging.getLogger("news_feed")
+
+# Headers to mimic a real browser (Fixes 5paisa blocking)
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+SOURCES = [
+    ("Economic Times", "https://economictimes.indiatimes.com/markets/stocks/rssfeeds/2146842.cms"),
+    ("MoneyControl", "https://www.moneycontrol.com/rss/marketreports.xml"),
+    ("5paisa", "https://www.5paisa.com/rss/latest-share-market-news-moving-stocks.xml"),
+    ("LiveMint", "https://www.livemint.com/rss/markets")
+]
+if os.environ.get("ASTRO_NEWS_SOURCES"):
+    SOURCES = [tuple(part.split("=", 1)) for part in os.environ["ASTRO_NEWS_SOURCES"].split(";") if part]
+
+ITEMS_PER_SOURCE = 3
+MAX_SCAN_ITEMS = 25      # Never walk further than this into a feed looking for new items
+CHUNK_SIZE = 16 * 1024
+CONNECT_TIMEOUT = 3.05
+DEADLINE_SECONDS = 5.0   # Whole fetch, all sources together
+REFRESH_INTERVAL_SECONDS = 60
+
+UNAVAILABLE = [{"title": "News feed unavailable. Check internet connection.", "link": "#", "source": "System"}]
+
+_session = None
+_session_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="rss-fetch")
+
+
+def get_session():
+    """Process-wide keep-alive session; connections to each feed host are reused."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=len(SOURCES) * 2, pool_maxsize=8)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+class FeedStats:
+    """Per-source latency / error counters, safe to update from worker threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sources = {}
+
+    def _entry(self, source_name):
+        return self._sources.setdefault(source_name, {
+            "requests": 0, "errors": 0, "not_modified": 0, "deadline_misses": 0,
+            "total_latency": 0.0, "last_latency": None, "last_error": None,
+        })
+
+    def record(self, source_name, latency, error=None, not_modified=False):
+        with self._lock:
+            entry = self._entry(source_name)
+            entry["requests"] += 1
+            entry["total_latency"] += latency
+            entry["last_latency"] = latency
+            if not_modified:
+                entry["not_modified"] += 1
+            if error is not None:
+                entry["errors"] += 1
+                entry["last_error"] = error
+
+    def record_deadline_miss(self, source_name):
+        with self._lock:
+            self._entry(source_name)["deadline_misses"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for name, entry in self._sources.items():
+                row = dict(entry)
+                row["avg_latency"] = entry["total_latency"] / entry["requests"] if entry["requests"] else None
+                result[name] = row
+            return result
+
+
+FEED_STATS = FeedStats()
+
+
+def title_key(title):
+    """Hashed, normalized title: case, punctuation and whitespace differences collapse to one key."""
+    normalized = " ".join(re.sub(r"[^\w\s]", " ", title.casefold()).split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest()
+
+
+class SeenIndex:
+    """Bounded set of title keys already delivered; oldest keys are evicted first."""
+
+    def __init__(self, maxsize=5000):
+        self.maxsize = maxsize
+        self._keys = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._keys
+
+    def __len__(self):
+        with self._lock:
+            return len(self._keys)
+
+    def add(self, key):
+        with self._lock:
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+
+
+def parse_pub_date(value):
+    """RSS pubDate (RFC 822) as POSIX seconds, or None if missing or malformed."""
+    if not value:
+        return None
+    try:
+        published = email.utils.parsedate_to_datetime(value.strip())
+    except (TypeError, ValueError):
+        return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=datetime.timezone.utc)
+    return published.timestamp()
+
+
+def parse_feed(chunks, source_name, limit=ITEMS_PER_SOURCE, seen=None, stop_keys=frozenset(),
+               max_scan=MAX_SCAN_ITEMS):
+    """
+    Incremental RSS parser. `chunks` is the body as bytes or an iterable of
+    byte chunks (e.g. response.iter_content()); nothing after the last needed
+    item is read. Items whose title key is in `seen` are skipped, and reaching
+    a key in `stop_keys` (this feed's newest known headline) ends the scan,
+    since feeds list newest first.
+    """
+    if isinstance(chunks, (bytes, str)):
+        chunks = [chunks]
+
+    parser = ET.XMLPullParser(events=("end",))
+    items = []
+    scanned = 0
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if elem.tag.rsplit('}', 1)[-1] != 'item':
+                continue
+            title, link = elem.findtext('title'), elem.findtext('link')
+            guid, published = elem.findtext('guid'), parse_pub_date(elem.findtext('pubDate'))
+            elem.clear()
+            scanned += 1
+            if title:
+                key = title_key(title)
+                if key in stop_keys:
+                    return items
+                if seen is None or key not in seen:
+                    items.append({"title": title, "link": link, "source": source_name, "key": key,
+                                  "guid": guid, "published": published})
+                    if len(items) >= limit:
+                        return items
+            if scanned >= max_scan:
+                return items
+    return items
+
+
+def _fetch_source(session, source_name, url, read_timeout, validators=None, seen=None,
+                  stop_keys=frozenset(), limit=ITEMS_PER_SOURCE):
+    """
+    One (optionally conditional) streamed GET. Returns (status, items, validators)
+    where status is "ok", "not_modified" or "error".
+    """
+    headers = {}
+    if validators:
+        if validators.get("etag"): headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"): headers["If-Modified-Since"] = validators["last_modified"]
+
+    with span("rss.fetch", source=source_name) as timing:
+        status, items, validators = _get_feed(session, source_name, url, read_timeout, headers,
+                                              validators, seen, stop_keys, limit)
+        timing.tag(status=status)
+    return status, items, validators
+
+
+def _get_feed(session, source_name, url, read_timeout, headers, validators, seen, stop_keys, limit):
+    started = time.perf_counter()
+    try:
+        # Streamed: the parser stops pulling chunks once it has what it needs,
+        # and closing the response drops the rest of a large feed unread
+        with session.get(url, headers=headers, timeout=(CONNECT_TIMEOUT, read_timeout),
+                         stream=True) as response:
+            if response.status_code == 304:
+                FEED_STATS.record(source_name, time.perf_counter() - started, not_modified=True)
+                return "not_modified", None, validators
+            if response.status_code != 200:
+                raise requests.HTTPError(f"HTTP {response.status_code}")
+            items = parse_feed(response.iter_content(CHUNK_SIZE), source_name, limit=limit,
+                               seen=seen, stop_keys=stop_keys)
+    except Exception as exc:
+        FEED_STATS.record(source_name, time.perf_counter() - started, repr(exc))
+        return "error", None, validators
+    FEED_STATS.record(source_name, time.perf_counter() - started)
+    return "ok", items, {"etag": response.headers.get("ETag"),
+                         "last_modified": response.headers.get("Last-Modified")}
+
+
+def _merge(per_source_items):
+    news_items = []
+    keys = set()
+    for items in per_source_items:
+        for item in items:
+            # Avoid duplicates (O(1) per item via the hashed title key)
+            if item['key'] not in keys:
+                keys.add(item['key'])
+                news_items.append(item)
+    return news_items
+
+
+def fetch_real_news(sources=SOURCES, deadline=DEADLINE_SECONDS, session=None):
+    """
+    Fetches every source concurrently and returns whatever arrived before the
+    deadline, in source order and without duplicate titles. Late sources keep
+    running in the background and only count as a deadline miss.
+    """
+    session = session or get_session()
+    futures = [(name, _executor.submit(_fetch_source, session, name, url, deadline))
+               for name, url in sources]
+    done, _ = wait([future for _, future in futures], timeout=deadline)
+
+    per_source_items = []
+    for source_name, future in futures:
+        if future not in done:
+            FEED_STATS.record_deadline_miss(source_name)
+            continue
+        status, items, _ = future.result()
+        if status == "ok":
+            per_source_items.append(items)
+
+    news_items = _merge(per_source_items)
+    if not news_items: return list(UNAVAILABLE)
+    return news_items
+
+
+class NewsRefresher:
+    """
+    Stale-while-revalidate headline cache. A daemon thread refreshes every
+    `interval` seconds with per-feed conditional GETs; snapshot() never does
+    I/O. A failing feed keeps serving its last good items, and the snapshot
+    age tells the page how old the data is. With an `archive`, each feed is
+    scanned up to its newest known headline (at most MAX_SCAN_ITEMS) and every
+    new item is archived after the snapshot is published.
+    """
+
+    def __init__(self, sources=SOURCES, interval=REFRESH_INTERVAL_SECONDS,
+                 deadline=DEADLINE_SECONDS, session=None, archive=None):
+        self.sources = list(sources)
+        self.archive = archive
+        self.interval = interval
+        self.deadline = deadline
+        self._session = session
+        self._validators = {}   # url -> {"etag": ..., "last_modified": ...}
+        self._last_good = {}    # source name -> newest items seen from that feed
+        self.seen = SeenIndex()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._items = []
+        self._updated_at = None       # wall clock of the last refresh that confirmed fresh data
+        self._last_attempt_at = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="news-refresher", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh_once()
+            except Exception:
+                # Never let one bad cycle kill the refresher; the snapshot just ages
+                logger.exception("news refresh failed; still serving the last snapshot")
+            if self._stop.wait(self.interval):
+                return
+
+    def refresh_once(self):
+        session = self._session or get_session()
+        futures = []
+        for name, url in self.sources:
+            # Parsing a feed stops at its newest already-known headline
+            stop_keys = frozenset(item['key'] for item in self._last_good.get(name, ())[:1])
+            futures.append((name, url, _executor.submit(
+                _fetch_source, session, name, url, self.deadline,
+                self._validators.get(url), self.seen, stop_keys,
+                MAX_SCAN_ITEMS if self.archive is not None else ITEMS_PER_SOURCE)))
+        done, _ = wait([future for _, _, future in futures], timeout=self.deadline)
+
+        confirmed = False
+        fresh = []
+        for source_name, url, future in futures:
+            if future not in done:
+                FEED_STATS.record_deadline_miss(source_name)
+                continue
+            status, items, validators = future.result()
+            if status == "ok":
+                # Fresh headlines go on top of the ones this feed already delivered
+                previous = self._last_good.get(source_name, [])
+                self._last_good[source_name] = (items + previous)[:ITEMS_PER_SOURCE]
+                for item in items:
+                    self.seen.add(item['key'])
+                fresh.extend(items)
+                self._validators[url] = validators
+                confirmed = True
+            elif status == "not_modified":
+                confirmed = True
+
+        news_items = _merge(self._last_good.get(name, []) for name, _ in self.sources)
+        with self._lock:
+            self._last_attempt_at = time.time()
+            if news_items:
+                self._items = news_items
+            if confirmed:
+                self._updated_at = self._last_attempt_at
+        if self.archive is not None and fresh:
+            self.archive.ingest(fresh)
+
+    def snapshot(self):
+        """Latest headlines plus freshness info; never blocks on the network."""
+        with self._lock:
+            updated_at = self._updated_at
+            return {
+                "items": list(self._items) if self._items else list(UNAVAILABLE),
+                "updated_at": updated_at,
+                "age_seconds": time.time() - updated_at if updated_at is not None else None,
+                "is_stale": updated_at is None or time.time() - updated_at > 2 * self.interval,
+                "loading": self._last_attempt_at is None,
+            }
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def get_refresher():
+    """Process-wide refresher archiving into news_archive.ARCHIVE_FILE, started on first use."""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            import news_archive
+            _refresher = NewsRefresher(archive=news_archive.get_archive()).start()
+        return _refresher
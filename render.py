@@ -0,0 +1,151 @@
+"""
+HTML builders for the dashboard tables.
+
+Every section (schedule, one planner tab, one news column) is assembled from
+shared row templates into a single HTML block, so the page sends one markdown
+element per section instead of one per row. The builders are pure and memoized
+on hashable inputs; the time of day only enters as "which row is live / how
+many rows are over". Within one hora a section is therefore byte-identical
+across reruns.
+
+An unchanged section is not re-sent. Streamlit hashes each element message,
+and the browser reports the hashes it still holds with every rerun. The
+server then sends a known message as a reference to that hash instead of the
+markup, but only for messages of at least global.minCachedMessageSize bytes
+(10 KB by default). The sections are 2-4 KB, so .streamlit/config.toml lowers
+that threshold to 1 KB. Streamlit reads that file from the working directory:
+start the page from the repository root. No Streamlit import here.
+"""
+import functools
+import html
+
+from astrocore import PLANET_STRATEGIES, check_compatibility, get_slot_index
+
+# Templates stay on one line each: a blank or indented line inside a joined
+# markdown block would end the HTML block and render the rest as code.
+SCHEDULE_HEADER = (
+    "<div class='trade-row' style='background:transparent; font-weight:bold; color:#888'>"
+    "<div style='width:16%'>Time (IST)</div><div style='width:10%'>Hora</div>"
+    "<div style='width:10%'>Rahu?</div><div style='width:16%'>Luck ({user_lord})</div>"
+    "<div style='width:16%'>Status</div><div style='width:25%'>Explanation</div></div>"
+)
+SCHEDULE_ROW = (
+    "<div class='{row_class}' style='opacity:{opacity}'>"
+    "<div style='width:16%; font-family:monospace; font-size:1.0rem;'>{start} &nbsp;&nbsp;-&nbsp;&nbsp; {end}</div>"
+    "<div style='width:10%; font-weight:bold; color:#00FFA3'>{planet}</div>"
+    "<div style='width:10%; color:{rahu_col}; font-weight:bold'>{rahu_txt}</div>"
+    "<div style='width:16%'><span class='{luck_badge}'>{luck_txt}</span></div>"
+    "<div style='width:16%; font-weight:bold; color:{text_color}'>{status_text}</div>"
+    "<div style='width:25%; font-size:0.9rem; color:#aaa'>{expl}</div></div>"
+)
+PLANNER_HEADER = (
+    "<div style='display:flex; font-weight:bold; color:#888; padding:5px 10px; border-bottom:1px solid #444; margin-bottom:10px;'>"
+    "<div style='width:25%'>Time</div><div style='width:15%'>Hora</div>"
+    "<div style='width:25%'>Signal</div><div style='width:35%'>Action</div></div>"
+)
+PLANNER_ROW = (
+    "<div style='border-left: 4px solid {color}; background-color: {bg}; padding: 12px; margin-bottom: 8px; border-radius: 4px; display: flex; align-items: center;'>"
+    "<div style='width: 25%; font-family:monospace; font-size:1.0rem;'>{time}</div>"
+    "<div style='width: 15%; font-weight:bold; color: #FFF;'>{hora}</div>"
+    "<div style='width: 25%; font-weight:bold; color: {color};'>{status}</div>"
+    "<div style='width: 35%;'><span style='background:{bg}; color:{color}; padding:4px 8px; border-radius:4px; border:1px solid {color}; font-size:0.9rem; font-weight:bold;'>{action}</span></div></div>"
+)
+NEWS_ITEM = (
+    "<div class='news-item'><a class='news-link' href='{link}' target='_blank'>{title}</a>"
+    "<span class='news-source'>{source}</span></div>"
+)
+
+
+def _time_range(slot):
+    return f"{slot.start.strftime('%I:%M %p')} - {slot.end.strftime('%I:%M %p')}"
+
+
+def live_position(slots, now):
+    """(index of the live slot or -1, number of slots already over) at `now`; now=None means not today."""
+    if now is None:
+        return -1, 0
+    live = next((i for i, slot in enumerate(slots) if slot.start <= now < slot.end), -1)
+    return live, sum(1 for slot in slots if slot.end < now)
+
+
+def _schedule_row(slot, user_lord, is_active, is_past):
+    luck_txt, luck_badge, luck_val = check_compatibility(user_lord, slot.planet)
+
+    # Default State
+    status_text, text_color, expl = "🟢 OPEN", "#00FFA3", "Scalping Zone"
+    row_class, opacity = "trade-row", "1.0"
+
+    # 1. Astro Logic Override
+    if luck_val == 100:
+        status_text, text_color, expl = "🌟 BEST", "#FFD700", f"High Luck with {slot.planet}"
+    elif luck_val == 20:
+        status_text, text_color, expl = "🛑 AVOID", "#FF453A", "Incompatible Planet"
+
+    # 2. Safety Overrides (Rahu / Pre-Open)
+    if slot.is_rahu:
+        status_text, text_color, expl = "⛔ RAHU", "#FF453A", "Trap Zone / High Risk"
+        row_class = "trade-row rahu"
+    if slot.start.hour == 9 and slot.start.minute < 15:
+        status_text, text_color, expl = "🟠 PRE", "#FEAE00", "Pre-Open / Volatility"
+
+    # 3. Active/Past Logic
+    if is_active:
+        status_text = f"🟢 LIVE ({status_text})"
+        row_class += " active"
+    elif is_past:
+        opacity = "0.5"  # Dim past rows
+
+    return SCHEDULE_ROW.format(
+        row_class=row_class, opacity=opacity,
+        start=slot.start.strftime('%I:%M %p'), end=slot.end.strftime('%I:%M %p'), planet=slot.planet,
+        rahu_col="#FF453A" if slot.is_rahu else "#444", rahu_txt="💀 YES" if slot.is_rahu else "-",
+        luck_badge=luck_badge, luck_txt=luck_txt, text_color=text_color, status_text=status_text, expl=expl)
+
+
+@functools.lru_cache(maxsize=256)
+def schedule_table_html(slots, user_lord, live_index=-1, past_count=0):
+    """The whole hora schedule as one HTML block (header row included)."""
+    rows = [SCHEDULE_HEADER.format(user_lord=user_lord)]
+    rows.extend(_schedule_row(slot, user_lord, i == live_index, i < past_count)
+                for i, slot in enumerate(slots))
+    return "<div>" + "".join(rows) + "</div>"
+
+
+def planner_rows(slots, index_name, past_count=0):
+    """Best / danger rows for one index, skipping slots that are already over."""
+    signals = get_slot_index(slots).signals(index_name)
+    rows = []
+    for slot, signal in zip(slots[past_count:], signals[past_count:]):
+        if signal == "best":
+            rows.append({
+                "time": _time_range(slot), "hora": slot.planet,
+                "status": "🌟 HIGH PROBABILITY",
+                "action": f"✅ {PLANET_STRATEGIES[slot.planet]['strat']}",
+                "logic": f"{slot.planet} is Strong for {index_name}",
+                "color": "#00FFA3", "bg": "rgba(0, 255, 163, 0.05)",
+            })
+        elif signal == "worst":
+            rows.append({
+                "time": _time_range(slot), "hora": slot.planet,
+                "status": "🛑 DANGER ZONE", "action": "⛔ NO TRADING",
+                "logic": "Rahu Kaal (Traps)" if slot.is_rahu else f"{slot.planet} is Weak for {index_name}",
+                "color": "#FF453A", "bg": "rgba(255, 69, 58, 0.05)",
+            })
+    return rows
+
+
+@functools.lru_cache(maxsize=256)
+def planner_table_html(slots, index_name, past_count=0):
+    """One planner tab as one HTML block, or None when nothing is left to flag."""
+    rows = planner_rows(slots, index_name, past_count)
+    if not rows:
+        return None
+    return "<div>" + PLANNER_HEADER + "".join(PLANNER_ROW.format(**row) for row in rows) + "</div>"
+
+
+def news_column_html(items):
+    """One column of headlines as one HTML block; feed text is escaped."""
+    return "<div>" + "".join(
+        NEWS_ITEM.format(link=html.escape(item['link'] or "#", quote=True), title=html.escape(item['title']),
+                         source=html.escape(item['source']))
+        for item in items) + "</div>"
@@ -0,0 +1,22 @@
+"""
+Shared test setup.
+
+    python -m pytest -q
+
+The top-level modules (news_feed, news_archive, render) live in the
+repository root, so it goes on sys.path whatever directory pytest runs from.
+Network tests only ever talk to local stub servers. Unless set otherwise, the
+suite runs on the fast analytic engine (no JPL kernel needed) with an empty
+throwaway data directory, so no almanac, excerpt or natal store on this
+machine leaks into the results.
+"""
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("ASTRO_ENGINE", "fast")
+os.environ.setdefault("ASTRO_DATA_DIR", tempfile.mkdtemp(prefix="astro-tests-"))
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
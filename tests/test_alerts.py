@@ -0,0 +1,187 @@
+import json
+import socket
+import datetime
+import threading
+import urllib.error
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from astrocore import TZ_IST
+from astrocore.alerts import AlertScheduler, WebhookSink, SocketSink, day_events
+from astrocore.models import HoraSlot, DaySchedule
+
+DAY = datetime.date(2025, 3, 4)  # A Tuesday
+PLANETS = ("Mars", "Sun", "Venus", "Mercury", "Moon", "Saturn")
+
+
+def _at(hour, minute=0):
+    return TZ_IST.localize(datetime.datetime.combine(DAY, datetime.time(hour, minute)))
+
+
+def synthetic_schedule(noon):
+    """09:00-15:30 in six 65-minute horas, Rahu Kaal 12:15-13:40; no ephemeris needed."""
+    if noon.date() != DAY:
+        return DaySchedule(date=noon.date(), slots=(), day_lord=None, rahu_start=None, rahu_end=None)
+    rahu_start, rahu_end = _at(12, 15), _at(13, 40)
+    starts = [_at(9) + datetime.timedelta(minutes=65 * i) for i in range(len(PLANETS) + 1)]
+    slots = tuple(HoraSlot(start=start, end=end, planet=planet, is_rahu=start < rahu_end and end > rahu_start)
+                  for start, end, planet in zip(starts, starts[1:], PLANETS))
+    return DaySchedule(date=DAY, slots=slots, day_lord="Mars", rahu_start=rahu_start, rahu_end=rahu_end)
+
+
+class FakeClock:
+    """Clock plus wait(): waiting moves time forward (by `oversleep` more on request) instead of sleeping."""
+
+    def __init__(self, now, stop_at):
+        self.now = now
+        self.stop_at = stop_at
+        self.waits = 0
+        self.jumps = {}  # wait number -> timedelta applied after that wait
+
+    def __call__(self):
+        return self.now
+
+    def wait(self, seconds):
+        self.waits += 1
+        self.now += datetime.timedelta(seconds=seconds) + self.jumps.get(self.waits, datetime.timedelta())
+        return self.now > self.stop_at
+
+
+class Receiver:
+    """Local webhook stub: records every JSON body; the first `fail` requests get `status`."""
+
+    def __init__(self):
+        self.events = []
+        self.requests = 0
+        self.fail = 0
+        self.status = 500
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                with lock:
+                    receiver.requests += 1
+                    failing = receiver.fail > 0
+                    if failing:
+                        receiver.fail -= 1
+                    else:
+                        receiver.events.append(json.loads(body))
+                self.send_response(receiver.status if failing else 204)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:%d/hora" % self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def receiver():
+    stub = Receiver()
+    yield stub
+    stub.stop()
+
+
+def _sink(url, sleeps=None):
+    return WebhookSink(url, timeout=2.0, backoff=0.1, sleep=(sleeps.append if sleeps is not None else lambda s: None))
+
+
+def _run_day(sinks, start, clock=None):
+    clock = clock or FakeClock(start, stop_at=_at(16))
+    scheduler = AlertScheduler(sinks, clock=clock, wait=clock.wait, schedule_fn=synthetic_schedule)
+    scheduler.run()
+    return scheduler
+
+
+def _expected(after):
+    return [event for when, event in day_events(synthetic_schedule(_at(12))) if when > after]
+
+
+def test_day_events_follow_the_schedule():
+    kinds = [event["event"] for _, event in day_events(synthetic_schedule(_at(12)))]
+    assert kinds.count("hora") == len(PLANETS)
+    assert kinds[-1] == "session_end"
+    assert kinds.index("rahu_start") < kinds.index("rahu_end")
+    weekend = synthetic_schedule(_at(12) + datetime.timedelta(days=4))
+    assert day_events(weekend) == []
+
+
+def test_every_boundary_is_pushed_once_in_order(receiver, tmp_path):
+    path = str(tmp_path / "alerts.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    listener.bind(path)
+    listener.settimeout(1)
+    try:
+        scheduler = _run_day([_sink(receiver.url), SocketSink(path)], _at(8))
+        datagrams = [json.loads(listener.recv(65536)) for _ in range(len(_expected(_at(8))))]
+    finally:
+        listener.close()
+
+    assert receiver.events == _expected(_at(8))
+    assert datagrams == receiver.events
+    assert scheduler.sent == 2 * len(receiver.events) and scheduler.failures == 0
+
+
+def test_starting_mid_day_skips_past_boundaries(receiver):
+    _run_day([_sink(receiver.url)], _at(11, 30))
+    assert receiver.events == _expected(_at(11, 30))
+    assert receiver.events[0]["time"] > _at(11, 30).isoformat()
+
+
+def test_oversleeping_pushes_the_missed_boundaries_once(receiver):
+    clock = FakeClock(_at(8), stop_at=_at(16))
+    clock.jumps = {2: datetime.timedelta(hours=3)}  # Suspended for 3 h after the first hora
+    _run_day([_sink(receiver.url)], _at(8), clock)
+    assert receiver.events == _expected(_at(8))
+
+
+def test_clock_stepping_back_does_not_repeat_events(receiver):
+    clock = FakeClock(_at(8), stop_at=_at(16))
+    clock.jumps = {3: -datetime.timedelta(hours=2)}  # e.g. an NTP correction
+    _run_day([_sink(receiver.url)], _at(8), clock)
+    times = [(event["event"], event["time"]) for event in receiver.events]
+    assert len(times) == len(set(times))
+    assert receiver.events == _expected(_at(8))
+
+
+def test_webhook_retries_server_errors_with_backoff(receiver):
+    sleeps = []
+    receiver.fail = 2
+    _sink(receiver.url, sleeps).send({"event": "hora"})
+    assert receiver.requests == 3
+    assert receiver.events == [{"event": "hora"}]
+    assert sleeps == [0.1, 0.2]
+
+
+def test_webhook_gives_up_after_its_retries(receiver):
+    sleeps = []
+    receiver.fail = 10
+    with pytest.raises(urllib.error.HTTPError):
+        _sink(receiver.url, sleeps).send({"event": "hora"})
+    assert receiver.requests == 3 and len(sleeps) == 2
+
+
+def test_webhook_does_not_retry_a_rejected_event(receiver):
+    receiver.fail, receiver.status = 1, 400
+    with pytest.raises(urllib.error.HTTPError):
+        _sink(receiver.url).send({"event": "hora"})
+    assert receiver.requests == 1
+
+
+def test_a_dead_sink_never_stops_the_others(receiver):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        dead_url = "http://127.0.0.1:%d/hora" % sock.getsockname()[1]
+    scheduler = _run_day([_sink(dead_url), _sink(receiver.url)], _at(8))
+    assert receiver.events == _expected(_at(8))
+    assert scheduler.failures == len(receiver.events)
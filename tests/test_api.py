@@ -0,0 +1,94 @@
+import json
+import threading
+import http.client
+
+import pytest
+
+from astrocore.api import API_CACHE, DAY_MAX_AGE, ENDPOINTS, make_server
+
+DATE = "2025-03-04"
+
+
+@pytest.fixture(scope="module")
+def server():
+    api = make_server(port=0)
+    threading.Thread(target=api.serve_forever, daemon=True).start()
+    yield api
+    api.shutdown()
+    api.server_close()
+
+
+@pytest.fixture
+def get(server):
+    conn = http.client.HTTPConnection(*server.server_address, timeout=30)
+
+    def request(path, headers=None):
+        conn.request("GET", path, headers=headers or {})
+        response = conn.getresponse()
+        return response, response.read()
+    yield request
+    conn.close()
+
+
+@pytest.mark.parametrize("path", [f"/v1/schedule?date={DATE}", f"/v1/tithi?date={DATE}",
+                                  f"/v1/nakshatra?date={DATE}&lat=27.236&lon=94.1028",
+                                  f"/v1/prediction?date={DATE}", f"/v1/sites?date={DATE}"])
+def test_endpoints_answer_cacheable_json(get, path):
+    response, body = get(path)
+    assert response.status == 200
+    assert response.getheader("Content-Type") == "application/json"
+    assert response.getheader("Cache-Control") == f"public, max-age={DAY_MAX_AGE}"
+    assert response.getheader("ETag").startswith('"')
+    assert json.loads(body)
+
+
+def test_schedule_payload(get):
+    _, body = get(f"/v1/schedule?date={DATE}")
+    payload = json.loads(body)
+    assert payload["date"] == DATE and payload["trading_day"]
+    assert payload["slots"] and all(slot["start"] < slot["end"] for slot in payload["slots"])
+
+
+def test_matching_if_none_match_gets_an_empty_304(get):
+    path = f"/v1/schedule?date={DATE}"
+    first, _ = get(path)
+    etag = first.getheader("ETag")
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response, body = get(path, {"If-None-Match": header})
+        assert response.status == 304, header
+        assert body == b""
+        assert response.getheader("ETag") == etag
+    response, body = get(path, {"If-None-Match": '"stale"'})
+    assert response.status == 200 and body
+
+
+def test_same_request_is_served_from_the_cache(get):
+    path = f"/v1/prediction?date={DATE}&index=NIFTY 50&time=11:00".replace(" ", "%20")
+    first, first_body = get(path)
+    hits = API_CACHE.stats()["hits"]
+    second, second_body = get(path)
+    assert API_CACHE.stats()["hits"] == hits + 1
+    assert second_body == first_body and second.getheader("ETag") == first.getheader("ETag")
+    assert list(json.loads(first_body)["predictions"]) == ["NIFTY 50"]
+
+
+@pytest.mark.parametrize("path", ["/v1/schedule?date=04-03-2025", "/v1/prediction?date=2025-03-04&index=DOW",
+                                  "/v1/prediction?date=2025-03-04&time=late",
+                                  "/v1/nakshatra?date=2025-03-04&lat=north"])
+def test_bad_parameters_are_a_400(get, path):
+    response, body = get(path)
+    assert response.status == 400
+    assert response.getheader("Cache-Control") == "no-store"
+    assert json.loads(body)["error"]
+
+
+def test_unknown_endpoint_is_a_404_listing_the_endpoints(get):
+    response, body = get("/v1/horoscope")
+    assert response.status == 404
+    assert json.loads(body)["endpoints"] == sorted(ENDPOINTS)
+
+
+def test_keep_alive_serves_many_requests_on_one_connection(get):
+    for _ in range(3):
+        response, _ = get(f"/v1/tithi?date={DATE}")
+        assert response.status == 200 and not response.will_close
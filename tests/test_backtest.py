@@ -0,0 +1,100 @@
+import math
+import datetime
+
+import numpy as np
+import pytest
+
+from astrocore import TZ_IST
+from astrocore.backtest import (Bars, HoraIntervals, assign_horas, bar_returns, hora_intervals, load_bars,
+                                run_backtest, sweep)
+from astrocore.schedule import HORA_FIXED_ORDER
+
+MIDNIGHT = TZ_IST.localize(datetime.datetime(2025, 3, 4)).timestamp()
+H, M = 3600.0, 60.0
+JUPITER, SATURN = HORA_FIXED_ORDER.index("Jupiter"), HORA_FIXED_ORDER.index("Saturn")
+
+# 09:00 Jupiter, 10:00 Saturn, 11:00 Jupiter inside Rahu Kaal
+INTERVALS = HoraIntervals(start=MIDNIGHT + np.array([9, 10, 11]) * H, end=MIDNIGHT + np.array([10, 11, 12]) * H,
+                          planet=np.array([JUPITER, SATURN, JUPITER]), is_rahu=np.array([False, False, True]))
+BARS = Bars(ts=MIDNIGHT + np.array([9 * H, 9 * H + 30 * M, 10 * H, 11 * H + 10 * M, 12 * H + 5 * M]),
+            open=np.array([100.0, 101.0, 102.0, 101.0, 103.0]),
+            close=np.array([101.0, 102.0, 101.0, 103.0, 104.0]))
+H0, H1, H2 = math.log(102 / 100), math.log(101 / 102), math.log(103 / 101)
+
+
+def test_bar_returns_start_each_day_from_its_open():
+    bars = Bars(ts=MIDNIGHT + np.array([9 * H, 10 * H, 33 * H]), open=np.array([100.0, 0, 200.0]),
+                close=np.array([110.0, 121.0, 220.0]))
+    assert bar_returns(bars) == pytest.approx(np.log([1.1, 1.1, 1.1]))
+
+
+def test_bars_join_the_hora_they_fall_in():
+    assert assign_horas(BARS, INTERVALS).tolist() == [0, 0, 1, 2, -1]
+    assert assign_horas(BARS, INTERVALS, entry_delay_minutes=15).tolist() == [-1, 0, -1, -1, -1]
+    early = Bars(ts=np.array([MIDNIGHT + 8 * H]), open=np.ones(1), close=np.ones(1))
+    assert assign_horas(early, INTERVALS).tolist() == [-1]
+
+
+def test_stats_match_hand_computed_returns():
+    result = run_backtest(BARS, INTERVALS, "NIFTY 50", cost_bps=2.0)
+    assert (result["bars"], result["horas"]) == (4, 3)
+
+    jupiter, saturn = result["by_planet"]["Jupiter"], result["by_planet"]["Saturn"]
+    assert jupiter["horas"] == 2 and jupiter["total_return"] == pytest.approx(H0 + H2)
+    assert jupiter["mean_return"] == pytest.approx((H0 + H2) / 2)
+    assert jupiter["std"] == pytest.approx(abs(H0 - H2) / 2)
+    assert jupiter["win_rate"] == 1.0
+    assert saturn["horas"] == 1 and saturn["win_rate"] == 0.0 and saturn["mean_abs_return"] == pytest.approx(-H1)
+    assert result["by_planet"]["Venus"]["horas"] == 0
+
+    assert result["rahu"]["clear"]["total_return"] == pytest.approx(H0 + H1)
+    assert result["rahu"]["rahu"]["total_return"] == pytest.approx(H2)
+    # Jupiter is NIFTY's best planet except inside Rahu Kaal; Saturn is its worst
+    assert result["signals"]["best"]["total_return"] == pytest.approx(H0)
+    assert result["signals"]["worst"]["horas"] == 2 and result["signals"]["neutral"]["horas"] == 0
+
+    assert result["by_strategy"]["BUY CALL"]["net_pnl"] == pytest.approx(H0 + H2 - 2 * 2e-4)
+    assert result["by_strategy"]["SELL OPT"]["net_pnl"] == 0.0  # No direction, no trade, no cost
+    assert result["best_signal_pnl"] == pytest.approx(H0 - 2e-4)
+
+
+def test_entry_delay_drops_early_bars():
+    result = run_backtest(BARS, INTERVALS, "NIFTY 50", entry_delay_minutes=15)
+    assert (result["bars"], result["horas"]) == (1, 1)
+    assert result["by_planet"]["Jupiter"]["total_return"] == pytest.approx(math.log(102 / 101))
+
+
+def _write_bars(path, rows, timestamps=False):
+    with open(path, "w") as fh:
+        fh.write("timestamp,open,high,low,close\n" if timestamps else "Datetime, Open,High,Low,Close\n")
+        for ts, o, c in rows:
+            stamp = ts if timestamps else datetime.datetime.fromtimestamp(ts, TZ_IST).strftime("%Y-%m-%d %H:%M:%S")
+            fh.write(f"{stamp},{o},{max(o, c)},{min(o, c)},{c}\n")
+
+
+def test_load_bars_parses_and_sorts_both_time_formats(tmp_path):
+    rows = [(int(t), o, c) for t, o, c in zip(BARS.ts, BARS.open, BARS.close)][::-1]
+    _write_bars(tmp_path / "wall.csv", rows)
+    _write_bars(tmp_path / "posix.csv", rows, timestamps=True)
+    for name in ("wall.csv", "posix.csv"):
+        bars = load_bars(tmp_path / name)
+        assert bars.ts.tolist() == BARS.ts.tolist()
+        assert bars.open.tolist() == BARS.open.tolist() and bars.close.tolist() == BARS.close.tolist()
+    _write_bars(tmp_path / "one.csv", rows[:1])
+    assert len(load_bars(tmp_path / "one.csv")) == 1
+
+
+def test_sweep_matches_single_runs(tmp_path):
+    starts = hora_intervals(datetime.date(2025, 3, 4), datetime.date(2025, 3, 5)).start
+    rng = np.random.default_rng(0)
+    ts = np.sort(np.concatenate([start + np.arange(0, 3600, 300) for start in starts]))
+    close = 100 + np.cumsum(rng.normal(0, 0.1, len(ts)))
+    rows = [(int(t), c - 0.05, c) for t, c in zip(ts, close)]
+    _write_bars(tmp_path / "nifty.csv", rows, timestamps=True)
+    path = str(tmp_path / "nifty.csv")
+
+    results = sweep({"NIFTY 50": path}, delays=(0, 10), costs_bps=(0.0,), workers=2)
+    bars, intervals = load_bars(path), hora_intervals(datetime.date(2025, 3, 4), datetime.date(2025, 3, 5))
+    for result, delay in zip(results, (0, 10)):
+        assert result == run_backtest(bars, intervals, "NIFTY 50", entry_delay_minutes=delay)
+    assert results[0]["horas"] == len(intervals)
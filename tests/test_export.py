@@ -0,0 +1,107 @@
+import csv
+import io
+import datetime
+
+import pytest
+
+from astrocore import TZ_IST
+from astrocore.export import (KINDS, CSV_COLUMNS, _fold, chunk_events, export_events, export_text, iter_csv,
+                              iter_ics, month_chunks)
+from astrocore.models import CalendarEvent
+
+FIRST, LAST = datetime.date(2025, 1, 20), datetime.date(2025, 2, 10)
+
+
+@pytest.fixture(scope="module")
+def events():
+    return list(export_events(FIRST, LAST, workers=1))
+
+
+def test_month_chunks_cover_the_range_across_years():
+    assert list(month_chunks(datetime.date(2023, 12, 15), datetime.date(2024, 3, 1))) == [
+        (datetime.date(2023, 12, 15), datetime.date(2023, 12, 31)),
+        (datetime.date(2024, 1, 1), datetime.date(2024, 1, 31)),
+        (datetime.date(2024, 2, 1), datetime.date(2024, 2, 29)),
+        (datetime.date(2024, 3, 1), datetime.date(2024, 3, 1)),
+    ]
+    assert list(month_chunks(FIRST, FIRST)) == [(FIRST, FIRST)]
+
+
+def _unfold(text):
+    return text.replace("\r\n ", "")
+
+
+@pytest.mark.parametrize("line", [
+    "SUMMARY:short",
+    "DESCRIPTION:" + "x" * 63,                       # exactly 75 octets
+    "DESCRIPTION:" + "NO TRADING | Rahu Kaal (Traps) " * 8,
+    "SUMMARY:" + "ॐ" * 60,                            # 3-byte UTF-8 characters
+    "SUMMARY:a" + "🕉️" * 40,                          # 4- and 3-byte sequences, shifted by one octet
+])
+def test_fold_keeps_lines_within_75_octets_without_splitting_characters(line):
+    folded = _fold(line)
+    assert folded.endswith("\r\n") and _unfold(folded) == line + "\r\n"
+    physical = folded[:-2].split("\r\n")
+    assert all(len(part.encode("utf-8")) <= 75 for part in physical)
+    assert all(part.startswith(" ") for part in physical[1:])
+    if len(line.encode("utf-8")) <= 75:
+        assert len(physical) == 1
+
+
+def test_running_tithi_only_in_the_first_chunk():
+    start = TZ_IST.localize(datetime.datetime.combine(FIRST, datetime.time()))
+    without = chunk_events(FIRST, FIRST + datetime.timedelta(days=2), kinds=("tithi",))
+    with_running = chunk_events(FIRST, FIRST + datetime.timedelta(days=2), kinds=("tithi",),
+                                include_running_tithi=True)
+    assert all(event.start >= start for event in without)
+    assert with_running[0].start < start < with_running[0].end
+    assert with_running[1:] == without
+
+
+def test_tithis_join_up_across_month_chunks(events):
+    tithis = [event for event in events if event.kind == "tithi"]
+    assert tithis[0].start < TZ_IST.localize(datetime.datetime.combine(FIRST, datetime.time()))
+    assert len({event.start for event in tithis}) == len(tithis)
+    assert all(a.end == b.start for a, b in zip(tithis, tithis[1:]))
+
+
+def test_events_are_time_ordered_weekdays_only(events):
+    assert [(e.start, KINDS.index(e.kind)) for e in events] == sorted((e.start, KINDS.index(e.kind)) for e in events)
+    market = [event for event in events if event.kind != "tithi"]
+    assert market and all(event.start.weekday() <= 4 for event in market)
+    assert {event.kind for event in events} == set(KINDS)
+
+
+def test_csv_has_one_row_per_event(events):
+    rows = list(csv.reader(io.StringIO("".join(export_text(FIRST, LAST, "csv", workers=1)))))
+    assert tuple(rows[0]) == CSV_COLUMNS
+    assert len(rows) - 1 == len(events)
+    first = events[0]
+    assert rows[1] == [first.start.date().isoformat(), first.kind, first.start.isoformat(timespec="seconds"),
+                       first.end.isoformat(timespec="seconds"), first.title, first.index or "", first.detail]
+
+
+def test_csv_chunks_join_to_the_whole_file(events):
+    many = events * 20  # Well past one flush
+    chunks = list(iter_csv(many))
+    assert len(chunks) > 1
+    assert len(list(csv.reader(io.StringIO("".join(chunks))))) == len(many) + 1
+
+
+def test_ics_is_one_calendar_with_a_vevent_per_event(events):
+    text = "".join(export_text(FIRST, LAST, "ics", workers=1))
+    lines = text.split("\r\n")
+    assert lines[0] == "BEGIN:VCALENDAR" and lines[-2] == "END:VCALENDAR" and lines[-1] == ""
+    assert text.count("BEGIN:VEVENT\r\n") == text.count("END:VEVENT\r\n") == len(events)
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+
+
+def test_ics_escapes_text_values():
+    start = TZ_IST.localize(datetime.datetime(2025, 3, 4, 9, 15))
+    event = CalendarEvent(kind="best", start=start, end=start + datetime.timedelta(hours=1),
+                          title="NIFTY 50: BEST, maybe; ok", index="NIFTY 50", detail="line\\one\ntwo")
+    text = _unfold("".join(iter_ics([event])))
+    assert "SUMMARY:NIFTY 50: BEST\\, maybe\\; ok\r\n" in text
+    assert "DESCRIPTION:line\\\\one\\ntwo\r\n" in text
+    assert "UID:best-NIFTY_50-20250304T034500Z@astrocore\r\n" in text
+    assert "DTSTART:20250304T034500Z\r\nDTEND:20250304T044500Z\r\n" in text
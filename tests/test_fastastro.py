@@ -0,0 +1,61 @@
+import os
+import datetime
+
+import numpy as np
+import pytest
+
+from astrocore import TZ_IST, fastastro
+from astrocore.config import NSE_LAT, NSE_LON, ASSAM_PLACES
+from astrocore.ephemeris import get_timescale
+
+skyfield = pytest.importorskip("skyfield")
+from skyfield import almanac  # noqa: E402
+from skyfield.api import wgs84  # noqa: E402
+from skyfield.jpllib import SpiceKernel  # noqa: E402
+
+# skyfield's own test excerpt of DE430 (Moon and Earth cover about 2015-02-27 to 03-06)
+KERNEL_FILE = os.path.join(os.path.dirname(skyfield.__file__), "tests", "data", "de430-2015-03-02.bsp")
+FIRST, DAYS = datetime.date(2015, 2, 28), 5
+SITES = [(NSE_LAT, NSE_LON), ASSAM_PLACES["North Lakhimpur"], ASSAM_PLACES["Guwahati"]]
+
+
+@pytest.fixture(scope="module")
+def kernel():
+    if not os.path.exists(KERNEL_FILE):
+        pytest.skip("skyfield's DE430 test kernel is not installed")
+    eph = SpiceKernel(KERNEL_FILE)
+    yield eph
+    eph.close()
+
+
+def _wrap(delta):
+    return (delta + 180.0) % 360.0 - 180.0
+
+
+def test_moon_and_sun_longitudes_match_the_jpl_kernel(kernel):
+    ts = get_timescale()
+    start = TZ_IST.localize(datetime.datetime.combine(FIRST, datetime.time())).timestamp()
+    t = ts.from_datetimes([datetime.datetime.fromtimestamp(s, TZ_IST)
+                           for s in start + np.linspace(0, (DAYS - 1) * 86400.0, 500)])
+    for lat, lon in SITES:
+        at = (kernel["earth"] + wgs84.latlon(lat, lon)).at(t)
+        for body, fast, tolerance in (("moon", fastastro.moon_longitude, 0.003),
+                                      ("sun", fastastro.sun_longitude, 0.005)):
+            _, lon_ecl, _ = at.observe(kernel[body]).apparent().ecliptic_latlon(epoch="date")
+            error = np.abs(_wrap(fast(t.tt, lat, lon) - lon_ecl.degrees))
+            assert error.max() < tolerance, (body, lat, lon, error.max())
+
+
+def test_sunrise_and_sunset_match_the_jpl_kernel(kernel):
+    ts = get_timescale()
+    rise, sets = fastastro.find_sun_events(FIRST, DAYS, [lat for lat, _ in SITES], [lon for _, lon in SITES])
+    t0 = ts.from_datetime(TZ_IST.localize(datetime.datetime.combine(FIRST, datetime.time())))
+    t1 = ts.from_datetime(TZ_IST.localize(datetime.datetime.combine(FIRST + datetime.timedelta(days=DAYS),
+                                                                    datetime.time())))
+    for site, (lat, lon) in enumerate(SITES):
+        times, events = almanac.find_discrete(t0, t1, almanac.sunrise_sunset(kernel, wgs84.latlon(lat, lon)))
+        is_rise = events.astype(bool)
+        reference = np.array([dt.timestamp() for dt in times.utc_datetime()])
+        assert len(reference) == 2 * DAYS
+        assert np.abs(rise[site] - reference[is_rise]).max() < 2.0
+        assert np.abs(sets[site] - reference[~is_rise]).max() < 2.0
@@ -0,0 +1,30 @@
+import sqlite3
+import datetime
+
+from astrocore.natal import VERSION, NatalStore
+
+BIRTH = (datetime.date(1984, 9, 6), datetime.time(0, 37), 27.236, 94.1028)
+
+
+def test_profiles_persist_across_opens(tmp_path):
+    path = str(tmp_path / "natal.sqlite3")
+    profile = NatalStore(path).get(*BIRTH)
+    reopened = NatalStore(path)
+    assert len(reopened) == 1
+    assert reopened.get(*BIRTH) == profile
+
+
+def test_profiles_from_another_version_are_recomputed(tmp_path):
+    path = str(tmp_path / "natal.sqlite3")
+    profile = NatalStore(path).get(*BIRTH)
+    with sqlite3.connect(path) as db:
+        # A profile left by version 1, on the old ayanamsa
+        db.execute("UPDATE natal SET moon_deg = moon_deg + 0.9, nakshatra = 'Stale'")
+        db.execute("PRAGMA user_version = 1")
+
+    store = NatalStore(path)
+    assert len(store) == 0
+    assert store.get(*BIRTH) == profile
+    with sqlite3.connect(path) as db:
+        assert db.execute("PRAGMA user_version").fetchone()[0] == VERSION
+        assert db.execute("SELECT nakshatra FROM natal").fetchall() == [(profile.nakshatra,)]
@@ -0,0 +1,86 @@
+import os
+import datetime
+
+import pytest
+
+from astrocore.config import TZ_IST, DATA_DIR
+import news_archive
+from news_archive import NewsArchive
+
+OPEN = TZ_IST.localize(datetime.datetime(2025, 3, 4, 9, 15)).timestamp()
+MINUTE = 60.0
+
+
+def item(title, minutes, source="ET Markets", guid=None, link=None):
+    return {"source": source, "title": title, "guid": guid, "link": link, "published": OPEN + minutes * MINUTE}
+
+
+@pytest.fixture
+def archive():
+    archive = NewsArchive(None)
+    archive.ingest([
+        item("RBI holds repo rate steady", 0, guid="rbi-1"),
+        item("Sensex rallies 500 points on banking stocks", 30, link="https://example.com/sensex"),
+        item("Banking index hits record high", 90, source="Moneycontrol"),
+        item("RBI governor flags inflation risks", 400, guid="rbi-2"),
+    ], now=OPEN)
+    yield archive
+    archive.close()
+
+
+def titles(rows):
+    return [row["title"] for row in rows]
+
+
+def test_default_file_lives_in_the_data_dir():
+    assert os.path.dirname(news_archive.ARCHIVE_FILE) == DATA_DIR
+
+
+def test_reingesting_the_same_items_is_a_no_op(archive):
+    again = [item("RBI holds repo rate steady (updated)", 5, guid="rbi-1"),
+             item("Sensex rallies 500 points", 31, link="https://example.com/sensex"),
+             item("Banking index hits record high", 90, source="Moneycontrol")]
+    assert archive.ingest(again, now=OPEN + 3600) == 0
+    assert len(archive) == 4
+    assert "RBI holds repo rate steady" in titles(archive.search("repo"))
+    assert archive.ingest([item("Nifty ends flat", 380)], now=OPEN) == 1
+    assert archive.ingest([], now=OPEN) == 0
+
+
+def test_items_without_a_pub_date_are_timed_when_first_seen(tmp_path):
+    archive = NewsArchive(str(tmp_path / "news.sqlite3"))
+    archive.ingest([{"source": "Feed", "title": "Undated headline", "guid": "u-1"}], now=OPEN + 45 * MINUTE)
+    assert titles(archive.window(OPEN + 45 * MINUTE, OPEN + 46 * MINUTE)) == ["Undated headline"]
+    archive.close()
+
+
+def test_window_is_half_open_oldest_first(archive):
+    assert titles(archive.window(OPEN, OPEN + 90 * MINUTE)) == [
+        "RBI holds repo rate steady", "Sensex rallies 500 points on banking stocks"]
+    start = datetime.datetime.fromtimestamp(OPEN + 30 * MINUTE, TZ_IST)
+    assert titles(archive.window(start, start + datetime.timedelta(hours=6), limit=1)) == [
+        "Sensex rallies 500 points on banking stocks"]
+    assert titles(archive.window(OPEN, OPEN + 500 * MINUTE, source="Moneycontrol")) == [
+        "Banking index hits record high"]
+
+
+def test_search_matches_every_word_newest_first(archive):
+    assert titles(archive.search("rbi")) == ["RBI governor flags inflation risks", "RBI holds repo rate steady"]
+    assert titles(archive.search("rbi inflation")) == ["RBI governor flags inflation risks"]
+    assert titles(archive.search("bank")) == ["Banking index hits record high",
+                                              "Sensex rallies 500 points on banking stocks"]
+    assert archive.search('"') == [] and archive.search("   ") == []
+
+
+def test_search_within_a_window(archive):
+    assert titles(archive.search("rbi", OPEN, OPEN + 60 * MINUTE)) == ["RBI holds repo rate steady"]
+    assert titles(archive.search("bank", OPEN + 60 * MINUTE)) == ["Banking index hits record high"]
+    assert archive.search("rbi", OPEN + 1000 * MINUTE, OPEN + 1100 * MINUTE) == []
+
+
+def test_stats(archive):
+    stats = archive.stats()
+    assert stats["items"] == 4
+    assert stats["sources"] == {"ET Markets": 3, "Moneycontrol": 1}
+    assert stats["first"].timestamp() == OPEN and stats["last"].timestamp() == OPEN + 400 * MINUTE
+    assert NewsArchive(None).stats() == {"items": 0, "sources": {}, "first": None, "last": None}
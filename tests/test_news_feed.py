@@ -0,0 +1,128 @@
+import time
+import socket
+
+import pytest
+
+import news_feed
+from benchmarks.stub_feeds import StubFeedServer
+
+
+@pytest.fixture
+def feeds():
+    with StubFeedServer(feeds=4, items=10, latency=0.2) as server:
+        yield server
+
+
+def _renamed(server, prefix):
+    return [(f"{prefix} {name}", url) for name, url in server.sources]
+
+
+def _closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/feed/0"
+
+
+def _stats(name):
+    return news_feed.FEED_STATS.snapshot().get(name, {"requests": 0, "errors": 0, "not_modified": 0,
+                                                      "deadline_misses": 0})
+
+
+def test_sources_are_fetched_concurrently(feeds):
+    sources = _renamed(feeds, "concurrent")
+    started = time.perf_counter()
+    items = news_feed.fetch_real_news(sources, deadline=3.0)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 4 * 0.2  # Sequential fetches would take at least 0.8 s
+    assert {item["source"] for item in items} == {name for name, _ in sources}
+    assert len(items) == len(sources) * news_feed.ITEMS_PER_SOURCE
+
+
+def test_deadline_returns_what_arrived_and_counts_the_miss(feeds):
+    with StubFeedServer(feeds=1, items=10, latency=2.0) as slow:
+        fast_sources, slow_sources = _renamed(feeds, "deadline"), _renamed(slow, "slow")
+        misses_before = _stats(slow_sources[0][0])["deadline_misses"]
+        started = time.perf_counter()
+        items = news_feed.fetch_real_news(fast_sources + slow_sources, deadline=0.8)
+        elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.5
+    assert {item["source"] for item in items} == {name for name, _ in fast_sources}
+    assert _stats(slow_sources[0][0])["deadline_misses"] == misses_before + 1
+
+
+def test_failing_sources_are_recorded_and_skipped(feeds):
+    good = _renamed(feeds, "failing")[:1]
+    port = feeds.sources[0][1].split(":")[2].split("/")[0]
+    bad = [("failing 404", f"http://127.0.0.1:{port}/missing"), ("failing refused", _closed_port_url())]
+    before = {name: _stats(name)["errors"] for name, _ in bad}
+
+    items = news_feed.fetch_real_news(good + bad, deadline=3.0)
+
+    assert {item["source"] for item in items} == {good[0][0]}
+    for name, _ in bad:
+        stats = _stats(name)
+        assert stats["errors"] == before[name] + 1
+        assert stats["last_error"]
+
+
+def test_all_sources_failing_returns_the_placeholder():
+    items = news_feed.fetch_real_news([("unreachable", _closed_port_url())], deadline=2.0)
+    assert items == news_feed.UNAVAILABLE
+
+
+def test_refresher_revalidates_with_conditional_gets(feeds):
+    sources = _renamed(feeds, "refresher")
+    refresher = news_feed.NewsRefresher(sources, deadline=3.0)
+    assert refresher.snapshot()["loading"]
+
+    refresher.refresh_once()
+    first = refresher.snapshot()
+    not_modified_before = _stats(sources[0][0])["not_modified"]
+    refresher.refresh_once()
+    second = refresher.snapshot()
+
+    assert not first["loading"] and not first["is_stale"]
+    assert len(first["items"]) == len(sources) * news_feed.ITEMS_PER_SOURCE
+    assert second["items"] == first["items"]
+    assert _stats(sources[0][0])["not_modified"] == not_modified_before + 1
+
+
+def test_refresher_keeps_serving_the_last_good_items(feeds):
+    sources = _renamed(feeds, "stale")
+    refresher = news_feed.NewsRefresher(sources, deadline=3.0)
+    refresher.refresh_once()
+    good = refresher.snapshot()["items"]
+
+    feeds.stop()
+    refresher.refresh_once()
+    snapshot = refresher.snapshot()
+
+    assert snapshot["items"] == good
+    assert snapshot["age_seconds"] is not None
+
+
+def test_refresher_logs_a_failed_cycle_and_keeps_running(feeds, monkeypatch, caplog):
+    refresher = news_feed.NewsRefresher(_renamed(feeds, "broken"), interval=0.05, deadline=3.0)
+    refresher.refresh_once()
+    good = refresher.snapshot()["items"]
+    attempts = []
+
+    def broken_refresh():
+        attempts.append(time.perf_counter())
+        raise ValueError("parser broke")
+    monkeypatch.setattr(refresher, "refresh_once", broken_refresh)
+
+    with caplog.at_level("ERROR", logger="news_feed"):
+        refresher.start()
+        deadline = time.perf_counter() + 5.0
+        while len(attempts) < 2 and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        refresher.stop(timeout=5.0)
+
+    assert len(attempts) >= 2  # The first failure did not end the loop
+    failures = [record for record in caplog.records if record.name == "news_feed"]
+    assert failures and "parser broke" in failures[0].exc_text
+    assert refresher.snapshot()["items"] == good
@@ -0,0 +1,14 @@
+import numpy as np
+
+from astrocore.ephemeris import get_timescale
+from astrocore.panchang import _use_iau2000b
+
+
+def test_use_iau2000b_leaves_the_callers_time_alone():
+    t = get_timescale().tt_jd(np.linspace(2460738.5, 2460739.5, 5))
+    shortcut = _use_iau2000b(t)
+    assert shortcut is not t
+    assert "_nutation_angles_radians" not in vars(t)
+    assert "_nutation_angles_radians" in vars(shortcut)
+    assert np.array_equal(shortcut.tt, t.tt)
+    assert _use_iau2000b(shortcut) is shortcut  # Already carries a nutation: kept as it is
@@ -0,0 +1,57 @@
+import json
+import logging
+import threading
+
+import pytest
+
+from astrocore import perf
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(perf, "ENABLED", True)
+    monkeypatch.setattr(perf, "_totals", {})
+
+
+def test_only_low_cardinality_tags_become_labels(enabled, caplog):
+    with caplog.at_level(logging.INFO, logger="astrocore.perf"):
+        for days in range(1, 6):
+            with perf.span("schedule.sunrise_search", days=days, kind="batch"):
+                pass
+    assert len(perf._totals) == 1
+    text = perf.prometheus_text()
+    assert 'astro_span_count_total{span="schedule.sunrise_search",kind="batch"} 5' in text
+    assert "days" not in text
+    # The JSON log keeps every tag
+    logged = [json.loads(r.getMessage()) for r in caplog.records if r.name == "astrocore.perf"]
+    assert [entry["days"] for entry in logged] == [1, 2, 3, 4, 5]
+
+
+def test_errors_are_labelled(enabled):
+    with pytest.raises(KeyError):
+        with perf.span("cache", kind="schedule"):
+            raise KeyError("boom")
+    assert 'astro_span_count_total{span="cache",error="KeyError",kind="schedule"} 1' in perf.prometheus_text()
+
+
+def test_concurrent_writers_never_collide(enabled, tmp_path):
+    path = str(tmp_path / "astro.prom")
+    with perf.span("page.news"):
+        pass
+    errors = []
+
+    def rerun():
+        try:
+            for _ in range(50):
+                perf.write_prometheus(path)
+        except OSError as exc:
+            errors.append(exc)
+    threads = [threading.Thread(target=rerun) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert 'span="page.news"' in open(path).read()
+    assert [p.name for p in tmp_path.iterdir()] == ["astro.prom"]
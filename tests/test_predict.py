@@ -0,0 +1,81 @@
+import datetime
+
+import pytest
+
+from astrocore import TZ_IST, get_market_schedule
+from astrocore.models import HoraSlot
+from astrocore.predict import INDEX_PREFS, INDICES, PLANET_STRATEGIES, get_astro_prediction, get_slot_index
+
+
+def linear_prediction(schedule, index_name, is_today_view, now_reference):
+    """The original two linear scans over the day's slots, kept as the reference."""
+    prefs = INDEX_PREFS.get(index_name)
+    best_t, worst_t, strategy, reason = "None", "None", "WAIT", "Neutral Market"
+    for slot in schedule:
+        check_time = now_reference if is_today_view else slot.start - datetime.timedelta(minutes=1)
+        if slot.end > check_time and slot.planet in prefs['best']:
+            best_t = slot.start.strftime('%I:%M')
+            strat_info = PLANET_STRATEGIES.get(slot.planet)
+            strategy, reason = strat_info['strat'], strat_info['reason']
+            break
+    for slot in schedule:
+        check_time = now_reference if is_today_view else slot.start - datetime.timedelta(minutes=1)
+        if slot.end > check_time and (slot.planet in prefs['worst'] or slot.is_rahu):
+            worst_t = slot.start.strftime('%I:%M')
+            break
+    return best_t, worst_t, strategy, reason
+
+
+def synthetic_day(planets, rahu):
+    start = TZ_IST.localize(datetime.datetime(2025, 3, 4, 8, 40))
+    hora = datetime.timedelta(minutes=57, seconds=13)
+    return tuple(HoraSlot(start=start + i * hora, end=start + (i + 1) * hora, planet=planet, is_rahu=i in rahu)
+                 for i, planet in enumerate(planets))
+
+
+SCHEDULES = [
+    synthetic_day(["Mars", "Sun", "Venus", "Mercury", "Moon", "Saturn", "Jupiter"], rahu={5, 6}),
+    synthetic_day(["Moon", "Moon", "Venus"], rahu=set()),       # No best, no worst for NIFTY
+    synthetic_day(["Jupiter", "Saturn"], rahu={0}),             # Best planet inside Rahu Kaal
+    (),
+] + [get_market_schedule(TZ_IST.localize(datetime.datetime(2025, 3, day, 10))).slots for day in (3, 4, 5, 6, 7)]
+
+
+def probe_times(slots):
+    """Before the day, every slot edge exactly, mid-slot, and after the last slot."""
+    if not slots:
+        return [TZ_IST.localize(datetime.datetime(2025, 3, 4, 12))]
+    second = datetime.timedelta(seconds=1)
+    times = [slots[0].start - datetime.timedelta(hours=1), slots[-1].end + second]
+    for slot in slots:
+        times += [slot.start, slot.end, slot.end - second, slot.start + (slot.end - slot.start) / 2]
+    return times
+
+
+@pytest.mark.parametrize("schedule", SCHEDULES)
+@pytest.mark.parametrize("index_name", INDICES)
+def test_prediction_matches_the_linear_scan(schedule, index_name):
+    for now in probe_times(schedule):
+        for is_today_view in (True, False):
+            assert get_astro_prediction(schedule, index_name, is_today_view, now) == \
+                linear_prediction(schedule, index_name, is_today_view, now), (now, is_today_view)
+    # Lists (the page's schedule) give the same answers as tuples
+    now = probe_times(schedule)[0]
+    assert get_astro_prediction(list(schedule), index_name, True, now) == \
+        linear_prediction(schedule, index_name, True, now)
+
+
+@pytest.mark.parametrize("schedule", SCHEDULES)
+@pytest.mark.parametrize("index_name", INDICES)
+def test_planner_signals(schedule, index_name):
+    prefs = INDEX_PREFS[index_name]
+    expected = tuple("best" if slot.planet in prefs["best"] and not slot.is_rahu
+                     else "worst" if slot.planet in prefs["worst"] or slot.is_rahu else None
+                     for slot in schedule)
+    assert get_slot_index(schedule).signals(index_name) == expected
+
+
+def test_equal_schedules_share_an_index_and_others_do_not():
+    first, second = SCHEDULES[0], tuple(list(SCHEDULES[0]))
+    assert first is not second and get_slot_index(first) is get_slot_index(second)
+    assert get_slot_index(SCHEDULES[4]) is not get_slot_index(SCHEDULES[5])
@@ -0,0 +1,27 @@
+import datetime
+
+import numpy as np
+
+from astrocore.schedule import calculate_schedule_batch, rahu_overlap
+
+HORA = 3600.0
+
+
+def test_horas_touching_rahu_kaal_are_not_rahu():
+    rahu_start, rahu_end = 6 * HORA, 7.5 * HORA
+    starts = np.array([5, 6, 7, 7.5]) * HORA
+    ends = starts + HORA
+    assert rahu_overlap(starts, ends, rahu_start, rahu_end).tolist() == [False, True, True, False]
+    # Rounding noise on a shared edge is not an overlap; a real one always is
+    assert not rahu_overlap(5 * HORA, 6 * HORA + 1e-6, rahu_start, rahu_end)
+    assert not rahu_overlap(7.5 * HORA - 1e-6, 8.5 * HORA, rahu_start, rahu_end)
+    assert rahu_overlap(5 * HORA, 6 * HORA + 2.0, rahu_start, rahu_end)
+
+
+def test_rahu_kaal_sharing_a_hora_edge():
+    # Thursday: Rahu Kaal is the 5th eighth of the day, [6/12, 7.5/12], so it
+    # starts exactly where hora 6 starts and ends half-way through hora 7
+    batch = calculate_schedule_batch(datetime.date(2025, 3, 6), datetime.date(2025, 3, 6))
+    assert batch.weekday[0] == 3
+    assert abs(batch.rahu_start[0] - batch.hora_bounds[0, 6]) < 1e-3
+    assert np.flatnonzero(batch.is_rahu[0]).tolist() == [6, 7]
@@ -0,0 +1,61 @@
+import datetime
+
+import numpy as np
+
+from astrocore import TZ_IST
+from astrocore.config import SESSIONS
+from astrocore.schedule import HORA_FIXED_ORDER, WEEKDAY_LORDS, calculate_schedule_batch, schedule_from_batch
+from astrocore.sites import DEFAULT_SITES, calculate_site_batch, get_site_schedules, site_schedule
+
+FIRST, LAST = datetime.date(2025, 3, 4), datetime.date(2025, 3, 6)
+NSE, MCX, GIFT = DEFAULT_SITES[:3]
+
+
+def test_each_date_has_25_contiguous_horas_from_the_night_hora():
+    batch = calculate_site_batch([GIFT], FIRST, LAST)
+    bounds = batch.hora_bounds[0]
+    assert bounds.shape == (3, 26) and batch.hora_planet.shape == (3, 25)
+    assert np.all(np.diff(bounds, axis=-1) > 0)
+    assert np.array_equal(bounds[:, 1], batch.sunrise[0]) and np.array_equal(bounds[:, 13], batch.sunset[0])
+    # The next date starts where this one ends: its night hora 0 is this date's hora 24
+    assert np.allclose(bounds[1:, 0], bounds[:-1, 24]) and np.allclose(bounds[:-1, 25], bounds[1:, 1])
+    for day in range(3):
+        lord = WEEKDAY_LORDS[batch.weekday[day]]
+        assert HORA_FIXED_ORDER[batch.hora_planet[day, 1]] == lord
+        assert batch.hora_planet[day, 0] == (HORA_FIXED_ORDER.index(lord) - 1) % 7
+
+
+def test_gift_sessions_are_clipped_and_run_past_midnight():
+    batch = calculate_site_batch([GIFT], FIRST, LAST)
+    for day in range(3):
+        midnight = TZ_IST.localize(datetime.datetime.combine(FIRST + datetime.timedelta(days=day),
+                                                             datetime.time())).timestamp()
+        windows = [(midnight + a * 3600, midnight + b * 3600) for a, b in SESSIONS["GIFT"]]
+        starts, ends = batch.hora_bounds[0, day, :-1], batch.hora_bounds[0, day, 1:]
+        expected = [any(max(s, a) < min(e, b) for a, b in windows) for s, e in zip(starts, ends)]
+        assert batch.in_session[0, day].tolist() == expected
+
+        slots = site_schedule(batch, 0, day).slots
+        assert len(slots) == sum(expected)
+        # The evening session closes at 02:45 the next day, after midnight
+        assert slots[-1].start < datetime.datetime.fromtimestamp(windows[1][1], TZ_IST) < slots[-1].end
+        assert slots[-1].end.date() == FIRST + datetime.timedelta(days=day + 1)
+        # The early hours between 02:45 and sunrise are not traded
+        assert not batch.in_session[0, day, -1]
+
+
+def test_nse_site_matches_the_market_schedule():
+    batch = calculate_site_batch([NSE, MCX], FIRST, LAST)
+    market = calculate_schedule_batch(FIRST, LAST)
+    for day in range(3):
+        nse = site_schedule(batch, 0, day)
+        expected = schedule_from_batch(market, day)
+        assert [(s.start, s.end, s.planet, s.is_rahu) for s in nse.slots] == \
+            [(s.start, s.end, s.planet, s.is_rahu) for s in expected.slots]
+        assert len(site_schedule(batch, 1, day).slots) > len(nse.slots)  # MCX trades into the evening
+
+
+def test_get_site_schedules_covers_every_site():
+    schedules = get_site_schedules(TZ_IST.localize(datetime.datetime(2025, 3, 4, 10)))
+    assert set(schedules) == {site.name for site in DEFAULT_SITES}
+    assert all(schedule.slots for schedule in schedules.values())
@@ -0,0 +1,25 @@
+import logging
+import datetime
+
+import numpy as np
+
+from astrocore import TZ_IST, get_market_schedule, store
+
+
+def test_a_stale_store_falls_back_to_the_live_calculation(tmp_path, monkeypatch, caplog):
+    path = tmp_path / "almanac.bin"
+    header = np.zeros(1, dtype=store.HEADER_DTYPE)
+    header[0] = (store.MAGIC, store.VERSION - 1, store.RECORD_DTYPE.itemsize,
+                 datetime.date(2025, 1, 1).toordinal(), 365, 19.0760, 72.8777)
+    header.tofile(path)
+    monkeypatch.setattr(store, "ALMANAC_FILE", str(path))
+    monkeypatch.setattr(store, "_store", None)
+    monkeypatch.setattr(store, "_store_checked", False)
+
+    with caplog.at_level(logging.WARNING, logger="astrocore.store"):
+        for _ in range(2):
+            assert store.get_store() is None
+            schedule = get_market_schedule(TZ_IST.localize(datetime.datetime(2025, 3, 4, 10)))
+            assert schedule.slots and schedule.day_lord == "Mars"
+    # Checked once per process, not on every call
+    assert len([r for r in caplog.records if r.name == "astrocore.store"]) == 1